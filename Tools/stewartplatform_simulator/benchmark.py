@@ -0,0 +1,408 @@
+"""기구학, 렌더링, GUI 업데이트 경로 벤치마크
+
+여러 자세 개수와 플랫폼 기하 설정에 대해 주요 경로의 실행 시간을 측정하여 JSON 으로 저장하고,
+기준 결과와 비교하여 임계값 이상 느려진 항목을 표시한다.
+
+    python benchmark.py --save baseline.json
+    python benchmark.py --compare baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import math
+import os
+import platform as host_platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+
+from stewart_kinematics import Quaternion, StewartPlatform, euler_to_quaternion_array
+from visualizer import StewartPlatformVisualizer
+
+# 측정할 플랫폼 기하 설정
+GEOMETRIES = {
+    'default': None,
+    'wide': {
+        'base_radius': 100, 'platform_radius': 70, 'rod_length': 150,
+        'horn_length': 40, 'shaft_distance': 24, 'anchor_distance': 24, 'rotation_limit': 30.0
+    },
+    'compact': {
+        'base_radius': 60, 'platform_radius': 40, 'rod_length': 100,
+        'horn_length': 35, 'shaft_distance': 16, 'anchor_distance': 16, 'rotation_limit': 30.0
+    },
+}
+
+POSE_COUNTS = (100, 10000, 100000)
+QUICK_POSE_COUNTS = (100, 10000)
+
+
+def random_poses(count, seed=0):
+    """작업 공간 안쪽의 임의 자세 - (translations [N,3], rpy [N,3] 라디안)"""
+    rng = np.random.default_rng(seed)
+    translations = rng.uniform(-20, 20, (count, 3))
+    rpy = np.radians(rng.uniform(-20, 20, (count, 3)))
+    return translations, rpy
+
+
+def measure(function, repeat=5, number=1):
+    """function 을 number 번 실행하는 시간을 repeat 번 측정 - (중앙값, 최소값) 초"""
+    function()  # 준비 실행 (캐시, 지연 import)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples), min(samples)
+
+
+def _record(results, name, items, timing):
+    median, best = timing
+    results[name] = {
+        'items': items,
+        'median_s': median,
+        'min_s': best,
+        'per_item_us': median / items * 1e6,
+    }
+    print(f"{name:<55} {median * 1000:10.3f} ms  {median / items * 1e6:10.3f} us/item")
+
+
+# 콜드 스타트 import 시간을 측정할 모듈 (새 인터프리터에서 측정)
+IMPORT_TARGETS = {
+    'import.python': 'pass',
+    'import.stewart_kinematics': 'import stewart_kinematics',
+    'import.visualizer': 'import visualizer',
+    'import.stewart_platform_simulator': 'import stewart_platform_simulator',
+}
+
+
+def bench_import_time(results, repeat):
+    """새 인터프리터에서의 콜드 스타트 import 시간 (인터프리터 시작 시간 포함)"""
+    for name, statement in IMPORT_TARGETS.items():
+        def run():
+            subprocess.run([sys.executable, '-c', statement], check=True)
+
+        _record(results, name, 1, measure(run, repeat))
+
+
+def bench_quaternion(results, repeat):
+    """Quaternion.rotate_vector"""
+    q = Quaternion.from_euler(0.1, 0.2, 0.3)
+    vectors = [[float(i), 1.0, 2.0] for i in range(1000)]
+
+    def run():
+        for vector in vectors:
+            q.rotate_vector(vector)
+
+    _record(results, 'quaternion.rotate_vector', len(vectors), measure(run, repeat))
+
+
+def bench_kinematics(results, name, config, pose_counts, repeat):
+    """스칼라/배치 역기구학, 플랫폼 조인트 월드 좌표, 작업 공간 한계"""
+    platform = StewartPlatform(config)
+
+    for count in pose_counts:
+        translations, rpy = random_poses(count)
+        quaternions = euler_to_quaternion_array(rpy[:, 0], rpy[:, 1], rpy[:, 2])
+        _record(results, f'{name}.ik_batch[{count}]', count, measure(
+            lambda: platform.calculate_inverse_kinematics_batch(translations, quaternions), repeat))
+
+        # 스칼라 역기구학은 큰 배치에서 너무 오래 걸리므로 최대 10000 개까지만 측정
+        scalar_count = min(count, 10000)
+        orientations = [Quaternion.from_euler(*angles) for angles in rpy[:scalar_count]]
+        translation_lists = translations[:scalar_count].tolist()
+
+        def run_scalar():
+            for translation, orientation in zip(translation_lists, orientations):
+                platform.calculate_inverse_kinematics(translation, orientation)
+
+        _record(results, f'{name}.ik_scalar[{scalar_count}]', scalar_count,
+                measure(run_scalar, max(1, repeat // 2)))
+
+    # 같은 자세 100 개를 반복하는 경우 (대기 동작, 시선 추적 루프) - 자세 캐시 적중 경로
+    translations, rpy = random_poses(100, seed=2)
+    orientations = [Quaternion.from_euler(*angles) for angles in rpy]
+    translation_lists = translations.tolist()
+    cached_platform = StewartPlatform(config)
+    cached_platform.enable_pose_cache()
+
+    def run_cached():
+        for translation, orientation in zip(translation_lists, orientations):
+            cached_platform.calculate_inverse_kinematics(translation, orientation)
+
+    _record(results, f'{name}.ik_scalar_cached[100]', 100, measure(run_cached, repeat, number=10))
+
+    platform.calculate_inverse_kinematics([5, 0, 3], Quaternion.from_euler(0.1, 0.1, 0))
+    _record(results, f'{name}.get_platform_joints_world', 1,
+            measure(platform.get_platform_joints_world, repeat, number=1000))
+
+    # 인스턴스 캐시가 채워진 상태 (GUI 매 프레임 호출 경로)
+    _record(results, f'{name}.calculate_workspace_limits', 1,
+            measure(platform.calculate_workspace_limits, repeat, number=100))
+
+
+def bench_workspace_compute(results, repeat):
+    """작업 공간 샘플링 (디스크 캐시 없이)"""
+    from stewart_kinematics.workspace import get_workspace
+
+    spec = {'grid_points': 31, 'line_step': 0.5}
+
+    def run():
+        with tempfile.TemporaryDirectory() as cache_dir:
+            get_workspace(StewartPlatform(), spec, cache_dir=cache_dir, workers=1)
+
+    _record(results, 'default.workspace_compute[31^3]', 1, measure(run, max(1, repeat // 2)))
+
+
+def bench_fleet(results, repeat):
+    """PlatformFleet - 기하가 조금씩 다른 32대의 제어 주기 한 번"""
+    from stewart_kinematics.fleet import PlatformFleet
+
+    rng = np.random.default_rng(3)
+    base = StewartPlatform().config
+    configs = [{key: value * rng.uniform(0.98, 1.02) if key != 'rotation_limit' else value
+                for key, value in base.items()} for _ in range(32)]
+    fleet = PlatformFleet.from_configs(configs)
+    translations, rpy = random_poses(32, seed=4)
+    quaternions = euler_to_quaternion_array(rpy[:, 0], rpy[:, 1], rpy[:, 2])
+
+    _record(results, 'fleet.solve_tick[32]', 32,
+            measure(lambda: fleet.solve_tick(translations, quaternions), repeat, number=100))
+
+
+def bench_collision(results, repeat):
+    """CollisionChecker.check_batch - 궤적 하나 분량 (200Hz 10초) 의 다리 간섭/판 충돌 검사"""
+    from stewart_kinematics.collision import CollisionChecker
+
+    checker = CollisionChecker(StewartPlatform())
+    translations, rpy = random_poses(2000, seed=5)
+    quaternions = euler_to_quaternion_array(rpy[:, 0], rpy[:, 1], rpy[:, 2])
+
+    _record(results, 'collision.check_batch[2000]', 2000,
+            measure(lambda: checker.check_batch(translations, quaternions), repeat))
+
+
+def bench_projection(results, repeat):
+    """PoseProjector.project - 도달 가능한 명령 (선분 탐색만) 과 작업 공간 밖 명령 (탐색 + 보정)"""
+    from stewart_kinematics.projection import PoseProjector
+
+    projector = PoseProjector(StewartPlatform())
+    reachable = Quaternion.from_euler(0.1, 0.0, 0.0)
+    unreachable = Quaternion.from_euler(0.0, 0.0, 0.3)
+
+    _record(results, 'projection.project[reachable]', 1,
+            measure(lambda: projector.project([0, 0, 5], reachable), repeat, number=100))
+
+    def run_unreachable():
+        projector.reset()
+        projector.project([100, 0, 0], unreachable)
+
+    _record(results, 'projection.project[unreachable]', 1, measure(run_unreachable, repeat, number=100))
+
+
+def bench_retiming(results, repeat):
+    """retime_path - 키프레임 사이를 선형 보간한 10^5 샘플 경로의 속도/가속도 한계 시간 재배치
+
+    held 는 키프레임마다 구간의 마지막 20% 동안 같은 샘플이 반복되는 (머무는) 경로이다.
+    """
+    from stewart_kinematics.retiming import retime_path
+
+    count = 100000
+    rng = np.random.default_rng(6)
+    keys = rng.uniform(-15, 15, (201, 6))
+    fractions = np.linspace(0, 200, count)
+    index = np.minimum(fractions.astype(int), 199)
+    poses = keys[index] + (fractions - index)[:, None] * (keys[index + 1] - keys[index])
+    quaternions = euler_to_quaternion_array(*np.radians(poses[:, 3:]).T)
+
+    _record(results, f'retiming.retime_path[{count}]', count, measure(
+        lambda: retime_path(StewartPlatform(), poses[:, :3], quaternions, 300.0, 3000.0), max(1, repeat // 2)))
+
+    held = keys[index] + np.minimum((fractions - index) * 1.25, 1.0)[:, None] * (keys[index + 1] - keys[index])
+    held_quaternions = euler_to_quaternion_array(*np.radians(held[:, 3:]).T)
+    _record(results, f'retiming.retime_path[held,{count}]', count, measure(
+        lambda: retime_path(StewartPlatform(), held[:, :3], held_quaternions, 300.0, 3000.0), max(1, repeat // 2)))
+
+
+def bench_replay(results, repeat):
+    """replay_log - 10^5 줄 자세 로그 (CSV, .npy) 의 블록 단위 재생 (단일 프로세스)"""
+    from stewart_kinematics.replay import replay_log, write_pose_log
+
+    count = 100000
+    rng = np.random.default_rng(7)
+    poses = rng.uniform(-1, 1, (count, 6)) * [30, 30, 20, 30, 30, 30]
+    with tempfile.TemporaryDirectory() as directory:
+        logs = {'csv': os.path.join(directory, 'log.csv'), 'npy': os.path.join(directory, 'log.npy')}
+        np.savetxt(logs['csv'], poses, fmt='%.4f', delimiter=',')
+        write_pose_log(logs['npy'], poses)
+        output = os.path.join(directory, 'angles.npy')
+        for kind, path in logs.items():
+            _record(results, f'replay.replay_log[{kind},{count}]', count, measure(
+                lambda: replay_log(None, path, output, workers=1), max(1, repeat // 2)))
+
+
+def bench_server(results, repeat):
+    """IKServer - 같은 프로세스의 8개 연결이 각 200번 단일 자세 요청 (Unix 소켓 왕복 포함)"""
+    import asyncio
+
+    from stewart_kinematics.server import run_local_load_test
+
+    clients, requests = 8, 200
+
+    def run():
+        with tempfile.TemporaryDirectory() as directory:
+            asyncio.run(run_local_load_test(path=os.path.join(directory, 'ik.sock'),
+                                            clients=clients, requests=requests))
+
+    _record(results, f'server.load_test[{clients}x{requests}]', clients * requests,
+            measure(run, max(1, repeat // 2)))
+
+
+def bench_firmware(results, repeat):
+    """펌웨어 테이블 - 기본 축소 격자 (z, roll, pitch, yaw) 생성/부호화와 10^4 자세 보간 조회"""
+    from stewart_kinematics.firmware import build_firmware_table
+
+    platform = StewartPlatform()
+    table = build_firmware_table(platform)
+    _record(results, f'firmware.build_firmware_table[{int(np.prod(table.counts))}]', int(np.prod(table.counts)),
+            measure(lambda: build_firmware_table(platform), max(1, repeat // 2)))
+
+    count = 10000
+    highs = table.lows + table.steps * (table.counts - 1)
+    points = np.random.default_rng(8).uniform(table.lows, highs, (count, len(table.axes)))
+    _record(results, f'firmware.lookup[{count}]', count, measure(lambda: table.lookup(points), repeat))
+
+
+def bench_tolerance(results, repeat):
+    """공차 분석 - 기본 공차 명세, 샘플 200개 x 자세 565개 순기구학 (단일 프로세스)"""
+    from stewart_kinematics.tolerance import analyze_tolerances
+
+    study = analyze_tolerances(samples=200, workers=1)
+    count = study.position_error.size
+    _record(results, f'tolerance.analyze_tolerances[{count}]', count,
+            measure(lambda: analyze_tolerances(samples=200, workers=1), max(1, repeat // 2)))
+
+
+def bench_visualizer(results, name, config, repeat):
+    """Agg 백엔드에서 StewartPlatformVisualizer.update_visualization"""
+    platform = StewartPlatform(config)
+    visualizer = StewartPlatformVisualizer(platform)
+    visualizer.create_offscreen_visualization()
+    translations, rpy = random_poses(16, seed=1)
+    orientations = [Quaternion.from_euler(*angles) for angles in rpy]
+    state = {'index': 0}
+
+    def run():
+        index = state['index'] % len(orientations)
+        state['index'] += 1
+        platform.calculate_inverse_kinematics(translations[index].tolist(), orientations[index])
+        visualizer.update_visualization()
+
+    _record(results, f'{name}.update_visualization', 1, measure(run, repeat, number=3))
+
+
+def bench_render(results, repeat):
+    """render_poses - 16 프레임 PNG 시퀀스 헤드리스 렌더링 (단일 프로세스)"""
+    from render import render_poses
+
+    count = 16
+    angles = np.linspace(0, 2 * np.pi, count)
+    translations = np.stack([10 * np.cos(angles), 10 * np.sin(angles), 5 * np.sin(2 * angles)], axis=1)
+    quaternions = euler_to_quaternion_array(0.2 * np.sin(angles), 0.2 * np.cos(angles), np.zeros(count))
+
+    def run():
+        with tempfile.TemporaryDirectory() as directory:
+            render_poses(StewartPlatform(), translations, quaternions, directory, workers=1)
+
+    _record(results, f'render.render_poses[png,{count}]', count, measure(run, max(1, repeat // 2)))
+
+
+def run_benchmarks(quick=False, repeat=5):
+    """모든 벤치마크 실행 후 결과 딕셔너리 반환"""
+    results = {}
+    pose_counts = QUICK_POSE_COUNTS if quick else POSE_COUNTS
+    geometries = {'default': None} if quick else GEOMETRIES
+
+    bench_import_time(results, repeat)
+    bench_quaternion(results, repeat)
+    for name, config in geometries.items():
+        bench_kinematics(results, name, config, pose_counts, repeat)
+    bench_workspace_compute(results, repeat)
+    bench_fleet(results, repeat)
+    bench_collision(results, repeat)
+    bench_projection(results, repeat)
+    bench_retiming(results, repeat)
+    bench_replay(results, repeat)
+    bench_server(results, repeat)
+    bench_firmware(results, repeat)
+    bench_tolerance(results, repeat)
+    for name, config in geometries.items():
+        bench_visualizer(results, name, config, repeat)
+    bench_render(results, repeat)
+
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'machine': host_platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'quick': quick,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """기준 결과 대비 중앙값이 threshold 비율 이상 늘어난 항목 목록 반환"""
+    regressions = []
+    print(f"\n{'benchmark':<55} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        change = result['median_s'] / reference['median_s'] - 1 if reference['median_s'] > 0 else math.inf
+        flag = ''
+        if change > threshold:
+            flag = '  << SLOWER'
+            regressions.append((name, change))
+        print(f"{name:<55} {reference['median_s'] * 1000:10.3f}ms {result['median_s'] * 1000:10.3f}ms "
+              f"{change:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stewart Platform 벤치마크")
+    parser.add_argument('--save', metavar='PATH', help="결과를 JSON 으로 저장")
+    parser.add_argument('--compare', metavar='PATH', help="기준 JSON 결과와 비교")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="느려짐으로 표시할 중앙값 증가 비율 (기본값: 0.2 = 20%%)")
+    parser.add_argument('--repeat', type=int, default=5, help="측정 반복 횟수")
+    parser.add_argument('--quick', action='store_true', help="작은 자세 개수와 기본 기하 설정만 측정")
+    args = parser.parse_args()
+
+    current = run_benchmarks(quick=args.quick, repeat=args.repeat)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"\n결과 저장: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)}개 항목이 {args.threshold:.0%} 이상 느려졌습니다")
+            sys.exit(1)
+        print("\n느려진 항목이 없습니다")
+
+
+if __name__ == "__main__":
+    main()
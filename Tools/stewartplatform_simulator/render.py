@@ -0,0 +1,222 @@
+"""자세 시퀀스 헤드리스 렌더링 (Agg 백엔드, 프로세스 풀)
+
+긴 동작을 오프라인으로 검토하기 위해 자세 시퀀스를 GUI 와 같은 모양의 이미지로 그린다.
+그리기용 형상 (플랫폼 원형, 조인트, 호른, 유효 다리) 은 배치 역기구학으로 한 번에 계산하고,
+프레임은 작업자마다 한 번 만든 StewartPlatformVisualizer 로 나누어 그린다.
+
+출력 형식은 output 경로로 정한다.
+    디렉터리        frame_000000.png ... PNG 시퀀스
+    *.gif          Pillow 로 만든 GIF
+    *.mp4 등       ffmpeg (PATH 에 있어야 함) 으로 만든 동영상
+
+    stats = render_poses(platform, translations, quaternions, 'motion.gif', fps=30)
+    stats = render_trajectory(generator, 'frames/', fps=60, workers=4)
+    stats['frames_per_second']
+
+    python render.py poses.csv motion.mp4 --fps 30 --workers 4
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.image
+
+import numpy as np
+
+from stewart_kinematics import StewartPlatform, euler_to_quaternion_array
+from stewart_kinematics.pose_io import load_pose_file
+from visualizer import StewartPlatformVisualizer
+
+FRAME_PATTERN = 'frame_{:06d}.png'
+
+# 작업자 프로세스마다 한 번 만드는 시각화 객체
+_worker_visualizer = None
+
+
+def _init_worker(config, figsize, dpi):
+    """작업자 초기화 - 정적 형상 (베이스, 좌표축, 작업 공간) 을 한 번만 그림"""
+    global _worker_visualizer
+    _worker_visualizer = StewartPlatformVisualizer(StewartPlatform(config))
+    _worker_visualizer.create_offscreen_visualization(figsize=figsize, dpi=dpi)
+
+
+def _render_chunk(directory, start, geometry, labels):
+    """연속된 프레임 청크를 PNG 로 저장 (프로세스 풀 작업 함수) - 저장한 프레임 수 반환"""
+    for row, label in enumerate(labels):
+        frame = {key: value[row] for key, value in geometry.items()}
+        image = _worker_visualizer.render_geometry(frame, label)
+        # 압축 수준 1 - 기본값보다 파일이 조금 크지만 저장 시간이 약 절반
+        matplotlib.image.imsave(os.path.join(directory, FRAME_PATTERN.format(start + row)), image,
+                                pil_kwargs={'compress_level': 1})
+    return len(labels)
+
+
+def _encode_gif(directory, count, output, fps):
+    """PNG 시퀀스를 GIF 로 변환 - 프레임을 하나씩 읽어 메모리에 모두 올리지 않음"""
+    from PIL import Image
+
+    def frames():
+        for index in range(1, count):
+            with Image.open(os.path.join(directory, FRAME_PATTERN.format(index))) as image:
+                yield image.convert('RGB')
+
+    with Image.open(os.path.join(directory, FRAME_PATTERN.format(0))) as first:
+        first.convert('RGB').save(output, save_all=True, append_images=frames(),
+                                  duration=int(round(1000 / fps)), loop=0)
+
+
+def _encode_video(directory, output, fps):
+    """PNG 시퀀스를 ffmpeg 로 동영상 변환"""
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        raise ValueError("동영상 출력에는 ffmpeg 가 필요합니다 (PNG 디렉터리나 .gif 로 출력하세요)")
+    subprocess.run([
+        ffmpeg, '-y', '-loglevel', 'error', '-framerate', str(fps),
+        '-i', os.path.join(directory, 'frame_%06d.png'),
+        # 홀수 해상도에서도 yuv420p 로 인코딩되도록 짝수로 맞춤
+        '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', output,
+    ], check=True)
+
+
+def render_poses(platform, translations, quaternions, output, fps=30.0, times=None, workers=None,
+                 figsize=(8, 6), dpi=100, chunk_size=16, progress=None):
+    """[N,3] 위치와 [N,4] 쿼터니언 자세 시퀀스를 이미지로 렌더링
+
+    times [N] (초) 를 주면 각 프레임에 시각을, 아니면 프레임 번호를 표시한다.
+    workers (기본값: 코어 수) 가 1 보다 크면 chunk_size 프레임씩 프로세스 풀에서 그린다.
+    progress(완료 프레임 수, 전체 프레임 수) 콜백 선택. 통계 딕셔너리 반환:
+        frames, workers, geometry_time, render_time, encode_time, elapsed (초),
+        frames_per_second (렌더링 처리량), output
+    """
+    if fps <= 0:
+        raise ValueError("fps 는 0보다 커야 합니다")
+    started = time.perf_counter()
+    visualizer = StewartPlatformVisualizer(platform)
+    geometry = visualizer.platform_geometry_batch(translations, quaternions)
+    count = len(geometry['valid'])
+    if count == 0:
+        raise ValueError("렌더링할 자세가 없습니다")
+    if times is None:
+        labels = [f"frame {index}" for index in range(count)]
+    else:
+        times = np.asarray(times, dtype=float).reshape(-1)
+        if len(times) != count:
+            raise ValueError("times 와 자세의 개수가 다릅니다")
+        labels = [f"t = {value:.3f} s" for value in times]
+    geometry_time = time.perf_counter() - started
+
+    extension = os.path.splitext(output)[1].lower()
+    sequence = extension == ''
+    if sequence:
+        os.makedirs(output, exist_ok=True)
+        directory = output
+    else:
+        directory = tempfile.mkdtemp(prefix='stewart_render_')
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    starts = range(0, count, chunk_size)
+    workers = max(1, min(workers, len(starts)))
+    arguments = ([directory] * len(starts), list(starts),
+                 [{key: value[start:start + chunk_size] for key, value in geometry.items()} for start in starts],
+                 [labels[start:start + chunk_size] for start in starts])
+    initargs = (platform.config, figsize, dpi)
+
+    try:
+        render_started = time.perf_counter()
+        done = 0
+        if workers <= 1:
+            _init_worker(*initargs)
+            for rendered in map(_render_chunk, *arguments):
+                done += rendered
+                if progress is not None:
+                    progress(done, count)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+                for rendered in executor.map(_render_chunk, *arguments):
+                    done += rendered
+                    if progress is not None:
+                        progress(done, count)
+        render_time = time.perf_counter() - render_started
+
+        encode_started = time.perf_counter()
+        if extension == '.gif':
+            _encode_gif(directory, count, output, fps)
+        elif not sequence:
+            _encode_video(directory, output, fps)
+        encode_time = time.perf_counter() - encode_started
+    finally:
+        if not sequence:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        'frames': count,
+        'workers': workers,
+        'geometry_time': geometry_time,
+        'render_time': render_time,
+        'encode_time': encode_time,
+        'elapsed': time.perf_counter() - started,
+        'frames_per_second': count / max(render_time, 1e-12),
+        'output': output,
+    }
+
+
+def render_trajectory(generator, output, fps=30.0, **options):
+    """TrajectoryGenerator 의 키프레임 궤적을 fps 간격으로 샘플링하여 렌더링 - render_poses 통계 반환"""
+    count = int(np.floor(generator.duration * fps + 1e-9)) + 1
+    times = generator.start_time + np.arange(count) / fps
+    translations, quaternions = generator.sample(times)
+    return render_poses(generator.platform, translations, quaternions, output, fps=fps, times=times, **options)
+
+
+def load_poses(path):
+    """자세 파일 (.npy 또는 텍스트/CSV, x y z roll pitch yaw[도], 7열이면 맨 앞이 시각) 읽기
+
+    (translations [N,3], quaternions [N,4], times [N] 또는 None) 반환
+    """
+    poses = load_pose_file(path, columns=(6, 7))
+    times = poses[:, 0] if poses.shape[1] == 7 else None
+    poses = poses[:, -6:]
+    rpy = np.radians(poses[:, 3:])
+    return poses[:, :3], euler_to_quaternion_array(rpy[:, 0], rpy[:, 1], rpy[:, 2]), times
+
+
+def main():
+    """자세 파일을 렌더링한 뒤 처리량 출력"""
+    parser = argparse.ArgumentParser(description="Stewart Platform 자세 시퀀스 헤드리스 렌더링")
+    parser.add_argument('poses', help="자세 파일 (.npy 또는 텍스트/CSV)")
+    parser.add_argument('output', help="출력 (디렉터리: PNG 시퀀스, .gif, .mp4 등)")
+    parser.add_argument('--config', help="플랫폼 설정 JSON 파일 (기본값: 기본 설정)")
+    parser.add_argument('--fps', type=float, default=30.0, help="GIF/동영상 프레임 속도")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본값: 코어 수)")
+    parser.add_argument('--dpi', type=int, default=100, help="이미지 해상도 (8x6 인치 기준)")
+    args = parser.parse_args()
+
+    config = None
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            config = json.load(f)
+
+    def progress(done, total):
+        print(f"\r렌더링 {done}/{total}", end='', flush=True)
+
+    try:
+        translations, quaternions, times = load_poses(args.poses)
+        stats = render_poses(StewartPlatform(config), translations, quaternions, args.output, fps=args.fps,
+                             times=times, workers=args.workers, dpi=args.dpi, progress=progress)
+    except ValueError as e:
+        parser.exit(1, f"\n오류: {e}\n")
+    print()
+    print(f"{stats['frames']}프레임 (프로세스 {stats['workers']}개) 렌더링 {stats['render_time']:.2f}초, "
+          f"{stats['frames_per_second']:.1f} frames/s, 인코딩 {stats['encode_time']:.2f}초 -> {stats['output']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Stewart Platform 기구학 패키지
+
+GUI(tkinter)나 시각화(matplotlib) 없이 NumPy 만으로 동작하는 기구학 코어.
+부가 모듈(pose_table, workspace, singularity, optimizer, fleet, calibration, collision,
+projection, retiming, replay, server, firmware, tolerance, trajectory, transport, pose_io)은
+필요할 때 직접 import 한다.
+"""
+from .kinematics import (
+    DEFAULT_CACHE_DIR, Quaternion, StewartPlatform, config_hash, euler_to_matrix_array,
+    jacobian_conditioning
+)
+from .cache import CachedPose, PoseCache
+from .metrics import FAILURE_REASONS, IKMetrics
+from .rotation import (
+    Rotation, RotationBatch, euler_to_quaternion_array, quaternion_array_to_matrix
+)
+
+__all__ = [
+    'CachedPose',
+    'DEFAULT_CACHE_DIR',
+    'FAILURE_REASONS',
+    'IKMetrics',
+    'PoseCache',
+    'Quaternion',
+    'Rotation',
+    'RotationBatch',
+    'StewartPlatform',
+    'config_hash',
+    'euler_to_matrix_array',
+    'euler_to_quaternion_array',
+    'jacobian_conditioning',
+    'quaternion_array_to_matrix',
+]
@@ -0,0 +1,109 @@
+"""양자화된 자세 키를 사용하는 LRU 역기구학 결과 캐시
+
+StewartPlatform.pose_cache 에 PoseCache 를 연결하면 calculate_inverse_kinematics 가
+같은 양자화 격자 칸에 속하는 자세를 다시 계산하지 않고 저장된 서보 각도와 호른 위치를 돌려준다.
+캐시된 결과는 그 칸에서 처음 계산된 자세의 값이므로 오차는 양자화 간격 이내이다.
+
+    platform.enable_pose_cache(maxsize=4096, translation_resolution=0.01)
+    platform.calculate_inverse_kinematics(translation, orientation)
+    print(platform.pose_cache.stats())
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+# 캐시 항목 - 서보 각도 [6] (계산 불가능한 다리는 None), 호른 위치 [6][3], 다리별 실패 원인 [6]
+CachedPose = namedtuple('CachedPose', ['servo_angles', 'horn_positions', 'failure_reasons'])
+
+
+class PoseCache:
+    """양자화된 자세 키 -> CachedPose LRU 캐시 (여러 스레드에서 사용해도 안전함)
+
+    translation_resolution 은 위치 양자화 간격(mm), rotation_resolution 은 쿼터니언 성분 양자화 간격이다.
+    조회할 때 넘겨준 config 가 저장된 config 와 다르면 캐시를 비운다.
+    """
+
+    def __init__(self, maxsize=4096, translation_resolution=0.01, rotation_resolution=1e-5):
+        if maxsize < 1:
+            raise ValueError("maxsize 는 1 이상이어야 합니다")
+        if translation_resolution <= 0 or rotation_resolution <= 0:
+            raise ValueError("양자화 간격은 0 보다 커야 합니다")
+        self.maxsize = maxsize
+        self.translation_resolution = translation_resolution
+        self.rotation_resolution = rotation_resolution
+        self._entries = OrderedDict()
+        self._config = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def key(self, translation, orientation):
+        """위치 [3] 와 Quaternion 으로부터 양자화된 캐시 키 계산
+
+        q 와 -q 는 같은 회전이므로 w >= 0 이 되도록 부호를 맞춘다.
+        """
+        t = self.translation_resolution
+        r = self.rotation_resolution
+        w, x, y, z = orientation.w, orientation.x, orientation.y, orientation.z
+        if w < 0:
+            w, x, y, z = -w, -x, -y, -z
+        return (round(translation[0] / t), round(translation[1] / t), round(translation[2] / t),
+                round(w / r), round(x / r), round(y / r), round(z / r))
+
+    def get(self, config, key):
+        """캐시 조회 - 없으면 None. config 가 바뀌었으면 캐시를 비운다."""
+        with self._lock:
+            if config != self._config:
+                self._invalidate(config)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, config, key, servo_angles, horn_positions, failure_reasons=None):
+        """계산 결과 저장 - 가득 차면 가장 오래 사용하지 않은 항목 제거"""
+        entry = CachedPose(tuple(servo_angles),
+                           tuple(tuple(float(v) for v in position) for position in horn_positions),
+                           tuple(failure_reasons) if failure_reasons is not None else (None,) * 6)
+        with self._lock:
+            if config != self._config:
+                self._invalidate(config)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def _invalidate(self, config):
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        # 원본 딕셔너리가 나중에 직접 수정되어도 감지할 수 있도록 복사본 보관
+        self._config = dict(config)
+
+    def clear(self):
+        """모든 항목 제거 (통계는 유지)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """적중률 통계"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
@@ -0,0 +1,218 @@
+"""서보 영점 오프셋과 조인트 위치 보정 - 배치 최소제곱 캘리브레이션
+
+명령한 서보 각도와 측정한 헤드 자세 쌍의 데이터셋으로부터 다리마다
+서보 영점 오프셋 (1), 베이스 조인트 보정 (3), 플랫폼 조인트 보정 (3) 을 추정한다.
+
+잔차는 다리별 로드 길이 오차 |P - H| - rod_length (mm) 이다. P 는 측정 자세에서의 플랫폼 조인트,
+H 는 명령 각도 + 오프셋에서의 호른 끝이다. 각 다리의 잔차는 그 다리의 파라미터에만 의존하므로
+6개의 7변수 문제를 해석적 야코비안과 Levenberg-Marquardt 로 한꺼번에 푼다.
+
+데이터 파일은 한 줄에 12개 값 (서보 각도 6개 [도], x y z [mm], roll pitch yaw [도]) 인 텍스트/CSV
+또는 servo_angles [M,6], poses [M,6] 배열을 가진 .npz 이다.
+
+    python -m stewart_kinematics.calibration samples.csv --config nominal.json -o calibrated.json
+"""
+import argparse
+import json
+import math
+
+import numpy as np
+
+from .kinematics import StewartPlatform
+from .pose_io import load_pose_file
+from .pose_table import poses_to_ik_inputs
+from .rotation import quaternion_array_to_matrix
+
+# 다리당 파라미터 순서: 서보 오프셋 (라디안), 베이스 조인트 보정 xyz, 플랫폼 조인트 보정 xyz
+PARAMETERS_PER_LEG = 7
+
+
+def load_dataset(path):
+    """데이터 파일을 (servo_angles [M,6] 도, poses [M,6] 위치 mm / 회전 도) 로 읽기"""
+    if path.endswith('.npz'):
+        with np.load(path) as data:
+            servo_angles = np.asarray(data['servo_angles'], dtype=float)
+            poses = np.asarray(data['poses'], dtype=float)
+    else:
+        # 한 줄에 서보 각도 6개 + x y z roll pitch yaw
+        data = load_pose_file(path, columns=12)
+        servo_angles, poses = data[:, :6], data[:, 6:]
+    if servo_angles.shape != poses.shape or servo_angles.shape[1:] != (6,):
+        raise ValueError("servo_angles 와 poses 는 같은 개수의 [M,6] 배열이어야 합니다")
+    return servo_angles, poses
+
+
+def _nominal_geometry(config):
+    """보정값을 뺀 공칭 기하 (base_joints, platform_joints, cos_beta, sin_beta, t0_z)"""
+    nominal = {key: value for key, value in config.items()
+               if key not in ('servo_offsets', 'base_joint_offsets', 'platform_joint_offsets')}
+    platform = StewartPlatform(nominal)
+    base, joints, cos_beta, sin_beta = platform._geometry_arrays()
+    return base, joints, cos_beta, sin_beta, platform.T0[2]
+
+
+def _unpack(params):
+    """[6,7] 파라미터를 (서보 오프셋 [6] 라디안, 베이스 보정 [6,3], 플랫폼 보정 [6,3]) 로 분리"""
+    return params[:, 0], params[:, 1:4], params[:, 4:7]
+
+
+def _residuals(params, geometry, rod_length, horn_length, alpha, translations, rotation_matrices,
+               with_jacobian=False):
+    """로드 길이 잔차 [M,6] (mm) 와 선택적으로 야코비안 [6,M,7]"""
+    base, joints, cos_beta, sin_beta, t0_z = geometry
+    offsets, base_offsets, joint_offsets = _unpack(params)
+
+    angles = alpha + offsets                                            # [M,6]
+    cos_alpha, sin_alpha = np.cos(angles), np.sin(angles)
+    horns = (base + base_offsets) + horn_length * np.stack(
+        [cos_alpha * cos_beta, cos_alpha * sin_beta, sin_alpha], axis=-1)   # [M,6,3]
+    rotated = np.einsum('mij,kj->mki', rotation_matrices, joints + joint_offsets)
+    platform_joints = rotated + translations[:, None, :]
+    platform_joints[..., 2] += t0_z
+
+    rods = platform_joints - horns
+    lengths = np.linalg.norm(rods, axis=-1)
+    residuals = lengths - rod_length
+    if not with_jacobian:
+        return residuals
+
+    directions = rods / lengths[..., None]                               # d/|d|
+    tangents = horn_length * np.stack(
+        [-sin_alpha * cos_beta, -sin_alpha * sin_beta, cos_alpha], axis=-1)  # dH/dα
+    jacobian = np.empty((6, len(alpha), PARAMETERS_PER_LEG))
+    jacobian[:, :, 0] = -np.sum(directions * tangents, axis=-1).T
+    jacobian[:, :, 1:4] = -directions.transpose(1, 0, 2)
+    # d|P - H| / dp = (d/|d|)ᵀ R
+    jacobian[:, :, 4:7] = np.einsum('mki,mij->kmj', directions, rotation_matrices)
+    return residuals, jacobian
+
+
+def _residual_stats(residuals):
+    """잔차 통계 딕셔너리 (전체 및 다리별)"""
+    return {
+        'rms': float(np.sqrt(np.mean(residuals**2))),
+        'max': float(np.max(np.abs(residuals))),
+        'mean': float(np.mean(residuals)),
+        'per_leg_rms': np.sqrt(np.mean(residuals**2, axis=0)).tolist(),
+    }
+
+
+def calibrate(config, servo_angles, poses, max_iterations=50, tolerance=1e-10, damping=1e-3):
+    """캘리브레이션 수행 - 보정된 config 와 결과 정보 딕셔너리 반환
+
+    config 에 이미 보정값이 있으면 초기값으로 사용한다. 결과 정보에는 보정 전후의
+    로드 길이 잔차 통계 (mm), 측정 자세에서 역기구학으로 계산한 서보 각도와 명령 각도의 차이 (도),
+    반복 횟수가 들어 있다.
+    """
+    servo_angles = np.asarray(servo_angles, dtype=float).reshape(-1, 6)
+    poses = np.asarray(poses, dtype=float).reshape(-1, 6)
+    if len(servo_angles) != len(poses):
+        raise ValueError("servo_angles 와 poses 의 개수가 다릅니다")
+    if len(poses) < PARAMETERS_PER_LEG:
+        raise ValueError(f"샘플이 {PARAMETERS_PER_LEG}개 이상 필요합니다")
+
+    geometry = _nominal_geometry(config)
+    rod_length = float(config['rod_length'])
+    horn_length = float(config['horn_length'])
+    translations, quaternions = poses_to_ik_inputs(poses)
+    rotation_matrices = quaternion_array_to_matrix(quaternions)
+    alpha = np.radians(servo_angles)
+
+    params = np.zeros((6, PARAMETERS_PER_LEG))
+    params[:, 0] = np.radians(config.get('servo_offsets', [0.0] * 6))
+    params[:, 1:4] = config.get('base_joint_offsets', np.zeros((6, 3)))
+    params[:, 4:7] = config.get('platform_joint_offsets', np.zeros((6, 3)))
+
+    args = (geometry, rod_length, horn_length, alpha, translations, rotation_matrices)
+    residuals, jacobian = _residuals(params, *args, with_jacobian=True)
+    initial_residuals = residuals
+    cost = np.sum(residuals**2, axis=0)                                  # 다리별 [6]
+    lam = np.full(6, damping)
+    identity = np.eye(PARAMETERS_PER_LEG)
+
+    converged = np.zeros(6, dtype=bool)
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        normal = np.einsum('kmi,kmj->kij', jacobian, jacobian)          # [6,7,7]
+        gradient = np.einsum('kmi,mk->ki', jacobian, residuals)          # [6,7]
+        # Levenberg-Marquardt: 대각 성분 비례 감쇠 (스케일이 다른 각도/위치 파라미터)
+        scaled = normal + lam[:, None, None] * (identity * np.diagonal(normal, axis1=1, axis2=2)[:, None, :]
+                                                + 1e-12 * identity)
+        step = -np.linalg.solve(scaled, gradient[..., None])[..., 0]
+
+        trial = params + step
+        trial_residuals = _residuals(trial, *args)
+        trial_cost = np.sum(trial_residuals**2, axis=0)
+        improved = trial_cost < cost
+
+        # 다리별로 개선된 경우만 받아들이고 감쇠 조정
+        params = np.where(improved[:, None], trial, params)
+        lam = np.where(improved, lam / 10, lam * 10)
+        previous = cost
+        cost = np.where(improved, trial_cost, cost)
+        residuals, jacobian = _residuals(params, *args, with_jacobian=True)
+
+        # 개선 폭이 tolerance 이하가 되었거나 감쇠가 너무 커져 더 진행할 수 없는 다리는 수렴으로 본다
+        converged |= (improved & (previous - cost <= tolerance * previous)) | (lam > 1e10)
+        if np.all(converged):
+            break
+
+    offsets, base_offsets, joint_offsets = _unpack(params)
+    calibrated = dict(config)
+    calibrated['servo_offsets'] = [round(float(value), 6) for value in np.degrees(offsets)]
+    calibrated['base_joint_offsets'] = np.round(base_offsets, 6).tolist()
+    calibrated['platform_joint_offsets'] = np.round(joint_offsets, 6).tolist()
+
+    # 보정된 플랫폼으로 측정 자세의 서보 각도를 다시 계산하여 명령 각도와 비교
+    platform = StewartPlatform(calibrated)
+    predicted, valid = platform.calculate_inverse_kinematics_batch(translations, quaternions)
+    angle_errors = (predicted - servo_angles)[valid]
+
+    info = {
+        'samples': len(poses),
+        'iterations': iteration,
+        'before': _residual_stats(initial_residuals),
+        'after': _residual_stats(residuals),
+        'angle_error_deg': {
+            'rms': float(np.sqrt(np.mean(angle_errors**2))) if len(angle_errors) else math.nan,
+            'max': float(np.max(np.abs(angle_errors))) if len(angle_errors) else math.nan,
+            'unreachable_legs': int(np.count_nonzero(~valid)),
+        },
+    }
+    return calibrated, info
+
+
+def main():
+    """데이터 파일로 캘리브레이션을 수행하고 보정된 config 저장"""
+    parser = argparse.ArgumentParser(description="Stewart Platform 서보 오프셋/조인트 위치 캘리브레이션")
+    parser.add_argument('dataset', help="데이터 파일 (.csv/.txt: 서보 6 + 자세 6 열, .npz: servo_angles/poses)")
+    parser.add_argument('--config', help="공칭 플랫폼 설정 JSON (기본값: 기본 설정)")
+    parser.add_argument('-o', '--output', help="보정된 설정 JSON 저장 경로")
+    parser.add_argument('--iterations', type=int, default=50, help="최대 반복 횟수")
+    args = parser.parse_args()
+
+    config = StewartPlatform().config
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            config = json.load(f)
+
+    servo_angles, poses = load_dataset(args.dataset)
+    calibrated, info = calibrate(config, servo_angles, poses, max_iterations=args.iterations)
+
+    print(f"샘플 {info['samples']}개, 반복 {info['iterations']}회")
+    for stage in ('before', 'after'):
+        stats = info[stage]
+        per_leg = ' '.join(f"{value:.3f}" for value in stats['per_leg_rms'])
+        print(f"{stage:>6}: 로드 길이 잔차 RMS {stats['rms']:.4f} mm, 최대 {stats['max']:.4f} mm (다리별 RMS {per_leg})")
+    angle = info['angle_error_deg']
+    print(f"서보 각도 오차: RMS {angle['rms']:.4f}°, 최대 {angle['max']:.4f}°, 도달 불가 {angle['unreachable_legs']}")
+    print(f"서보 오프셋 (도): {calibrated['servo_offsets']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(calibrated, f, indent=2)
+        print(f"보정된 설정 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
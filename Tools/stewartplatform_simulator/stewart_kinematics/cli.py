@@ -0,0 +1,97 @@
+"""명령행 역기구학 - 자세를 읽어 서보 각도를 출력
+
+입력은 한 줄에 자세 하나 (x y z roll pitch yaw, 위치 mm / 회전 도) 이며
+공백 또는 쉼표로 구분한다. '#' 으로 시작하는 줄과 빈 줄은 무시한다.
+출력은 한 줄에 6개 서보 각도(도)이며 계산이 불가능한 다리는 nan 으로 표시한다.
+
+    python -m stewart_kinematics poses.txt > angles.txt
+    echo "0 0 5 10 0 0" | python -m stewart_kinematics
+    python -m stewart_kinematics poses.txt --metrics ik_metrics.prom
+"""
+import argparse
+import itertools
+import json
+import sys
+
+import numpy as np
+
+from .kinematics import StewartPlatform
+from .rotation import euler_to_quaternion_array
+
+
+def _parse_lines(lines):
+    """텍스트 줄 목록을 [N,6] 자세 배열로 변환"""
+    poses = []
+    for line in lines:
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        values = line.replace(',', ' ').split()
+        if len(values) != 6:
+            raise ValueError(f"자세는 6개 값(x y z roll pitch yaw)이어야 합니다: {line!r}")
+        poses.append([float(value) for value in values])
+    return np.array(poses, dtype=float).reshape(-1, 6)
+
+
+def solve_stream(platform, lines, output, chunk_size=4096, precision=4, delimiter=' '):
+    """줄 단위 입력을 청크로 나누어 배치 역기구학을 계산하고 결과를 output 에 씀 - 처리한 자세 수 반환"""
+    count = 0
+    lines = iter(lines)
+    while True:
+        poses = _parse_lines(itertools.islice(lines, chunk_size))
+        if len(poses) == 0:
+            # 청크가 모두 주석/빈 줄일 수 있으므로 입력이 끝났는지 확인
+            peek = next(lines, None)
+            if peek is None:
+                return count
+            lines = itertools.chain([peek], lines)
+            continue
+
+        rpy = np.radians(poses[:, 3:])
+        quaternions = euler_to_quaternion_array(rpy[:, 0], rpy[:, 1], rpy[:, 2])
+        servo_angles, _ = platform.calculate_inverse_kinematics_batch(poses[:, :3], quaternions)
+        np.savetxt(output, servo_angles, fmt=f'%.{precision}f', delimiter=delimiter)
+        count += len(poses)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m stewart_kinematics',
+        description="자세(x y z roll pitch yaw)를 읽어 6개 서보 각도를 출력합니다")
+    parser.add_argument('inputs', nargs='*', default=['-'], help="자세 파일 (기본값/'-': 표준 입력)")
+    parser.add_argument('-o', '--output', default='-', help="출력 파일 (기본값: 표준 출력)")
+    parser.add_argument('--config', help="플랫폼 설정 JSON 파일 (기본값: 기본 설정)")
+    parser.add_argument('--precision', type=int, default=4, help="소수점 자릿수")
+    parser.add_argument('--delimiter', default=' ', help="출력 구분자")
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="역기구학 계측 결과 파일 (.prom/.txt 이면 Prometheus 텍스트, 그 외 JSON)")
+    args = parser.parse_args(argv)
+
+    config = None
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            config = json.load(f)
+    platform = StewartPlatform(config)
+    if args.metrics:
+        platform.enable_metrics()
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        for path in args.inputs:
+            source = sys.stdin if path == '-' else open(path, encoding='utf-8')
+            try:
+                solve_stream(platform, source, output, precision=args.precision, delimiter=args.delimiter)
+            finally:
+                if source is not sys.stdin:
+                    source.close()
+    except ValueError as e:
+        parser.exit(1, f"오류: {e}\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if args.metrics:
+            platform.metrics.export(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
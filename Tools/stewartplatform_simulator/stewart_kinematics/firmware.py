@@ -0,0 +1,537 @@
+"""마이크로컨트롤러 펌웨어용 고정 소수점 자세 → 서보 각도 룩업 테이블 내보내기
+
+Python 이나 부동 소수점 역기구학을 돌릴 수 없는 모터 쪽 MCU 를 위해 축소된 자세 공간
+(예: z + roll/pitch/yaw, 나머지 축은 0) 의 격자에서 StewartPlatform 역기구학을 미리 계산하고,
+int16 고정 소수점으로 양자화한 뒤 차분 부호화하여 바이너리 블롭과 C 헤더로 저장한다.
+
+    table = build_firmware_table(platform, {'z': (-10, 10, 5), 'roll': (-20, 20, 9),
+                                            'pitch': (-20, 20, 9), 'yaw': (-20, 20, 9)})
+    table.save('stewart_table')        # stewart_table.bin, stewart_table.h
+    report = error_report(table, platform, samples=10000)
+
+    python -m stewart_kinematics.firmware --axis z=-10:10:5 --axis roll=-20:20:9 --output stewart_table
+
+양자화: 서보 각도 (도) = 값 / angle_scale (기본값 100, 즉 0.01도 단위 - transport 패킷과 같음).
+-32768 (HOLD_POSITION) 은 계산 불가능한 각도이다.
+
+행 (row) 은 마지막 축을 제외한 격자 인덱스 하나이며, 서보 6개의 마지막 축 방향 값 n 개를 담는다.
+서보마다 첫 바이트가 부호화 방식이고 세 방식 중 가장 작은 것을 고른다.
+    0  원본          int16 × n
+    1  1차 차분      int16 첫 값, int8 차분 × (n-1)
+    2  2차 차분      int16 첫 값, int16 첫 차분, int8 2차 차분 × (n-2)
+계산 불가능한 값이 있거나 차분이 int8 범위를 벗어나면 원본으로 저장한다.
+
+바이너리 블롭 (리틀 엔디언)
+    offset  크기        필드
+    0       4           매직 b'SPLT'
+    4       1           형식 버전 (1)
+    5       1           축 수 D
+    6       2           예약 (0)
+    8       4           angle_scale (float32, 도당 값)
+    12      4           행 수 R (uint32)
+    16      4           데이터 크기 S (uint32)
+    20      12 × D      축마다 축 번호 (uint8, POSE_AXES 인덱스), 예약 (uint8), 개수 (uint16),
+                        최소값 (float32), 간격 (float32)
+    ..      4 × R       행 시작 오프셋 (uint32, 데이터 시작 기준)
+    ..      S           행 데이터
+    ..      2           CRC-16/CCITT (앞의 모든 바이트)
+"""
+import argparse
+import binascii
+import json
+import os
+import re
+import struct
+
+import numpy as np
+
+from .kinematics import StewartPlatform, config_hash
+from .pose_table import POSE_AXES, multilinear_corners, poses_to_ik_inputs
+from .transport import ANGLE_SCALE, HOLD_POSITION
+
+# 기본 축소 자세 공간 - 높이와 회전 (위치 mm, 회전 도)
+DEFAULT_FIRMWARE_GRID = {
+    'z': (-10.0, 10.0, 5),
+    'roll': (-20.0, 20.0, 9),
+    'pitch': (-20.0, 20.0, 9),
+    'yaw': (-20.0, 20.0, 9),
+}
+
+TABLE_MAGIC = b'SPLT'
+FIRMWARE_FORMAT_VERSION = 1
+
+MODE_RAW = 0
+MODE_DELTA = 1
+MODE_DELTA2 = 2
+
+_HEADER = struct.Struct('<4sBBHfII')
+_AXIS = struct.Struct('<BBHff')
+_CRC = struct.Struct('<H')
+
+
+def _mode_size(mode, count):
+    """서보 하나의 행 데이터 크기 (방식 바이트 포함)"""
+    if mode == MODE_RAW:
+        return 1 + 2 * count
+    if mode == MODE_DELTA:
+        return 1 + 2 + (count - 1)
+    return 1 + 4 + (count - 2)
+
+
+def _fits(values, low, high):
+    return len(values) == 0 or (values.min() >= low and values.max() <= high)
+
+
+def _encode_series(values):
+    """int16 값 [n] 을 가장 작은 방식으로 부호화한 바이트 반환"""
+    count = len(values)
+    candidates = [(_mode_size(MODE_RAW, count), MODE_RAW)]
+    if not np.any(values == HOLD_POSITION):
+        delta = np.diff(values)
+        if _fits(delta, -128, 127):
+            candidates.append((_mode_size(MODE_DELTA, count), MODE_DELTA))
+        if count >= 2 and _fits(delta[:1], -32768, 32767) and _fits(np.diff(delta), -128, 127):
+            candidates.append((_mode_size(MODE_DELTA2, count), MODE_DELTA2))
+    _, mode = min(candidates)
+
+    if mode == MODE_RAW:
+        return bytes([mode]) + values.astype('<i2').tobytes()
+    if mode == MODE_DELTA:
+        return bytes([mode]) + values[:1].astype('<i2').tobytes() + np.diff(values).astype('i1').tobytes()
+    delta = np.diff(values)
+    return (bytes([mode]) + values[:1].astype('<i2').tobytes() + delta[:1].astype('<i2').tobytes()
+            + np.diff(delta).astype('i1').tobytes())
+
+
+def _decode_series(data, offset, count):
+    """offset 에서 서보 하나의 행을 복원하여 (int32 값 [n], 다음 offset) 반환"""
+    mode = data[offset]
+    body = offset + 1
+    if mode == MODE_RAW:
+        values = np.frombuffer(data, '<i2', count, body).astype(np.int32)
+    elif mode == MODE_DELTA:
+        first = np.frombuffer(data, '<i2', 1, body).astype(np.int32)
+        delta = np.frombuffer(data, 'i1', count - 1, body + 2).astype(np.int32)
+        values = np.concatenate([first, first + np.cumsum(delta)])
+    elif mode == MODE_DELTA2:
+        first, first_delta = np.frombuffer(data, '<i2', 2, body).astype(np.int32)
+        second = np.frombuffer(data, 'i1', count - 2, body + 4).astype(np.int32)
+        delta = first_delta + np.concatenate([[0], np.cumsum(second)])
+        values = first + np.concatenate([[0], np.cumsum(delta)])
+    else:
+        raise ValueError(f"알 수 없는 부호화 방식입니다: {mode}")
+    return values, offset + _mode_size(mode, count)
+
+
+def _parse_axes(grid):
+    """격자 정의를 POSE_AXES 순서의 [(축 이름, 최소, 최대, 개수)] 로 정리 - 각 축은 2개 이상"""
+    unknown = [axis for axis in grid if axis not in POSE_AXES]
+    if unknown:
+        raise ValueError(f"알 수 없는 축입니다: {', '.join(unknown)}")
+    axes = []
+    for axis in POSE_AXES:
+        if axis not in grid:
+            continue
+        low, high, count = grid[axis]
+        if int(count) < 2 or not high > low:
+            raise ValueError(f"{axis} 축은 최소 < 최대, 개수 2 이상이어야 합니다")
+        axes.append((axis, float(low), float(high), int(count)))
+    if not axes:
+        raise ValueError("테이블 축이 하나 이상 필요합니다")
+    return axes
+
+
+class FirmwareTable:
+    """부호화된 펌웨어 룩업 테이블 - 블롭 해석, 복원, 펌웨어와 같은 방식의 보간 조회, C 헤더 생성"""
+    def __init__(self, blob):
+        blob = bytes(blob)
+        if len(blob) < _HEADER.size + _CRC.size:
+            raise ValueError("테이블 블롭이 너무 짧습니다")
+        if _CRC.unpack(blob[-_CRC.size:])[0] != binascii.crc_hqx(blob[:-_CRC.size], 0xFFFF):
+            raise ValueError("CRC 가 일치하지 않습니다")
+        magic, version, dims, _, scale, rows, size = _HEADER.unpack_from(blob)
+        if magic != TABLE_MAGIC:
+            raise ValueError("펌웨어 테이블 블롭이 아닙니다")
+        if version != FIRMWARE_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 테이블 형식입니다: {version}")
+
+        self.blob = blob
+        self.angle_scale = float(scale)
+        offset = _HEADER.size
+        axes = [_AXIS.unpack_from(blob, offset + index * _AXIS.size) for index in range(dims)]
+        self.axes = tuple(POSE_AXES[axis] for axis, _, _, _, _ in axes)
+        self.counts = np.array([count for _, _, count, _, _ in axes])
+        self.lows = np.array([low for _, _, _, low, _ in axes], dtype=np.float32).astype(float)
+        self.steps = np.array([step for _, _, _, _, step in axes], dtype=np.float32).astype(float)
+        offset += dims * _AXIS.size
+        self.row_offsets = np.frombuffer(blob, '<u4', rows, offset)
+        self.data_start = offset + 4 * rows
+        self.data = blob[self.data_start:self.data_start + size]
+        if int(np.prod(self.counts[:-1])) != rows or len(self.data) != size:
+            raise ValueError("테이블 크기가 헤더와 일치하지 않습니다")
+        self._values = None
+
+    @classmethod
+    def load(cls, path):
+        """.bin 블롭 파일 열기"""
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def stats(self):
+        """크기 요약 - 블롭 크기, 부호화 전 int16 크기, 방식별 서보 행 수"""
+        modes = [0, 0, 0]
+        count = int(self.counts[-1])
+        for start in self.row_offsets.tolist():
+            offset = start
+            for _ in range(6):
+                mode = self.data[offset]
+                modes[mode] += 1
+                offset += _mode_size(mode, count)
+        return {
+            'blob_bytes': len(self.blob),
+            'data_bytes': len(self.data),
+            'raw_bytes': int(np.prod(self.counts)) * 6 * 2,
+            'compression': int(np.prod(self.counts)) * 6 * 2 / len(self.data),
+            'rows_raw': modes[MODE_RAW],
+            'rows_delta': modes[MODE_DELTA],
+            'rows_delta2': modes[MODE_DELTA2],
+        }
+
+    def decode(self):
+        """전체 테이블을 int32 [격자..., 6] 로 복원 (계산 불가 값은 HOLD_POSITION)"""
+        if self._values is None:
+            count = int(self.counts[-1])
+            values = np.empty((len(self.row_offsets), 6, count), dtype=np.int32)
+            for row, start in enumerate(self.row_offsets.tolist()):
+                offset = start
+                for servo in range(6):
+                    values[row, servo], offset = _decode_series(self.data, offset, count)
+            self._values = np.moveaxis(values, 1, 2).reshape(tuple(self.counts) + (6,))
+        return self._values
+
+    def lookup(self, points):
+        """[N,D] 테이블 축 좌표 (self.axes 순서, mm/도) 의 다선형 보간 - 펌웨어 조회와 같은 규칙
+
+        (servo_angles [N,6] 도, ok [N]) 반환. 격자 밖이거나 가중치가 있는 꼭짓점에
+        계산 불가능한 값이 있으면 ok 가 False 이고 각도는 NaN 이다.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, len(self.axes))
+        indices, weights, in_range = multilinear_corners(points, self.lows, self.steps, self.counts)
+        values = self.decode()[tuple(indices[..., axis] for axis in range(len(self.axes)))]
+        used = weights > 0
+        invalid = np.any(np.any(values == HOLD_POSITION, axis=2) & used, axis=1)
+        servo_angles = np.einsum('nc,nck->nk', weights, np.where(used[..., None], values, 0)) / self.angle_scale
+        ok = in_range & ~invalid
+        servo_angles[~ok] = np.nan
+        return servo_angles, ok
+
+    def to_c_header(self, name='stewart_table', comment=''):
+        """테이블 데이터와 조회 함수를 담은 C 헤더 문자열"""
+        prefix = name.upper()
+        dims = len(self.axes)
+        axis_ids = ', '.join(str(POSE_AXES.index(axis)) for axis in self.axes)
+        counts = ', '.join(str(int(count)) for count in self.counts)
+        lows = ', '.join(f"{value!r}f" for value in self.lows.tolist())
+        steps = ', '.join(f"{value!r}f" for value in self.steps.tolist())
+
+        def array_lines(values, per_line):
+            return ',\n'.join('    ' + ', '.join(values[start:start + per_line])
+                              for start in range(0, len(values), per_line))
+
+        offsets = array_lines([str(value) for value in self.row_offsets.tolist()], 8)
+        data = array_lines([f"0x{value:02x}" for value in self.data], 16)
+        return _C_TEMPLATE.format(
+            name=name, prefix=prefix, comment=comment, dims=dims, axis_names=', '.join(self.axes),
+            corners=1 << (dims - 1), scale=f"{self.angle_scale!r}f", hold=HOLD_POSITION,
+            rows=len(self.row_offsets), size=len(self.data), axis_ids=axis_ids, counts=counts,
+            lows=lows, steps=steps, offsets=offsets, data=data, last=dims - 1,
+        )
+
+    def save(self, prefix, name=None, comment=''):
+        """prefix.bin (블롭) 과 prefix.h (C 헤더) 저장 - 임시 파일에 쓴 뒤 교체
+
+        C 이름 (기본값: prefix 파일 이름) 의 식별자로 쓸 수 없는 문자는 '_' 로 바꾼다.
+        """
+        name = re.sub(r'\W', '_', name or os.path.basename(prefix), flags=re.ASCII)
+        if name[:1].isdigit():
+            name = '_' + name
+        outputs = {prefix + '.bin': self.blob,
+                   prefix + '.h': self.to_c_header(name, comment).encode('utf-8')}
+        for path, content in outputs.items():
+            temp_path = path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        return list(outputs)
+
+
+def build_firmware_table(platform, grid=None, angle_scale=ANGLE_SCALE):
+    """축소 자세 공간 격자의 역기구학을 계산하여 FirmwareTable 생성
+
+    grid 는 축 이름 -> (최소, 최대, 개수) 이며 포함하지 않은 축은 0 으로 고정된다.
+    """
+    axes = _parse_axes(DEFAULT_FIRMWARE_GRID if grid is None else grid)
+    if angle_scale <= 0:
+        raise ValueError("angle_scale 은 0보다 커야 합니다")
+    counts = tuple(count for _, _, _, count in axes)
+    values = [np.linspace(low, high, count) for _, low, high, count in axes]
+
+    mesh = np.meshgrid(*values, indexing='ij')
+    poses = np.zeros((mesh[0].size, 6))
+    for (axis, _, _, _), grid_values in zip(axes, mesh):
+        poses[:, POSE_AXES.index(axis)] = grid_values.ravel()
+    translations, quaternions = poses_to_ik_inputs(poses)
+    servo_angles, valid = platform.calculate_inverse_kinematics_batch(translations, quaternions)
+
+    scaled = np.round(np.where(valid, servo_angles, 0.0) * angle_scale)
+    if np.any(np.abs(scaled[valid]) > 32767):
+        raise ValueError("angle_scale 이 너무 커서 서보 각도가 int16 범위를 벗어납니다")
+    quantized = np.where(valid, scaled, HOLD_POSITION).astype(np.int32)
+    # [행, 마지막 축, 서보] -> 행마다 서보별 마지막 축 방향 값
+    series = quantized.reshape(-1, counts[-1], 6)
+
+    chunks = []
+    offsets = []
+    size = 0
+    for row in series:
+        offsets.append(size)
+        for servo in range(6):
+            encoded = _encode_series(row[:, servo])
+            chunks.append(encoded)
+            size += len(encoded)
+
+    header = _HEADER.pack(TABLE_MAGIC, FIRMWARE_FORMAT_VERSION, len(axes), 0, angle_scale, len(series), size)
+    axis_records = b''.join(
+        _AXIS.pack(POSE_AXES.index(axis), 0, count, low, (high - low) / (count - 1))
+        for axis, low, high, count in axes)
+    body = header + axis_records + np.array(offsets, dtype='<u4').tobytes() + b''.join(chunks)
+    return FirmwareTable(body + _CRC.pack(binascii.crc_hqx(body, 0xFFFF)))
+
+
+def error_report(table, platform, samples=10000, seed=0):
+    """격자 범위 안 무작위 자세에서 테이블 보간 조회와 정확한 역기구학의 차이
+
+    반환 딕셔너리 (각도 오차는 도):
+        samples, mean_error, rms_error, p99_error, max_error, servo_max_error [6],
+        worst_pose (최대 오차 자세의 테이블 축 좌표), node_max_error (격자점 양자화 오차),
+        table_valid, exact_valid    조회 / 역기구학이 가능한 비율
+        false_valid                 테이블은 가능하지만 실제로는 계산 불가능한 자세 수 (위험)
+        missed                      실제로는 가능하지만 테이블이 거부한 자세 수
+    """
+    rng = np.random.default_rng(seed)
+    highs = table.lows + table.steps * (table.counts - 1)
+    points = rng.uniform(table.lows, highs, (samples, len(table.axes)))
+    table_angles, ok = table.lookup(points)
+
+    poses = np.zeros((samples, 6))
+    for index, axis in enumerate(table.axes):
+        poses[:, POSE_AXES.index(axis)] = points[:, index]
+    exact, valid = platform.calculate_inverse_kinematics_batch(*poses_to_ik_inputs(poses))
+    exact_ok = np.all(valid, axis=1)
+
+    both = ok & exact_ok
+    errors = np.abs(table_angles[both] - exact[both])
+    per_pose = errors.max(axis=1) if len(errors) else np.zeros(0)
+
+    # 격자점에서는 보간 오차가 없으므로 양자화 오차만 남는다
+    node_values = table.decode().reshape(-1, 6)
+    node_mesh = np.meshgrid(*[table.lows[index] + table.steps[index] * np.arange(count)
+                              for index, count in enumerate(table.counts)], indexing='ij')
+    node_poses = np.zeros((node_values.shape[0], 6))
+    for index, axis in enumerate(table.axes):
+        node_poses[:, POSE_AXES.index(axis)] = node_mesh[index].ravel()
+    node_exact, node_valid = platform.calculate_inverse_kinematics_batch(*poses_to_ik_inputs(node_poses))
+    node_errors = np.abs(node_values / table.angle_scale - node_exact)[node_valid & (node_values != HOLD_POSITION)]
+
+    report = {
+        'samples': samples,
+        'table_valid': float(ok.mean()),
+        'exact_valid': float(exact_ok.mean()),
+        'false_valid': int(np.count_nonzero(ok & ~exact_ok)),
+        'missed': int(np.count_nonzero(~ok & exact_ok)),
+        'node_max_error': float(node_errors.max()) if len(node_errors) else 0.0,
+    }
+    if len(errors):
+        worst = int(np.argmax(per_pose))
+        report.update({
+            'mean_error': float(errors.mean()),
+            'rms_error': float(np.sqrt(np.mean(errors**2))),
+            'p99_error': float(np.percentile(per_pose, 99)),
+            'max_error': float(per_pose[worst]),
+            'servo_max_error': errors.max(axis=0).tolist(),
+            'worst_pose': points[both][worst].tolist(),
+        })
+    return report
+
+
+# 펌웨어용 C 헤더 - 데이터 배열과 조회 함수 (C99, float 연산은 보간에만 사용)
+_C_TEMPLATE = """\
+/* {name}.h - Stewart Platform 자세 -> 서보 각도 룩업 테이블 (stewart_kinematics.firmware 로 생성, 수정 금지)
+ * {comment}
+ * 축: {axis_names} (위치 mm, 회전 도), 나머지 축은 0
+ * 서보 각도 (도) = 값 / {prefix}_ANGLE_SCALE, {prefix}_INVALID 는 계산 불가능
+ */
+#ifndef {prefix}_H
+#define {prefix}_H
+
+#include <math.h>
+#include <stdint.h>
+
+#define {prefix}_AXES {dims}
+#define {prefix}_ROWS {rows}
+#define {prefix}_DATA_SIZE {size}
+#define {prefix}_ANGLE_SCALE {scale}
+#define {prefix}_INVALID ({hold})
+
+/* 축 번호: 0=x 1=y 2=z 3=roll 4=pitch 5=yaw */
+static const uint8_t {name}_axis_ids[{prefix}_AXES] = {{{axis_ids}}};
+static const uint16_t {name}_counts[{prefix}_AXES] = {{{counts}}};
+static const float {name}_lows[{prefix}_AXES] = {{{lows}}};
+static const float {name}_steps[{prefix}_AXES] = {{{steps}}};
+
+/* 행 (마지막 축을 제외한 격자 인덱스) 시작 오프셋 */
+static const uint32_t {name}_row_offsets[{prefix}_ROWS] = {{
+{offsets}
+}};
+
+/* 행마다 서보 6개: 방식 바이트 (0 원본 int16, 1 int16 + int8 차분, 2 int16 + int16 차분 + int8 2차 차분) */
+static const uint8_t {name}_data[{prefix}_DATA_SIZE] = {{
+{data}
+}};
+
+static int16_t {name}_read_i16(const uint8_t *p)
+{{
+    return (int16_t)(uint16_t)(p[0] | (p[1] << 8));
+}}
+
+/* 행 row 에서 마지막 축 인덱스 k, k+1 의 서보 6개 값 복원 */
+static void {name}_row_pair(uint32_t row, int k, int32_t first[6], int32_t second[6])
+{{
+    const int n = {name}_counts[{last}];
+    const uint8_t *p = {name}_data + {name}_row_offsets[row];
+    for (int servo = 0; servo < 6; servo++) {{
+        const uint8_t mode = *p++;
+        if (mode == 0) {{
+            first[servo] = {name}_read_i16(p + 2 * k);
+            second[servo] = {name}_read_i16(p + 2 * (k + 1));
+            p += 2 * n;
+        }} else if (mode == 1) {{
+            int32_t value = {name}_read_i16(p);
+            for (int i = 0; i < k; i++) {{
+                value += (int8_t)p[2 + i];
+            }}
+            first[servo] = value;
+            second[servo] = value + (int8_t)p[2 + k];
+            p += 2 + (n - 1);
+        }} else {{
+            int32_t value = {name}_read_i16(p);
+            int32_t delta = {name}_read_i16(p + 2);
+            for (int i = 1; i <= k; i++) {{
+                value += delta;
+                delta += (int8_t)p[4 + i - 1];
+            }}
+            first[servo] = value;
+            second[servo] = value + delta;
+            p += 4 + (n - 2);
+        }}
+    }}
+}}
+
+/* 테이블 축 좌표 pose[{prefix}_AXES] 의 다선형 보간 - 성공하면 0, 격자 밖이거나 계산 불가능하면 -1 */
+static int {name}_lookup(const float pose[{prefix}_AXES], float angles[6])
+{{
+    int32_t lower[{prefix}_AXES];
+    float frac[{prefix}_AXES];
+    for (int axis = 0; axis < {prefix}_AXES; axis++) {{
+        const float position = (pose[axis] - {name}_lows[axis]) / {name}_steps[axis];
+        const int count = {name}_counts[axis];
+        if (!(position >= -1e-4f && position <= (float)(count - 1) + 1e-4f)) {{
+            return -1;
+        }}
+        int32_t index = (int32_t)floorf(position);
+        if (index < 0) index = 0;
+        if (index > count - 2) index = count - 2;
+        float f = position - (float)index;
+        frac[axis] = f < 0.0f ? 0.0f : (f > 1.0f ? 1.0f : f);
+        lower[axis] = index;
+    }}
+
+    float sum[6] = {{0.0f, 0.0f, 0.0f, 0.0f, 0.0f, 0.0f}};
+    const float last = frac[{last}];
+    for (uint32_t corner = 0; corner < {corners}u; corner++) {{
+        /* 마지막 축을 제외한 꼭짓점의 가중치와 행 번호 */
+        float weight = 1.0f;
+        uint32_t row = 0;
+        for (int axis = 0; axis < {last}; axis++) {{
+            const int bit = (corner >> axis) & 1;
+            weight *= bit ? frac[axis] : 1.0f - frac[axis];
+            row = row * {name}_counts[axis] + (uint32_t)(lower[axis] + bit);
+        }}
+        if (weight <= 0.0f) {{
+            continue;
+        }}
+        int32_t first[6], second[6];
+        {name}_row_pair(row, lower[{last}], first, second);
+        for (int servo = 0; servo < 6; servo++) {{
+            if ((last < 1.0f && first[servo] == {prefix}_INVALID) || (last > 0.0f && second[servo] == {prefix}_INVALID)) {{
+                return -1;
+            }}
+            sum[servo] += weight * ((1.0f - last) * (float)first[servo] + last * (float)second[servo]);
+        }}
+    }}
+    for (int servo = 0; servo < 6; servo++) {{
+        angles[servo] = sum[servo] / {prefix}_ANGLE_SCALE;
+    }}
+    return 0;
+}}
+
+#endif /* {prefix}_H */
+"""
+
+
+def _parse_axis_option(text):
+    """'roll=-20:20:9' 형식의 축 정의 해석"""
+    try:
+        axis, values = text.split('=', 1)
+        low, high, count = values.split(':')
+        return axis.strip(), (float(low), float(high), int(count))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"축 정의는 이름=최소:최대:개수 형식이어야 합니다: {text!r}")
+
+
+def main():
+    """펌웨어 테이블 생성 후 크기와 오차 보고서 출력"""
+    parser = argparse.ArgumentParser(description="Stewart Platform 펌웨어용 고정 소수점 룩업 테이블 내보내기")
+    parser.add_argument('--axis', action='append', type=_parse_axis_option, metavar='NAME=MIN:MAX:COUNT',
+                        help="테이블 축 (여러 번 지정, 기본값: z, roll, pitch, yaw)")
+    parser.add_argument('--config', help="플랫폼 설정 JSON 파일 (기본값: 기본 설정)")
+    parser.add_argument('--scale', type=float, default=ANGLE_SCALE, help="도당 값 (기본값: 100 = 0.01도)")
+    parser.add_argument('--output', default='stewart_table', help="출력 경로 접두어 (.bin, .h)")
+    parser.add_argument('--samples', type=int, default=10000, help="오차 보고서 무작위 자세 수")
+    args = parser.parse_args()
+
+    config = None
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            config = json.load(f)
+    platform = StewartPlatform(config)
+    grid = dict(args.axis) if args.axis else None
+    try:
+        table = build_firmware_table(platform, grid, args.scale)
+    except ValueError as e:
+        parser.exit(1, f"오류: {e}\n")
+    paths = table.save(args.output, comment=f"config {config_hash(platform.config)}")
+
+    stats = table.stats()
+    print(f"저장: {', '.join(paths)}")
+    print(f"블롭 {stats['blob_bytes']} 바이트 (int16 원본 {stats['raw_bytes']} 바이트, {stats['compression']:.2f}배), "
+          f"서보 행 원본/1차/2차 차분 {stats['rows_raw']}/{stats['rows_delta']}/{stats['rows_delta2']}")
+    report = error_report(table, platform, args.samples)
+    for key, value in report.items():
+        if isinstance(value, list):
+            value = '[' + ', '.join(f"{item:.4f}" for item in value) + ']'
+        print(f"{key}: {value:.4f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
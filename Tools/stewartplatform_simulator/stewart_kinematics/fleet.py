@@ -0,0 +1,92 @@
+"""여러 대의 플랫폼을 한 번에 계산하는 배치 역기구학
+
+측정된 기하가 조금씩 다른 K 대의 플랫폼에 대해 조인트 위치, 베타, T0, 로드/호른 길이를
+[K, ...] 배열로 쌓아 [K,N] 자세를 한 번의 벡터 연산으로 계산한다.
+
+    fleet = PlatformFleet.from_configs(configs)
+    angles, valid = fleet.solve_tick(translations, quaternions)  # [K,3], [K,4] -> [K,6]
+"""
+import numpy as np
+
+from .kinematics import StewartPlatform, _solve_inverse_kinematics
+from .rotation import quaternion_array_to_matrix
+
+
+class PlatformFleet:
+    """K 대의 플랫폼 기하를 배열 축으로 가지는 배치 역기구학"""
+    def __init__(self, platforms):
+        platforms = list(platforms)
+        if not platforms:
+            raise ValueError("플랫폼이 1대 이상 필요합니다")
+        self.platforms = platforms
+
+        geometry = [platform._geometry_arrays() for platform in platforms]
+        self.base_joints = np.stack([g[0] for g in geometry])       # [K,6,3]
+        self.platform_joints = np.stack([g[1] for g in geometry])   # [K,6,3]
+        self.cos_beta = np.stack([g[2] for g in geometry])          # [K,6]
+        self.sin_beta = np.stack([g[3] for g in geometry])          # [K,6]
+        self.t0_z = np.array([float(platform.T0[2]) for platform in platforms])
+        self.rod_length = np.array([float(platform.config['rod_length']) for platform in platforms])
+        self.horn_length = np.array([float(platform.config['horn_length']) for platform in platforms])
+        self.servo_offsets = np.array([platform.servo_offsets for platform in platforms])  # [K,6]
+
+    @classmethod
+    def from_configs(cls, configs):
+        """config 딕셔너리 목록으로부터 생성"""
+        return cls(StewartPlatform(config) for config in configs)
+
+    def __len__(self):
+        return len(self.platforms)
+
+    def calculate_inverse_kinematics_batch(self, translations, quaternions,
+                                           return_horn_positions=False, chunk_size=8192):
+        """K 대 플랫폼의 배치 역기구학
+
+        translations 는 [K,N,3] (플랫폼별 자세) 또는 [N,3] (모든 플랫폼에 같은 자세),
+        quaternions 는 [K,N,4] 또는 [N,4] (w, x, y, z) 이다.
+        (servo_angles [K,N,6] 도 단위, valid [K,N,6]) 을 반환하며 계산이 불가능한 다리는 NaN/False.
+        return_horn_positions=True 이면 [K,N,6,3] 호른 위치를 추가로 반환한다.
+        """
+        k = len(self)
+        translations = np.asarray(translations, dtype=float)
+        quaternions = np.asarray(quaternions, dtype=float)
+        if translations.ndim == 2:
+            translations = np.broadcast_to(translations, (k,) + translations.shape)
+        if quaternions.ndim == 2:
+            quaternions = np.broadcast_to(quaternions, (k,) + quaternions.shape)
+        if translations.shape[0] != k or quaternions.shape[0] != k:
+            raise ValueError(f"자세 배열의 첫 번째 축은 플랫폼 수({k})와 같아야 합니다")
+        if translations.shape[1] != quaternions.shape[1]:
+            raise ValueError("translations 와 quaternions 의 개수가 다릅니다")
+
+        n = translations.shape[1]
+        servo_angles = np.empty((k, n, 6))
+        valid = np.empty((k, n, 6), dtype=bool)
+        horn_positions = np.empty((k, n, 6, 3)) if return_horn_positions else None
+
+        # 플랫폼 축 뒤에 자세 축을 두어 [K,1,...] 기하와 [K,N,...] 자세를 브로드캐스팅
+        per_robot = (slice(None), None)
+        step = max(1, chunk_size // k)
+        for start in range(0, n, step):
+            stop = min(start + step, n)
+            rotation_matrices = quaternion_array_to_matrix(quaternions[:, start:stop])
+            angles, ok, horns, _ = _solve_inverse_kinematics(
+                self.base_joints[per_robot], self.platform_joints[per_robot],
+                self.cos_beta[per_robot], self.sin_beta[per_robot],
+                self.t0_z[:, None, None], self.rod_length[:, None, None], self.horn_length[:, None, None],
+                translations[:, start:stop], rotation_matrices)
+            servo_angles[:, start:stop] = angles - self.servo_offsets[:, None, :]
+            valid[:, start:stop] = ok
+            if return_horn_positions:
+                horn_positions[:, start:stop] = horns
+
+        if return_horn_positions:
+            return servo_angles, valid, horn_positions
+        return servo_angles, valid
+
+    def solve_tick(self, translations, quaternions):
+        """제어 주기 한 번 - 플랫폼별 자세 하나씩 ([K,3], [K,4]) 으로부터 (servo_angles [K,6], valid [K,6])"""
+        translations = np.asarray(translations, dtype=float).reshape(len(self), 1, 3)
+        quaternions = np.asarray(quaternions, dtype=float).reshape(len(self), 1, 4)
+        servo_angles, valid = self.calculate_inverse_kinematics_batch(translations, quaternions)
+        return servo_angles[:, 0], valid[:, 0]
@@ -0,0 +1,751 @@
+"""Stewart Platform 기구학 - 쿼터니언, 역기구학/순기구학
+
+tkinter, matplotlib 없이 NumPy 만으로 동작한다.
+"""
+import math
+import os
+import time
+import json
+import hashlib
+import logging
+import numpy as np
+
+from .cache import PoseCache
+from .metrics import IKMetrics
+from .rotation import Rotation, quaternion_array_to_matrix
+
+logger = logging.getLogger(__name__)
+
+class Quaternion:
+    """쿼터니언 클래스 - 회전을 표현"""
+    def __init__(self, w=1.0, x=0.0, y=0.0, z=0.0):
+        self.w = w
+        self.x = x
+        self.y = y
+        self.z = z
+    
+    @classmethod
+    def from_euler(cls, roll, pitch, yaw):
+        """오일러 각도(RPY)로부터 쿼터니언 생성"""
+        cy = math.cos(yaw * 0.5)
+        sy = math.sin(yaw * 0.5)
+        cp = math.cos(pitch * 0.5)
+        sp = math.sin(pitch * 0.5)
+        cr = math.cos(roll * 0.5)
+        sr = math.sin(roll * 0.5)
+        
+        w = cr * cp * cy + sr * sp * sy
+        x = sr * cp * cy - cr * sp * sy
+        y = cr * sp * cy + sr * cp * sy
+        z = cr * cp * sy - sr * sp * cy
+        
+        return cls(w, x, y, z)
+    
+    @classmethod
+    def from_rotation(cls, rotation):
+        """rotation.Rotation 으로부터 생성"""
+        return cls(rotation.w, rotation.x, rotation.y, rotation.z)
+    
+    def to_rotation(self):
+        """rotation.Rotation 으로 변환"""
+        return Rotation.from_quaternion(self)
+    
+    def to_matrix(self):
+        """회전 행렬 (3x3 리스트) - v' = q * v * q* 와 같은 결과"""
+        w, x, y, z = self.w, self.x, self.y, self.z
+        return [
+            [w*w + x*x - y*y - z*z, 2 * (x*y - w*z), 2 * (x*z + w*y)],
+            [2 * (x*y + w*z), w*w - x*x + y*y - z*z, 2 * (y*z - w*x)],
+            [2 * (x*z - w*y), 2 * (y*z + w*x), w*w - x*x - y*y + z*z]
+        ]
+    
+    def rotate_vector(self, vector):
+        """벡터를 쿼터니언으로 회전"""
+        # 쿼터니언 회전 공식 v' = q * v * q* 를 회전 행렬로 전개하여 임시 객체 없이 계산
+        m = self.to_matrix()
+        return [
+            m[0][0] * vector[0] + m[0][1] * vector[1] + m[0][2] * vector[2],
+            m[1][0] * vector[0] + m[1][1] * vector[1] + m[1][2] * vector[2],
+            m[2][0] * vector[0] + m[2][1] * vector[1] + m[2][2] * vector[2]
+        ]
+    
+    def multiply(self, other):
+        """쿼터니언 곱셈"""
+        w = self.w * other.w - self.x * other.x - self.y * other.y - self.z * other.z
+        x = self.w * other.x + self.x * other.w + self.y * other.z - self.z * other.y
+        y = self.w * other.y - self.x * other.z + self.y * other.w + self.z * other.x
+        z = self.w * other.z + self.x * other.y - self.y * other.x + self.z * other.w
+        return Quaternion(w, x, y, z)
+
+# 사전 계산 결과(룩업 테이블 등)를 저장하는 기본 캐시 디렉터리
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'stewart_platform')
+
+def _normalize_config_value(value):
+    """해시 계산용 설정값 정규화 (80 과 80.0 을 같은 값으로 취급)"""
+    if isinstance(value, dict):
+        return {key: _normalize_config_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_config_value(item) for item in value]
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+def config_hash(config):
+    """config 딕셔너리의 해시 - 기하 정보가 같으면 같은 값 (디스크 캐시 키로 사용)"""
+    data = json.dumps(_normalize_config_value(config), sort_keys=True)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()[:16]
+
+def _solve_inverse_kinematics(base_joints, platform_joints, cos_beta, sin_beta, t0_z,
+                              rod_length, horn_length, translations, rotation_matrices,
+                              return_reasons=False):
+    """역기구학 핵심 계산 - NumPy 브로드캐스팅으로 모든 자세와 다리를 한 번에 계산
+    
+    base_joints/platform_joints 는 [...,6,3], cos_beta/sin_beta 는 [...,6],
+    translations 는 [...,3], rotation_matrices 는 [...,3,3] 형태이며
+    앞쪽 차원끼리 브로드캐스팅된다. (servo_angles, valid, horn_positions, sqrt_term) 반환.
+    return_reasons=True 이면 실패 원인 코드 (metrics.FAILURE_REASONS 인덱스 + 1, 성공은 0) 를 추가로 반환한다.
+    """
+    t = translations[..., None, :]
+    R = rotation_matrices[..., None, :, :]
+    px = platform_joints[..., 0]
+    py = platform_joints[..., 1]
+    pz = platform_joints[..., 2]
+    
+    # 베이스에서 플랫폼 조인트까지의 벡터
+    l_x = t[..., 0] + R[..., 0, 0] * px + R[..., 0, 1] * py + R[..., 0, 2] * pz - base_joints[..., 0]
+    l_y = t[..., 1] + R[..., 1, 0] * px + R[..., 1, 1] * py + R[..., 1, 2] * pz - base_joints[..., 1]
+    l_z = (t[..., 2] + R[..., 2, 0] * px + R[..., 2, 1] * py + R[..., 2, 2] * pz + t0_z
+           - base_joints[..., 2])
+    
+    gk = l_x**2 + l_y**2 + l_z**2 - rod_length**2 + horn_length**2
+    ek = 2 * horn_length * l_z
+    fk = 2 * horn_length * (cos_beta * l_x + sin_beta * l_y)
+    sq_sum = ek**2 + fk**2
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sqrt_term = 1 - gk**2 / sq_sum
+        sqrt1 = np.sqrt(sqrt_term)
+        sqrt2 = np.sqrt(sq_sum)
+        sin_alpha = (gk * ek) / sq_sum - (fk * sqrt1) / sqrt2
+        cos_alpha = (gk * fk) / sq_sum + (ek * sqrt1) / sqrt2
+    
+    # calculate_inverse_kinematics 와 동일한 안전장치 (NaN 은 비교에서 자동으로 제외됨)
+    valid = (sq_sum >= 1e-10) & (sqrt_term >= 0) & (np.abs(sin_alpha) <= 1.0)
+    
+    servo_angles = np.where(valid, np.degrees(np.arcsin(np.where(valid, sin_alpha, 0.0))), np.nan)
+    
+    # 호른 위치 - 계산 불가능한 다리는 [0, 0, 0]
+    horn_positions = np.stack([
+        base_joints[..., 0] + horn_length * cos_alpha * cos_beta,
+        base_joints[..., 1] + horn_length * cos_alpha * sin_beta,
+        base_joints[..., 2] + horn_length * sin_alpha
+    ], axis=-1)
+    horn_positions = np.where(valid[..., None], horn_positions, 0.0)
+    
+    if return_reasons:
+        # 실패한 다리만 원인 판별 (위 안전장치와 같은 순서)
+        reasons = np.zeros(valid.shape, dtype=np.int8)
+        invalid = ~valid
+        if invalid.any():
+            reasons[invalid] = np.where(sq_sum[invalid] < 1e-10, 1,
+                                        np.where(sqrt_term[invalid] >= 0, 3, 2))
+        return servo_angles, valid, horn_positions, sqrt_term, reasons
+    return servo_angles, valid, horn_positions, sqrt_term
+
+def _solve_jacobian(base_joints, platform_joints, cos_beta, sin_beta, t0_z,
+                    rod_length, horn_length, translations, rotation_matrices, characteristic_length):
+    """해석적 6x6 야코비안 - 플랫폼 속도 [v, L·ω] 로부터 서보 각속도 계산 (역기구학과 같은 브로드캐스팅)
+    
+    다리 i 의 로드 벡터 d = P - H (P 플랫폼 조인트, H 호른 끝), 호른 접선 a = dH/dα 에 대해
+    행 i 는 [d, (R·p × d) / L] / (d·a) 이며, d·a = (ek·cos α - fk·sin α) / 2 이다.
+    회전 열을 characteristic_length(L, mm) 로 나누어 모든 열이 mm 단위 변위에 대응하도록 맞춘다.
+    (jacobians [...,6,6], valid [...]) 반환 - 계산 불가능한 다리가 있거나 d·a 가 0 이면 valid 는 False.
+    """
+    servo_angles, leg_valid, horn_positions, _ = _solve_inverse_kinematics(
+        base_joints, platform_joints, cos_beta, sin_beta, t0_z,
+        rod_length, horn_length, translations, rotation_matrices)
+    
+    alpha = np.radians(np.where(leg_valid, servo_angles, 0.0))
+    rotated = np.matmul(rotation_matrices[..., None, :, :], platform_joints[..., None])[..., 0]
+    joints = rotated + translations[..., None, :]
+    joints[..., 2] += t0_z
+    rods = joints - horn_positions
+    
+    sin_alpha = np.sin(alpha)
+    tangents = horn_length * np.stack([-sin_alpha * cos_beta, -sin_alpha * sin_beta, np.cos(alpha)], axis=-1)
+    rod_dot_tangent = np.sum(rods * tangents, axis=-1)
+    
+    valid = np.all(leg_valid & (np.abs(rod_dot_tangent) > 1e-9), axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rows = np.concatenate([rods, np.cross(rotated, rods) / characteristic_length], axis=-1)
+        jacobians = rows / rod_dot_tangent[..., None]
+    jacobians = np.where(valid[..., None, None], jacobians, np.nan)
+    return jacobians, valid
+
+def jacobian_conditioning(jacobians, valid=None):
+    """야코비안 [...,6,6] 의 특이값으로부터 특이 자세 근접도 지표 계산
+    
+    condition: 조건수 (1 이 가장 좋고 특이 자세에서 무한대)
+    manipulability: |det J| (특이 자세에서 0)
+    error_gain: 서보 각도 오차 1도당 최대 플랫폼 변위 (mm, 회전은 L·θ 로 환산)
+    계산 불가능한 자세는 condition/error_gain 이 inf, manipulability 가 0 이다.
+    """
+    jacobians = np.asarray(jacobians, dtype=float)
+    if valid is None:
+        valid = np.all(np.isfinite(jacobians), axis=(-2, -1))
+    safe = np.where(valid[..., None, None], jacobians, np.eye(6))
+    singular_values = np.linalg.svd(safe, compute_uv=False)
+    smallest = singular_values[..., -1]
+    with np.errstate(divide='ignore'):
+        condition = np.where(valid & (smallest > 0), singular_values[..., 0] / smallest, np.inf)
+        error_gain = np.where(valid & (smallest > 0), math.radians(1.0) / smallest, np.inf)
+    manipulability = np.where(valid, np.prod(singular_values, axis=-1), 0.0)
+    return {
+        'condition': condition,
+        'manipulability': manipulability,
+        'error_gain': error_gain,
+        'valid': valid,
+    }
+
+def euler_to_matrix_array(roll, pitch, yaw):
+    """오일러 각도 배열(라디안)로부터 [...,3,3] 회전 행렬과 각 각도에 대한 미분 행렬 생성
+    
+    Quaternion.from_euler 와 같은 규약 (R = Rz(yaw) * Ry(pitch) * Rx(roll)) 을 사용하며
+    (R, dR/droll, dR/dpitch, dR/dyaw) 를 반환한다.
+    """
+    roll = np.asarray(roll, dtype=float)
+    pitch = np.asarray(pitch, dtype=float)
+    yaw = np.asarray(yaw, dtype=float)
+    zeros = np.zeros(np.broadcast(roll, pitch, yaw).shape)
+    ones = np.ones_like(zeros)
+    
+    def stack(rows):
+        return np.stack([np.stack(row, axis=-1) for row in rows], axis=-2)
+    
+    cr, sr = np.cos(roll) + zeros, np.sin(roll) + zeros
+    cp, sp = np.cos(pitch) + zeros, np.sin(pitch) + zeros
+    cy, sy = np.cos(yaw) + zeros, np.sin(yaw) + zeros
+    
+    rx = stack([[ones, zeros, zeros], [zeros, cr, -sr], [zeros, sr, cr]])
+    ry = stack([[cp, zeros, sp], [zeros, ones, zeros], [-sp, zeros, cp]])
+    rz = stack([[cy, -sy, zeros], [sy, cy, zeros], [zeros, zeros, ones]])
+    drx = stack([[zeros, zeros, zeros], [zeros, -sr, -cr], [zeros, cr, -sr]])
+    dry = stack([[-sp, zeros, cp], [zeros, zeros, zeros], [-cp, zeros, -sp]])
+    drz = stack([[-sy, -cy, zeros], [cy, -sy, zeros], [zeros, zeros, zeros]])
+    
+    rzy = rz @ ry
+    return rzy @ rx, rzy @ drx, rz @ dry @ rx, drz @ ry @ rx
+
+def _solve_forward_kinematics(base_joints, platform_joints, cos_beta, sin_beta, t0_z,
+                              rod_length, horn_length, servo_angles, initial_poses,
+                              tolerance=1e-6, max_iterations=20):
+    """순기구학 핵심 계산 - 해석적 야코비안을 사용한 배치 뉴턴-랩슨 반복
+    
+    servo_angles [N,6] (라디안), initial_poses [N,6] (x, y, z, roll, pitch, yaw[라디안]).
+    기하 정보는 [6,3] 또는 자세별 [N,6,3] 형태 (t0_z 는 스칼라 또는 [N], 로드/호른 길이는
+    스칼라, [N] 또는 다리별 [N,6]) 로 브로드캐스팅된다.
+    각 다리의 로드 길이 오차가 tolerance(mm) 이하가 되면 수렴으로 판단하며
+    (poses [N,6], converged [N], iterations [N], residual [N] 로드 길이 최대 오차 mm) 반환.
+    """
+    servo_angles = np.asarray(servo_angles, dtype=float)
+    n = len(servo_angles)
+    poses = np.array(initial_poses, dtype=float)
+    iterations = np.zeros(n, dtype=int)
+    residual = np.full(n, np.inf)
+    converged = np.zeros(n, dtype=bool)
+    
+    rod_length = np.asarray(rod_length, dtype=float)
+    t0_z = np.asarray(t0_z, dtype=float)
+    horn_length = np.asarray(horn_length, dtype=float)
+    if horn_length.ndim == 1:
+        horn_length = horn_length[:, None]
+    
+    # 각 다리의 호른 끝 위치는 서보 각도만으로 결정된다
+    cos_alpha = np.cos(servo_angles)
+    sin_alpha = np.sin(servo_angles)
+    horn_positions = np.stack([
+        base_joints[..., 0] + horn_length * cos_alpha * cos_beta,
+        base_joints[..., 1] + horn_length * cos_alpha * sin_beta,
+        base_joints[..., 2] + horn_length * sin_alpha
+    ], axis=-1)
+    
+    active = np.all(np.isfinite(servo_angles), axis=1) & np.all(np.isfinite(poses), axis=1)
+    
+    for iteration in range(max_iterations + 1):
+        index = np.flatnonzero(active)
+        if len(index) == 0:
+            break
+        
+        p = poses[index]
+        platform = platform_joints[index] if np.ndim(platform_joints) == 3 else platform_joints
+        if rod_length.ndim == 0:
+            rod_sq = rod_length**2
+        else:
+            rod_sq = (rod_length[index, None] if rod_length.ndim == 1 else rod_length[index])**2
+        t0 = t0_z[index, None] if t0_z.ndim == 1 else t0_z
+        
+        R, dR_roll, dR_pitch, dR_yaw = euler_to_matrix_array(p[:, 3], p[:, 4], p[:, 5])
+        rotated = (R[:, None] @ platform[..., None])[..., 0]
+        joints = rotated + p[:, None, :3]
+        joints[..., 2] += t0
+        
+        # 로드 벡터와 제약식 f_i = |Q_i - H_i|^2 - rod^2
+        d = joints - horn_positions[index]
+        length_sq = np.sum(d * d, axis=2)
+        f = length_sq - rod_sq
+        error = np.max(np.abs(np.sqrt(length_sq) - np.sqrt(rod_sq)), axis=1)
+        residual[index] = error
+        
+        done = error <= tolerance
+        converged[index[done]] = True
+        active[index[done]] = False
+        if np.all(done) or iteration == max_iterations:
+            break
+        
+        keep = ~done
+        index, p, d, f = index[keep], p[keep], d[keep], f[keep]
+        platform = platform[keep] if np.ndim(platform) == 3 else platform
+        dR_roll, dR_pitch, dR_yaw = dR_roll[keep], dR_pitch[keep], dR_yaw[keep]
+        
+        # 해석적 야코비안: df/dt = 2d, df/dtheta = 2 d . (dR/dtheta P)
+        jacobian = np.empty((len(index), 6, 6))
+        jacobian[:, :, :3] = 2 * d
+        for column, dR in zip((3, 4, 5), (dR_roll, dR_pitch, dR_yaw)):
+            jacobian[:, :, column] = 2 * np.sum(d * (dR[:, None] @ platform[..., None])[..., 0], axis=2)
+        
+        try:
+            step = np.linalg.solve(jacobian, -f[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            step = -(np.linalg.pinv(jacobian) @ f[..., None])[..., 0]
+        
+        # 발산 방지를 위해 한 번의 이동량 제한 (mm, 라디안)
+        scale = np.minimum(1.0, np.minimum(
+            20.0 / np.maximum(np.max(np.abs(step[:, :3]), axis=1), 1e-12),
+            0.3 / np.maximum(np.max(np.abs(step[:, 3:]), axis=1), 1e-12)))
+        poses[index] = p + step * scale[:, None]
+        iterations[index] += 1
+        
+        bad = ~np.all(np.isfinite(poses[index]), axis=1)
+        active[index[bad]] = False
+    
+    return poses, converged, iterations, residual
+
+class StewartPlatform:
+    """Stewart Platform 역기구학 계산 클래스"""
+    def __init__(self, config=None):
+        if config is None:
+            config = {
+                'base_radius': 80,
+                'platform_radius': 50,
+                'rod_length': 130,
+                'horn_length': 50,
+                'shaft_distance': 20,
+                'anchor_distance': 20,
+                'rotation_limit': 30.0  # 회전 한계 추가
+            }
+        
+        self.config = config
+        self.base_joints = []
+        self.platform_joints = []
+        self.sin_beta = []
+        self.cos_beta = []
+        self.T0 = [0, 0, 0]
+        self.current_translation = [0, 0, 0]
+        self.current_orientation = Quaternion()
+        self.horn_positions = []
+        self._fk_last_pose = np.zeros(6)  # 순기구학 웜 스타트용 이전 해
+        self._workspace_cache = None  # (config 해시, WorkspaceMap)
+        self.metrics = None  # IKMetrics - None 이면 계측하지 않음
+        self.pose_cache = None  # PoseCache - None 이면 캐시하지 않음
+        
+        self._initialize_platform()
+    
+    def _initialize_platform(self):
+        """플랫폼 초기화 - 베이스와 플랫폼 조인트 위치 계산"""
+        base_radius = self.config['base_radius']
+        platform_radius = self.config['platform_radius']
+        shaft_distance = self.config['shaft_distance']
+        anchor_distance = self.config['anchor_distance']
+        
+        # 6개 다리의 베이스와 플랫폼 조인트 위치 계산
+        for i in range(6):
+            pm = (-1) ** i
+            phi_cut = (1 + i - i % 2) * math.pi / 3
+            
+            # 베이스 조인트 위치
+            phi_b = (i + i % 2) * math.pi / 3 + pm * shaft_distance / (2 * base_radius)
+            base_x = math.cos(phi_b) * base_radius
+            base_y = math.sin(phi_b) * base_radius
+            self.base_joints.append([base_x, base_y, 0])
+            
+            # 플랫폼 조인트 위치
+            phi_p = phi_cut - pm * anchor_distance / (2 * platform_radius)
+            platform_x = math.cos(phi_p) * platform_radius
+            platform_y = math.sin(phi_p) * platform_radius
+            self.platform_joints.append([platform_x, platform_y, 0])
+            
+            # 모터 회전각 (베타)
+            motor_rotation = phi_b + ((i + 0) % 2) * math.pi + math.pi / 2
+            self.sin_beta.append(math.sin(motor_rotation))
+            self.cos_beta.append(math.cos(motor_rotation))
+        
+        # 초기 높이 계산
+        self.T0[2] = math.sqrt(
+            self.config['rod_length']**2 + self.config['horn_length']**2
+            - (self.platform_joints[0][0] - self.base_joints[0][0])**2
+            - (self.platform_joints[0][1] - self.base_joints[0][1])**2
+        )
+        
+        # 보정값 (calibration 모듈 출력) - T0 는 공칭 조인트로 계산한 값을 그대로 사용
+        for joints, key in ((self.base_joints, 'base_joint_offsets'),
+                            (self.platform_joints, 'platform_joint_offsets')):
+            offsets = self.config.get(key)
+            if offsets is None:
+                continue
+            if len(offsets) != 6 or any(len(offset) != 3 for offset in offsets):
+                raise ValueError(f"{key} 는 6개의 [x, y, z] 값이어야 합니다")
+            for joint, offset in zip(joints, offsets):
+                for axis in range(3):
+                    joint[axis] += float(offset[axis])
+        
+        # 서보 영점 오프셋 (도) - 실제 호른 각도 = 명령 각도 + 오프셋
+        self.servo_offsets = [float(value) for value in self.config.get('servo_offsets', [0.0] * 6)]
+        if len(self.servo_offsets) != 6:
+            raise ValueError("servo_offsets 는 6개의 값이어야 합니다")
+        
+        # 호른 위치 초기화
+        self.horn_positions = [[0, 0, 0] for _ in range(6)]
+    
+    def _geometry_arrays(self):
+        """배치 계산용 기하 정보 배열 (base_joints, platform_joints, cos_beta, sin_beta)"""
+        return (np.asarray(self.base_joints, dtype=float),
+                np.asarray(self.platform_joints, dtype=float),
+                np.asarray(self.cos_beta, dtype=float),
+                np.asarray(self.sin_beta, dtype=float))
+    
+    def enable_metrics(self, metrics=None):
+        """역기구학 계측 시작 - 연결된 IKMetrics 반환 (disable_metrics 로 해제)"""
+        self.metrics = metrics if metrics is not None else IKMetrics()
+        return self.metrics
+    
+    def disable_metrics(self):
+        """역기구학 계측 해제"""
+        self.metrics = None
+    
+    def enable_pose_cache(self, cache=None, **options):
+        """역기구학 결과 캐시 사용 - 연결된 PoseCache 반환 (options 는 PoseCache 생성 인자)"""
+        self.pose_cache = cache if cache is not None else PoseCache(**options)
+        return self.pose_cache
+    
+    def disable_pose_cache(self):
+        """역기구학 결과 캐시 해제"""
+        self.pose_cache = None
+    
+    def calculate_workspace_limits(self, workers=1):
+        """작업 공간의 한계 계산 - 배치 역기구학 샘플링 결과 (config 별로 캐시됨)
+        
+        GUI 의 Tk 스레드처럼 다른 스레드가 돌고 있는 프로세스에서 호출되므로 기본값은 프로세스 풀 없이
+        (workers=1) 계산한다 (기본 명세 콜드 계산은 단일 코어에서 1초 미만).
+        """
+        try:
+            from .workspace import get_workspace
+            return get_workspace(self, workers=workers).limits()
+        except Exception:
+            # 오류 발생 시 기본값 반환 - 실제 한계가 아니므로 원인을 로그로 남김
+            logger.warning("작업 공간 계산 실패 - 기본 한계를 사용합니다", exc_info=True)
+            return {
+                'x_range': (-50, 50),
+                'y_range': (-50, 50),
+                'z_range': (-30, 30),
+                'rotation_range': (-30, 30)
+            }
+    
+    def calculate_inverse_kinematics(self, translation, orientation):
+        """역기구학 계산 - 위치와 방향으로부터 모터 각도 계산"""
+        horn_length = self.config['horn_length']
+        rod_length = self.config['rod_length']
+        
+        self.current_translation = translation
+        self.current_orientation = orientation
+        
+        metrics = self.metrics
+        if metrics is not None:
+            started = time.perf_counter()
+        
+        # 양자화된 자세 캐시 - 적중하면 저장된 서보 각도와 호른 위치를 그대로 사용
+        cache = self.pose_cache
+        if cache is not None:
+            cache_key = cache.key(translation, orientation)
+            cached = cache.get(self.config, cache_key)
+            if cached is not None:
+                self.horn_positions = [list(position) for position in cached.horn_positions]
+                if metrics is not None:
+                    # 적중도 호출/실패 원인에 포함 - 한계 근접도는 처음 계산할 때만 기록됨
+                    metrics.record_scalar(time.perf_counter() - started, translation,
+                                          (orientation.w, orientation.x, orientation.y, orientation.z),
+                                          cached.failure_reasons, [None] * 6)
+                return list(cached.servo_angles)
+        
+        servo_angles = []
+        # 다리별 실패 원인과 한계 근접도 (계측용)
+        reasons = [None] * 6
+        margins = [None] * 6
+        
+        # 자세당 회전 행렬을 한 번만 계산
+        m = orientation.to_matrix()
+        
+        for i in range(6):
+            try:
+                # 플랫폼 조인트를 회전
+                p = self.platform_joints[i]
+                rotated_platform = [
+                    m[0][0] * p[0] + m[0][1] * p[1] + m[0][2] * p[2],
+                    m[1][0] * p[0] + m[1][1] * p[1] + m[1][2] * p[2],
+                    m[2][0] * p[0] + m[2][1] * p[1] + m[2][2] * p[2]
+                ]
+                
+                # 플랫폼 조인트의 절대 위치
+                q_x = translation[0] + rotated_platform[0]
+                q_y = translation[1] + rotated_platform[1]
+                q_z = translation[2] + rotated_platform[2] + self.T0[2]
+                
+                # 베이스에서 플랫폼 조인트까지의 벡터
+                l_x = q_x - self.base_joints[i][0]
+                l_y = q_y - self.base_joints[i][1]
+                l_z = q_z - self.base_joints[i][2]
+                
+                # 역기구학 계산
+                gk = l_x**2 + l_y**2 + l_z**2 - rod_length**2 + horn_length**2
+                ek = 2 * horn_length * l_z
+                fk = 2 * horn_length * (self.cos_beta[i] * l_x + self.sin_beta[i] * l_y)
+                
+                sq_sum = ek**2 + fk**2
+                
+                # 안전장치: sq_sum이 0이거나 너무 작은 경우
+                if sq_sum < 1e-10:
+                    reasons[i] = 'sq_sum_small'
+                    servo_angles.append(None)
+                    self.horn_positions[i] = [0, 0, 0]
+                    continue
+                
+                # 제곱근 계산 전 안전장치
+                sqrt_term = 1 - gk**2 / sq_sum
+                margins[i] = sqrt_term
+                if sqrt_term < 0:
+                    # 물리적으로 불가능한 위치
+                    reasons[i] = 'negative_sqrt_term'
+                    servo_angles.append(None)
+                    self.horn_positions[i] = [0, 0, 0]
+                    continue
+                
+                sqrt1 = math.sqrt(sqrt_term)
+                sqrt2 = math.sqrt(sq_sum)
+                
+                sin_alpha = (gk * ek) / sq_sum - (fk * sqrt1) / sqrt2
+                cos_alpha = (gk * fk) / sq_sum + (ek * sqrt1) / sqrt2
+                
+                # 삼각함수 값 범위 체크
+                if abs(sin_alpha) > 1.0:
+                    # 물리적으로 불가능한 각도
+                    reasons[i] = 'sin_alpha_out_of_range'
+                    servo_angles.append(None)
+                    self.horn_positions[i] = [0, 0, 0]
+                    continue
+                
+                # 호른 위치 계산
+                self.horn_positions[i] = [
+                    self.base_joints[i][0] + horn_length * cos_alpha * self.cos_beta[i],
+                    self.base_joints[i][1] + horn_length * cos_alpha * self.sin_beta[i],
+                    self.base_joints[i][2] + horn_length * sin_alpha
+                ]
+                
+                # 서보 각도 계산
+                servo_angle = math.asin(sin_alpha)
+                
+                # 각도 범위 체크 (-90도 ~ 90도)
+                if -math.pi/2 <= servo_angle <= math.pi/2:
+                    servo_angles.append(math.degrees(servo_angle) - self.servo_offsets[i])
+                else:
+                    reasons[i] = 'angle_out_of_range'
+                    servo_angles.append(None)
+                    
+            except (ValueError, ZeroDivisionError, OverflowError) as e:
+                # 수학적 오류 발생 시
+                reasons[i] = 'math_error'
+                servo_angles.append(None)
+                self.horn_positions[i] = [0, 0, 0]
+                continue
+        
+        if metrics is not None:
+            metrics.record_scalar(time.perf_counter() - started, translation,
+                                  (orientation.w, orientation.x, orientation.y, orientation.z),
+                                  reasons, margins)
+        
+        if cache is not None:
+            cache.put(self.config, cache_key, servo_angles, self.horn_positions, reasons)
+        
+        return servo_angles
+    
+    def calculate_inverse_kinematics_batch(self, translations, quaternions,
+                                           return_horn_positions=False, chunk_size=8192,
+                                           return_failure_reasons=False):
+        """배치 역기구학 계산 - [N,3] 위치와 [N,4] 쿼터니언(w, x, y, z)으로부터 모터 각도 계산
+        
+        (servo_angles [N,6] 도 단위, valid [N,6]) 을 반환하며 계산이 불가능한 다리는 NaN/False.
+        return_horn_positions=True 이면 [N,6,3] 호른 위치를,
+        return_failure_reasons=True 이면 [N,6] 실패 원인 코드 (metrics.FAILURE_REASONS 인덱스 + 1, 성공은 0) 를
+        이 순서로 추가로 반환한다. current_translation 등 현재 자세 상태는 변경하지 않는다.
+        """
+        translations = np.asarray(translations, dtype=float).reshape(-1, 3)
+        quaternions = np.asarray(quaternions, dtype=float).reshape(-1, 4)
+        if len(translations) != len(quaternions):
+            raise ValueError("translations 와 quaternions 의 개수가 다릅니다")
+        
+        metrics = self.metrics
+        if metrics is not None:
+            started = time.perf_counter()
+        with_reasons = return_failure_reasons or metrics is not None
+        
+        n = len(translations)
+        base, platform, cos_beta, sin_beta = self._geometry_arrays()
+        rod_length = float(self.config['rod_length'])
+        horn_length = float(self.config['horn_length'])
+        
+        servo_angles = np.empty((n, 6))
+        valid = np.empty((n, 6), dtype=bool)
+        horn_positions = np.empty((n, 6, 3)) if return_horn_positions else None
+        if with_reasons:
+            reasons = np.empty((n, 6), dtype=np.int8)
+            margins = np.empty((n, 6))
+        
+        # 메모리 사용량을 제한하기 위해 큰 배치는 청크 단위로 계산
+        for start in range(0, n, chunk_size):
+            stop = min(start + chunk_size, n)
+            rotation_matrices = quaternion_array_to_matrix(quaternions[start:stop])
+            solved = _solve_inverse_kinematics(
+                base, platform, cos_beta, sin_beta, self.T0[2],
+                rod_length, horn_length, translations[start:stop], rotation_matrices,
+                return_reasons=with_reasons)
+            servo_angles[start:stop] = solved[0]
+            valid[start:stop] = solved[1]
+            if return_horn_positions:
+                horn_positions[start:stop] = solved[2]
+            if with_reasons:
+                margins[start:stop] = solved[3]
+                reasons[start:stop] = solved[4]
+        
+        if any(self.servo_offsets):
+            servo_angles -= self.servo_offsets
+        
+        if metrics is not None:
+            metrics.record_batch(time.perf_counter() - started, translations, quaternions,
+                                 reasons, margins)
+        
+        result = (servo_angles, valid)
+        if return_horn_positions:
+            result += (horn_positions,)
+        if return_failure_reasons:
+            result += (reasons,)
+        return result
+    
+    def calculate_jacobian_batch(self, translations, quaternions, characteristic_length=None):
+        """배치 야코비안 계산 - [N,3] 위치와 [N,4] 쿼터니언으로부터 (jacobians [N,6,6], valid [N])
+        
+        J 는 플랫폼 속도 [v (mm/s), L·ω] 를 서보 각속도 (rad/s) 로 바꾸는 행렬이며
+        L 은 characteristic_length (기본값: platform_radius) 이다.
+        """
+        translations = np.asarray(translations, dtype=float).reshape(-1, 3)
+        quaternions = np.asarray(quaternions, dtype=float).reshape(-1, 4)
+        if len(translations) != len(quaternions):
+            raise ValueError("translations 와 quaternions 의 개수가 다릅니다")
+        if characteristic_length is None:
+            characteristic_length = float(self.config['platform_radius'])
+        
+        base, platform, cos_beta, sin_beta = self._geometry_arrays()
+        return _solve_jacobian(
+            base, platform, cos_beta, sin_beta, self.T0[2],
+            float(self.config['rod_length']), float(self.config['horn_length']),
+            translations, quaternion_array_to_matrix(quaternions), characteristic_length)
+    
+    def calculate_conditioning_batch(self, translations, quaternions, characteristic_length=None,
+                                     chunk_size=65536):
+        """배치 특이 자세 지표 - condition, manipulability, error_gain, valid 배열 딕셔너리 (jacobian_conditioning 참고)"""
+        translations = np.asarray(translations, dtype=float).reshape(-1, 3)
+        quaternions = np.asarray(quaternions, dtype=float).reshape(-1, 4)
+        parts = []
+        for start in range(0, len(translations), chunk_size):
+            jacobians, valid = self.calculate_jacobian_batch(
+                translations[start:start + chunk_size], quaternions[start:start + chunk_size],
+                characteristic_length)
+            parts.append(jacobian_conditioning(jacobians, valid))
+        if not parts:
+            parts.append(jacobian_conditioning(np.empty((0, 6, 6)), np.empty(0, dtype=bool)))
+        return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+    
+    def calculate_forward_kinematics_batch(self, servo_angles, initial_poses=None,
+                                           tolerance=1e-6, max_iterations=20):
+        """배치 순기구학 계산 - [N,6] 서보 각도(도)로부터 자세 계산
+        
+        initial_poses ([N,6] 또는 [6], x, y, z mm / roll, pitch, yaw 도) 에서 시작하여
+        뉴턴-랩슨 반복을 수행한다 (기본값: 중앙 자세).
+        (poses [N,6], converged [N], iterations [N], residual [N] 로드 길이 최대 오차 mm) 반환.
+        """
+        servo_angles = np.radians(np.asarray(servo_angles, dtype=float).reshape(-1, 6) + self.servo_offsets)
+        n = len(servo_angles)
+        if initial_poses is None:
+            initial = np.zeros((n, 6))
+        else:
+            initial = np.broadcast_to(np.asarray(initial_poses, dtype=float), (n, 6)).copy()
+            initial[:, 3:] = np.radians(initial[:, 3:])
+        
+        base, platform, cos_beta, sin_beta = self._geometry_arrays()
+        poses, converged, iterations, residual = _solve_forward_kinematics(
+            base, platform, cos_beta, sin_beta, self.T0[2],
+            float(self.config['rod_length']), float(self.config['horn_length']),
+            servo_angles, initial, tolerance, max_iterations)
+        poses[:, 3:] = np.degrees(poses[:, 3:])
+        return poses, converged, iterations, residual
+    
+    def calculate_forward_kinematics(self, servo_angles, initial_pose=None):
+        """순기구학 계산 - 6개 서보 각도(도)로부터 위치와 방향 계산
+        
+        initial_pose 가 없으면 이전 해에서 웜 스타트한다 (스트리밍 사용).
+        (translation, orientation, info) 를 반환하며 info 에는
+        converged, iterations, residual(로드 길이 최대 오차 mm) 이 들어 있다.
+        """
+        if initial_pose is None:
+            initial = self._fk_last_pose.copy()
+            initial[3:] = np.degrees(initial[3:])
+        else:
+            initial = initial_pose
+        
+        poses, converged, iterations, residual = self.calculate_forward_kinematics_batch(
+            [servo_angles], initial)
+        pose = poses[0]
+        
+        if converged[0]:
+            self._fk_last_pose = np.concatenate([pose[:3], np.radians(pose[3:])])
+        
+        translation = [float(value) for value in pose[:3]]
+        roll, pitch, yaw = np.radians(pose[3:])
+        orientation = Quaternion.from_euler(roll, pitch, yaw)
+        info = {
+            'converged': bool(converged[0]),
+            'iterations': int(iterations[0]),
+            'residual': float(residual[0])
+        }
+        return translation, orientation, info
+    
+    def get_platform_joints_world(self):
+        """현재 플랫폼 조인트의 월드 좌표 반환"""
+        world_joints = []
+        m = self.current_orientation.to_matrix()
+        t = self.current_translation
+        for p in self.platform_joints:
+            world_joint = [
+                t[0] + m[0][0] * p[0] + m[0][1] * p[1] + m[0][2] * p[2],
+                t[1] + m[1][0] * p[0] + m[1][1] * p[1] + m[1][2] * p[2],
+                t[2] + m[2][0] * p[0] + m[2][1] * p[1] + m[2][2] * p[2] + self.T0[2]
+            ]
+            world_joints.append(world_joint)
+        return world_joints
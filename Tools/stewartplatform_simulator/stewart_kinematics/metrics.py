@@ -0,0 +1,234 @@
+"""역기구학 계측 - 호출 지연 시간, 다리별 실패 원인, 한계 근접도
+
+StewartPlatform.metrics 에 IKMetrics 를 연결하면 스칼라/배치 역기구학 호출마다 기록되며,
+연결하지 않으면 (기본값 None) 계측 비용이 없다. 결과는 JSON 또는 Prometheus 텍스트 형식으로 내보낸다.
+
+    platform.enable_metrics()
+    ...
+    platform.metrics.export('ik_metrics.prom')
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+import numpy as np
+
+# 다리 계산 실패 원인 - 배치 역기구학의 원인 코드는 이 목록의 인덱스 + 1 (0 은 성공)
+FAILURE_REASONS = (
+    'sq_sum_small',            # ek² + fk² 가 0 에 가까움 (호른 회전면과 로드 방향이 특이 자세)
+    'negative_sqrt_term',      # 1 - gk²/(ek² + fk²) < 0 : 로드가 닿지 않는 위치
+    'sin_alpha_out_of_range',  # |sin(α)| > 1
+    'angle_out_of_range',      # 서보 각도가 -90° ~ 90° 를 벗어남
+    'math_error',              # 계산 중 예외 (ValueError, ZeroDivisionError 등)
+)
+
+# 호출 지연 시간 히스토그램 구간 (초) - 마지막 구간은 +Inf
+LATENCY_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0)
+
+# 한계 근접도 (sqrt_term, 0 이면 도달 한계) 히스토그램 구간 - 성공한 다리만 기록
+MARGIN_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+LEG_COUNT = 6
+
+
+class IKMetrics:
+    """역기구학 계측 수집기 - 여러 스레드에서 기록해도 안전함
+
+    PoseCache 적중도 스칼라 호출로 기록되어 호출 수와 다리별 실패 원인에 포함된다.
+    적중 시에는 sqrt_term 을 다시 계산하지 않으므로 한계 근접도 (margin) 는 처음 계산할 때만 기록된다.
+    """
+
+    def __init__(self, max_failures=100, failures_per_call=10):
+        self.max_failures = max_failures
+        self.failures_per_call = failures_per_call
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """모든 기록 초기화"""
+        with self._lock:
+            self.started_at = time.time()
+            # 호출 종류 ('scalar', 'batch') -> {'calls', 'poses', 'seconds', 'buckets'}
+            self.latency = {}
+            self.failures = np.zeros((LEG_COUNT, len(FAILURE_REASONS)), dtype=np.int64)
+            self.leg_evaluations = np.zeros(LEG_COUNT, dtype=np.int64)
+            self.margin_buckets = np.zeros((LEG_COUNT, len(MARGIN_BUCKETS) + 1), dtype=np.int64)
+            self.min_margin = np.full(LEG_COUNT, np.inf)
+            self.margin_sum = np.zeros(LEG_COUNT)  # Prometheus 히스토그램 _sum 용
+            # 최근 실패 자세 (translation, quaternion, {다리: 원인})
+            self.recent_failures = deque(maxlen=self.max_failures)
+
+    def _record_latency(self, kind, seconds, poses):
+        entry = self.latency.get(kind)
+        if entry is None:
+            entry = {'calls': 0, 'poses': 0, 'seconds': 0.0,
+                     'buckets': [0] * (len(LATENCY_BUCKETS) + 1)}
+            self.latency[kind] = entry
+        entry['calls'] += 1
+        entry['poses'] += poses
+        entry['seconds'] += seconds
+        index = bisect_left(LATENCY_BUCKETS, seconds)
+        entry['buckets'][index] += 1
+
+    def record_scalar(self, seconds, translation, quaternion, reasons, margins):
+        """스칼라 역기구학 한 번의 결과 기록
+
+        reasons 는 다리별 실패 원인 이름 (성공이면 None), margins 는 다리별 sqrt_term (계산 전 실패면 None).
+        """
+        with self._lock:
+            self._record_latency('scalar', seconds, 1)
+            self.leg_evaluations += 1
+            failed = {}
+            for leg, (reason, margin) in enumerate(zip(reasons, margins)):
+                if reason is not None:
+                    self.failures[leg, FAILURE_REASONS.index(reason)] += 1
+                    failed[leg] = reason
+                elif margin is not None:
+                    self.margin_buckets[leg, bisect_left(MARGIN_BUCKETS, margin)] += 1
+                    self.min_margin[leg] = min(self.min_margin[leg], margin)
+                    self.margin_sum[leg] += margin
+            if failed:
+                self.recent_failures.append((list(translation), list(quaternion), failed))
+
+    def record_batch(self, seconds, translations, quaternions, reason_codes, margins):
+        """배치 역기구학 한 번의 결과 기록 - reason_codes [N,6] (0 은 성공), margins [N,6] sqrt_term"""
+        reason_codes = np.asarray(reason_codes)
+        n = len(reason_codes)
+        legs = np.broadcast_to(np.arange(LEG_COUNT), reason_codes.shape)
+        ok = reason_codes == 0
+
+        failure_counts = np.bincount(
+            (legs[~ok] * len(FAILURE_REASONS) + reason_codes[~ok] - 1).ravel(),
+            minlength=LEG_COUNT * len(FAILURE_REASONS)).reshape(LEG_COUNT, -1)
+        # 구간별 누적 개수 (margin <= 경계) 의 차분 - 실패한 다리는 inf 로 두어 +Inf 구간에서도 제외
+        # (다리별 연속 메모리로 바꾸어 계산하는 편이 열 방향 축소보다 빠름)
+        solved_margins = np.ascontiguousarray(np.where(ok, margins, np.inf).T)
+        cumulative = np.array([np.count_nonzero(solved_margins <= bound, axis=1) for bound in MARGIN_BUCKETS]
+                              + [np.count_nonzero(ok, axis=0)])
+        margin_counts = np.diff(cumulative, axis=0, prepend=0).T
+        min_margin = solved_margins.min(axis=1) if n else np.full(LEG_COUNT, np.inf)
+        margin_sum = np.where(ok, margins, 0.0).sum(axis=0) if n else np.zeros(LEG_COUNT)
+
+        # 실패한 자세는 호출당 failures_per_call 개까지만 보관
+        failed_rows = np.flatnonzero(~np.all(ok, axis=1))[:self.failures_per_call]
+        samples = [(np.asarray(translations[row]).tolist(), np.asarray(quaternions[row]).tolist(),
+                    {int(leg): FAILURE_REASONS[reason_codes[row, leg] - 1]
+                     for leg in np.flatnonzero(~ok[row])})
+                   for row in failed_rows]
+
+        with self._lock:
+            self._record_latency('batch', seconds, n)
+            self.leg_evaluations += n
+            self.failures += failure_counts
+            self.margin_buckets += margin_counts
+            np.minimum(self.min_margin, min_margin, out=self.min_margin)
+            self.margin_sum += margin_sum
+            self.recent_failures.extend(samples)
+
+    def snapshot(self):
+        """현재 기록을 JSON 으로 직렬화 가능한 딕셔너리로 반환"""
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'elapsed_s': time.time() - self.started_at,
+                'latency': {
+                    kind: {
+                        'calls': entry['calls'],
+                        'poses': entry['poses'],
+                        'seconds': entry['seconds'],
+                        'mean_us': entry['seconds'] / entry['calls'] * 1e6 if entry['calls'] else 0.0,
+                        'buckets': dict(zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'],
+                                            entry['buckets'])),
+                    }
+                    for kind, entry in self.latency.items()
+                },
+                'legs': [
+                    {
+                        'leg': leg,
+                        'evaluations': int(self.leg_evaluations[leg]),
+                        'failures': {reason: int(self.failures[leg, i])
+                                     for i, reason in enumerate(FAILURE_REASONS)},
+                        'min_margin': (float(self.min_margin[leg])
+                                       if np.isfinite(self.min_margin[leg]) else None),
+                        'margin_sum': float(self.margin_sum[leg]),
+                        'margin_buckets': dict(zip([str(b) for b in MARGIN_BUCKETS] + ['+Inf'],
+                                                   self.margin_buckets[leg].tolist())),
+                    }
+                    for leg in range(LEG_COUNT)
+                ],
+                'recent_failures': [
+                    {'translation': translation, 'quaternion': quaternion,
+                     'legs': {str(leg): reason for leg, reason in failed.items()}}
+                    for translation, quaternion, failed in self.recent_failures
+                ],
+            }
+
+    def to_json(self):
+        """JSON 텍스트"""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix='stewart_ik'):
+        """Prometheus 텍스트 노출 형식"""
+        data = self.snapshot()
+        lines = [
+            f'# HELP {prefix}_call_duration_seconds Inverse kinematics call latency.',
+            f'# TYPE {prefix}_call_duration_seconds histogram',
+        ]
+        for kind, entry in data['latency'].items():
+            cumulative = 0
+            for bound, count in entry['buckets'].items():
+                cumulative += count
+                lines.append(f'{prefix}_call_duration_seconds_bucket{{kind="{kind}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_call_duration_seconds_sum{{kind="{kind}"}} {entry["seconds"]:.9f}')
+            lines.append(f'{prefix}_call_duration_seconds_count{{kind="{kind}"}} {entry["calls"]}')
+
+        lines += [f'# HELP {prefix}_poses_total Poses evaluated.',
+                  f'# TYPE {prefix}_poses_total counter']
+        for kind, entry in data['latency'].items():
+            lines.append(f'{prefix}_poses_total{{kind="{kind}"}} {entry["poses"]}')
+
+        lines += [f'# HELP {prefix}_leg_failures_total Leg solve failures by reason.',
+                  f'# TYPE {prefix}_leg_failures_total counter']
+        for leg in data['legs']:
+            for reason, count in leg['failures'].items():
+                lines.append(f'{prefix}_leg_failures_total{{leg="{leg["leg"]}",reason="{reason}"}} {count}')
+
+        lines += [f'# HELP {prefix}_leg_margin Reach margin (sqrt_term) of solved legs.',
+                  f'# TYPE {prefix}_leg_margin histogram']
+        for leg in data['legs']:
+            cumulative = 0
+            for bound, count in leg['margin_buckets'].items():
+                cumulative += count
+                lines.append(f'{prefix}_leg_margin_bucket{{leg="{leg["leg"]}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_leg_margin_sum{{leg="{leg["leg"]}"}} {leg["margin_sum"]:.9g}')
+            lines.append(f'{prefix}_leg_margin_count{{leg="{leg["leg"]}"}} {cumulative}')
+
+        lines += [f'# HELP {prefix}_leg_min_margin Smallest reach margin seen per leg.',
+                  f'# TYPE {prefix}_leg_min_margin gauge']
+        for leg in data['legs']:
+            if leg['min_margin'] is not None:
+                lines.append(f'{prefix}_leg_min_margin{{leg="{leg["leg"]}"}} {leg["min_margin"]:.9g}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path, format=None):
+        """파일로 내보내기 - format 이 없으면 확장자로 결정 (.prom/.txt 는 Prometheus, 그 외 JSON)"""
+        if format is None:
+            format = 'prometheus' if os.path.splitext(path)[1] in ('.prom', '.txt') else 'json'
+        if format == 'prometheus':
+            text = self.to_prometheus()
+        elif format == 'json':
+            text = self.to_json()
+        else:
+            raise ValueError(f"지원하지 않는 형식입니다: {format}")
+
+        # 수집기가 읽는 도중 잘린 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
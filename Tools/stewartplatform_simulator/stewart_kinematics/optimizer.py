@@ -0,0 +1,302 @@
+"""플랫폼 기하 설계 공간 탐색 - 후보 기하를 병렬로 평가하여 파레토 집합 계산
+
+base_radius, platform_radius, rod_length, horn_length, shaft_distance, anchor_distance 범위에서
+후보를 라틴 하이퍼큐브로 뽑고, 후보마다 배치 역기구학으로 다음 목표를 평가한다 (모두 클수록 좋음).
+
+    volume           위치 단면(회전 0)의 도달 가능 부피 (mm^3)
+    rotation_range   roll/pitch/yaw 모두 대칭으로 도달 가능한 회전 범위 (도)
+    worst_dexterity  필수 작업 영역 안에서 가장 작은 역 조건수 1/cond(J) (0 이면 특이 자세)
+
+필수 작업 영역의 꼭짓점에 도달하지 못하는 후보는 작업 공간 샘플링 전에 제외한다.
+평가 결과는 JSON lines 체크포인트에 후보마다 추가되어 중단 후 같은 설정으로 다시 실행하면 이어서 계산한다.
+
+    python -m stewart_kinematics.optimizer --candidates 2000 --checkpoint design.jsonl
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .kinematics import StewartPlatform
+from .pose_table import POSE_AXES, poses_to_ik_inputs
+from .workspace import compute_workspace
+
+# 탐색할 기하 파라미터 범위 (mm)
+DEFAULT_BOUNDS = {
+    'base_radius': (60.0, 120.0),
+    'platform_radius': (35.0, 90.0),
+    'rod_length': (90.0, 180.0),
+    'horn_length': (25.0, 60.0),
+    'shaft_distance': (10.0, 30.0),
+    'anchor_distance': (10.0, 30.0),
+}
+
+# 평가 설정 - 필수 작업 영역은 위치 ±mm, 회전 ±도
+DEFAULT_DESIGN_SPEC = {
+    'required_translation': 10.0,
+    'required_rotation': 10.0,
+    'region_samples': 2000,
+    'max_condition': 1000.0,
+    'workspace': {'grid_points': 21, 'line_step': 0.5},
+}
+
+OBJECTIVES = ('volume', 'rotation_range', 'worst_dexterity')
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+def sample_candidates(count, bounds=None, base_config=None, seed=0):
+    """라틴 하이퍼큐브 샘플링으로 후보 config 목록 생성 (bounds 에 없는 키는 base_config 값 사용)"""
+    bounds = DEFAULT_BOUNDS if bounds is None else bounds
+    base_config = StewartPlatform().config if base_config is None else base_config
+    rng = np.random.default_rng(seed)
+    names = sorted(bounds)
+
+    # 각 파라미터 축을 count 구간으로 나누고 구간마다 한 점씩 뽑은 뒤 축별로 섞는다
+    strata = (np.arange(count)[:, None] + rng.random((count, len(names)))) / count
+    for column in range(len(names)):
+        strata[:, column] = rng.permutation(strata[:, column])
+
+    candidates = []
+    for row in strata:
+        config = dict(base_config)
+        for name, fraction in zip(names, row):
+            low, high = bounds[name]
+            config[name] = round(float(low + fraction * (high - low)), 3)
+        candidates.append(config)
+    return candidates
+
+
+def _region_poses(spec, count, seed):
+    """필수 작업 영역의 꼭짓점 [64,6] 과 내부 임의 자세 [count,6] (위치 mm, 회전 도)"""
+    extents = np.array([spec['required_translation']] * 3 + [spec['required_rotation']] * 3)
+    bits = (np.arange(2**len(POSE_AXES))[:, None] >> np.arange(len(POSE_AXES))[None, :]) & 1
+    corners = np.where(bits == 1, extents, -extents)
+    rng = np.random.default_rng(seed)
+    interior = rng.uniform(-extents, extents, (count, len(POSE_AXES)))
+    return corners, interior
+
+
+def evaluate_candidate(config, spec=None, seed=0):
+    """후보 기하 하나의 평가 결과 딕셔너리 - status 는 'ok' 또는 'pruned' (reason 에 제외 이유)"""
+    spec = dict(DEFAULT_DESIGN_SPEC, **(spec or {}))
+    try:
+        platform = StewartPlatform(config)
+    except (ValueError, ZeroDivisionError):
+        # 초기 높이를 계산할 수 없는 기하 (로드가 플랫폼 조인트에 닿지 않음)
+        return {'status': 'pruned', 'reason': 'invalid_geometry'}
+
+    # 1단계: 중립 자세와 필수 영역 꼭짓점만 먼저 확인 (저렴한 조기 제외)
+    corners, interior = _region_poses(spec, int(spec['region_samples']), seed)
+    probe = np.concatenate([np.zeros((1, 6)), corners])
+    _, valid = platform.calculate_inverse_kinematics_batch(*poses_to_ik_inputs(probe))
+    if not np.all(valid[0]):
+        return {'status': 'pruned', 'reason': 'neutral_unreachable'}
+    if not np.all(valid):
+        return {'status': 'pruned', 'reason': 'required_region_unreachable'}
+
+    # 2단계: 필수 영역 내부의 야코비안 조건수
+    conditioning = platform.calculate_conditioning_batch(*poses_to_ik_inputs(np.concatenate([probe, interior])))
+    worst_condition = float(np.max(conditioning['condition']))
+    if worst_condition > spec['max_condition']:
+        return {'status': 'pruned', 'reason': 'near_singular', 'worst_condition': worst_condition}
+
+    # 3단계: 작업 공간 샘플링 (가장 비싼 단계)
+    workspace = compute_workspace(config, spec['workspace'], workers=1)
+    rotation_range = min(min(-low, high) for low, high in
+                         (workspace.axis_ranges[axis] for axis in ('roll', 'pitch', 'yaw')))
+
+    return {
+        'status': 'ok',
+        'volume': workspace.volume('translation'),
+        'rotation_range': float(rotation_range),
+        'worst_dexterity': 1.0 / worst_condition,
+        'worst_condition': worst_condition,
+        'worst_manipulability': float(np.min(conditioning['manipulability'])),
+        'worst_error_gain': float(np.max(conditioning['error_gain'])),
+        'translation_ranges': {axis: workspace.axis_ranges[axis] for axis in ('x', 'y', 'z')},
+    }
+
+
+def _evaluate_batch(items, spec, seed):
+    """(인덱스, config) 묶음 평가 (프로세스 풀 작업 함수)"""
+    return [(index, config, evaluate_candidate(config, spec, seed)) for index, config in items]
+
+
+def pareto_ranks(values):
+    """[M,K] 목표값 (모두 클수록 좋음) 의 파레토 계층 - 0 이 비지배 집합"""
+    values = np.asarray(values, dtype=float)
+    ranks = np.full(len(values), -1)
+    remaining = np.arange(len(values))
+    rank = 0
+    while len(remaining):
+        subset = values[remaining]
+        # j 가 i 를 지배: 모든 목표에서 같거나 크고 하나 이상에서 큼
+        at_least = np.all(subset[None, :, :] >= subset[:, None, :], axis=2)
+        better = np.any(subset[None, :, :] > subset[:, None, :], axis=2)
+        dominated = np.any(at_least & better, axis=1)
+        ranks[remaining[~dominated]] = rank
+        remaining = remaining[dominated]
+        rank += 1
+    return ranks
+
+
+class DesignOptimizer:
+    """후보 기하를 프로세스 풀에서 평가하고 체크포인트에 기록하는 설계 공간 탐색기"""
+    def __init__(self, count=1000, bounds=None, spec=None, base_config=None, seed=0,
+                 checkpoint=None, workers=None, batch_size=4):
+        self.count = int(count)
+        self.bounds = {name: tuple(float(v) for v in bound)
+                       for name, bound in (DEFAULT_BOUNDS if bounds is None else bounds).items()}
+        self.spec = dict(DEFAULT_DESIGN_SPEC, **(spec or {}))
+        self.base_config = StewartPlatform().config if base_config is None else dict(base_config)
+        self.seed = seed
+        self.checkpoint = checkpoint
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.batch_size = batch_size
+        self.results = {}  # 후보 인덱스 -> {'index', 'config', 평가 결과...}
+        self.stats = {'evaluated': 0, 'resumed': 0, 'pruned': {}}
+
+    def _header(self):
+        return {
+            'version': CHECKPOINT_FORMAT_VERSION,
+            'count': self.count,
+            'seed': self.seed,
+            'bounds': {name: list(bound) for name, bound in self.bounds.items()},
+            'spec': self.spec,
+            'base_config': self.base_config,
+        }
+
+    def _load_checkpoint(self):
+        """체크포인트의 완료된 결과 불러오기 - 설정이 다르면 ValueError"""
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return
+        with open(self.checkpoint, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        if not lines:
+            return
+        header = json.loads(lines[0])
+        if header != json.loads(json.dumps(self._header())):
+            raise ValueError(f"체크포인트의 탐색 설정이 다릅니다: {self.checkpoint}")
+        for line in lines[1:]:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # 기록 도중 중단된 마지막 줄
+            self.results[result['index']] = result
+        self.stats['resumed'] = len(self.results)
+
+    def _record(self, output, index, config, evaluation):
+        result = dict(evaluation, index=index, config=config)
+        self.results[index] = result
+        self.stats['evaluated'] += 1
+        if result['status'] == 'pruned':
+            pruned = self.stats['pruned']
+            pruned[result['reason']] = pruned.get(result['reason'], 0) + 1
+        if output is not None:
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+
+    def run(self, progress=None):
+        """남은 후보를 모두 평가하고 ranked() 결과 반환 - progress(완료 수, 전체 수) 콜백 선택"""
+        self._load_checkpoint()
+        candidates = sample_candidates(self.count, self.bounds, self.base_config, self.seed)
+        pending = [(index, config) for index, config in enumerate(candidates) if index not in self.results]
+        batches = [pending[start:start + self.batch_size] for start in range(0, len(pending), self.batch_size)]
+
+        output = None
+        if self.checkpoint:
+            directory = os.path.dirname(self.checkpoint)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            new_file = not os.path.exists(self.checkpoint) or os.path.getsize(self.checkpoint) == 0
+            if not new_file:
+                # 기록 도중 중단되어 줄바꿈 없이 끝난 줄 뒤에 이어 쓰지 않도록 줄을 끝낸다
+                with open(self.checkpoint, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    partial = f.read(1) != b'\n'
+            output = open(self.checkpoint, 'a', encoding='utf-8')
+            if new_file:
+                output.write(json.dumps(self._header()) + '\n')
+            elif partial:
+                output.write('\n')
+        try:
+            if self.workers <= 1:
+                for batch in batches:
+                    for index, config, evaluation in _evaluate_batch(batch, self.spec, self.seed):
+                        self._record(output, index, config, evaluation)
+                    if progress is not None:
+                        progress(len(self.results), self.count)
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    futures = [executor.submit(_evaluate_batch, batch, self.spec, self.seed) for batch in batches]
+                    for future in as_completed(futures):
+                        for index, config, evaluation in future.result():
+                            self._record(output, index, config, evaluation)
+                        if progress is not None:
+                            progress(len(self.results), self.count)
+        finally:
+            if output is not None:
+                output.close()
+        return self.ranked()
+
+    def ranked(self):
+        """평가가 끝난 후보를 (파레토 계층, 정규화 점수 내림차순) 으로 정렬한 목록
+
+        각 결과에 pareto_rank (0 이 파레토 집합) 와 score (목표별 최소-최대 정규화 평균) 가 추가된다.
+        """
+        feasible = [result for result in self.results.values() if result['status'] == 'ok']
+        if not feasible:
+            return []
+        values = np.array([[result[name] for name in OBJECTIVES] for result in feasible])
+        ranks = pareto_ranks(values)
+        span = values.max(axis=0) - values.min(axis=0)
+        scores = np.mean((values - values.min(axis=0)) / np.where(span > 0, span, 1.0), axis=1)
+        for result, rank, score in zip(feasible, ranks, scores):
+            result['pareto_rank'] = int(rank)
+            result['score'] = float(score)
+        return sorted(feasible, key=lambda result: (result['pareto_rank'], -result['score']))
+
+    def pareto_set(self):
+        """파레토 집합 (pareto_rank 0) 만 점수 순으로 반환"""
+        return [result for result in self.ranked() if result['pareto_rank'] == 0]
+
+
+def main():
+    """설계 공간 탐색 실행 후 파레토 집합 출력"""
+    parser = argparse.ArgumentParser(description="Stewart Platform 기하 설계 공간 탐색")
+    parser.add_argument('--candidates', type=int, default=1000, help="후보 기하 개수")
+    parser.add_argument('--seed', type=int, default=0, help="후보 샘플링 시드")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본값: 코어 수)")
+    parser.add_argument('--checkpoint', default=None, help="JSON lines 체크포인트 (있으면 이어서 계산)")
+    parser.add_argument('--output', default=None, help="순위가 매겨진 결과 JSON 파일")
+    parser.add_argument('--top', type=int, default=10, help="출력할 파레토 집합 후보 수")
+    args = parser.parse_args()
+
+    optimizer = DesignOptimizer(args.candidates, seed=args.seed, checkpoint=args.checkpoint,
+                                workers=args.workers)
+
+    def progress(done, total):
+        print(f"\r평가 {done}/{total}", end='', flush=True)
+
+    ranked = optimizer.run(progress)
+    print()
+    print(f"이어서 계산: {optimizer.stats['resumed']}, 새로 평가: {optimizer.stats['evaluated']}, "
+          f"제외: {optimizer.stats['pruned']}")
+
+    front = [result for result in ranked if result['pareto_rank'] == 0]
+    print(f"파레토 집합 {len(front)}개 (전체 가능 후보 {len(ranked)}개)")
+    for result in front[:args.top]:
+        geometry = ', '.join(f"{name}={result['config'][name]:.1f}" for name in sorted(DEFAULT_BOUNDS))
+        print(f"  score {result['score']:.3f}  volume {result['volume'] / 1000:.1f} cm^3  "
+              f"rotation ±{result['rotation_range']:.1f}°  cond {result['worst_condition']:.1f}  | {geometry}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(ranked, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""자세 파일 읽기
+
+.npy 또는 텍스트/CSV 자세 파일을 [N, 열 수] 배열로 읽는다. 캘리브레이션 데이터셋 (12열),
+렌더링 자세 시퀀스 (6/7열), 공차 분석 자세 목록 (6열) 이 같은 형식을 쓴다.
+
+    from stewart_kinematics.pose_io import load_pose_file
+    poses = load_pose_file('poses.csv')                 # [N, 6]
+    samples = load_pose_file('dataset.csv', columns=12)
+"""
+import numpy as np
+
+
+def load_pose_file(path, columns=6):
+    """자세 파일 (.npy 또는 텍스트/CSV) 을 [N, 열 수] 배열로 읽기
+
+    텍스트는 '#' 뒤 주석과 빈 줄을 무시하고 쉼표/공백으로 구분하며, 숫자가 아닌 첫 줄 (머리글) 은 건너뛴다.
+    columns 는 허용하는 열 수 (정수 또는 튜플) 이며 맞지 않으면 ValueError.
+    """
+    columns = (columns,) if isinstance(columns, int) else tuple(columns)
+    if path.endswith('.npy'):
+        data = np.load(path)
+    else:
+        with open(path, encoding='utf-8') as f:
+            rows = [line.split('#', 1)[0].replace(',', ' ').split() for line in f]
+        rows = [row for row in rows if row]
+        if rows and not _is_number(rows[0][0]):
+            rows = rows[1:]
+        if any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError(f"자세 파일의 모든 줄은 열 수가 같아야 합니다: {path}")
+        data = np.array(rows, dtype=float).reshape(len(rows), len(rows[0]) if rows else columns[0])
+    if data.ndim != 2 or data.shape[1] not in columns:
+        expected = ' 또는 '.join(str(count) for count in columns)
+        raise ValueError(f"자세 파일은 {expected}열이어야 합니다: {data.shape}")
+    return data
+
+
+def _is_number(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,292 @@
+"""사전 계산된 자세 → 서보 각도 룩업 테이블
+
+x/y/z/roll/pitch/yaw 격자 전체에 대해 StewartPlatform 역기구학을 미리 계산하여
+config 해시별 디렉터리에 메모리 맵(.npy) 형식으로 저장하고,
+PoseTable 로 다선형 보간 조회를 수행한다.
+격자 생성/열기/보간 (build_grid_table, GridTable) 은 특이 자세 지도와 공유한다.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+from .kinematics import DEFAULT_CACHE_DIR, StewartPlatform, config_hash
+from .rotation import euler_to_quaternion_array
+
+# 자세 축 순서 - 위치는 mm, 회전은 도(degree)
+POSE_AXES = ('x', 'y', 'z', 'roll', 'pitch', 'yaw')
+
+# 기본 격자: 축 이름 -> (최소, 최대, 개수)
+DEFAULT_GRID = {
+    'x': (-30.0, 30.0, 9),
+    'y': (-30.0, 30.0, 9),
+    'z': (-20.0, 20.0, 9),
+    'roll': (-30.0, 30.0, 9),
+    'pitch': (-30.0, 30.0, 9),
+    'yaw': (-30.0, 30.0, 9),
+}
+
+DEFAULT_TABLE_DIR = os.path.join(DEFAULT_CACHE_DIR, 'pose_tables')
+
+TABLE_FORMAT_VERSION = 1
+
+
+def _normalize_grid(grid):
+    """격자 정의를 POSE_AXES 순서의 (최소, 최대, 개수) 리스트로 정리"""
+    grid = DEFAULT_GRID if grid is None else grid
+    normalized = []
+    for axis in POSE_AXES:
+        low, high, count = grid.get(axis, (0.0, 0.0, 1))
+        count = int(count)
+        if count < 1:
+            raise ValueError(f"{axis} 축의 격자 개수는 1 이상이어야 합니다")
+        if count == 1:
+            high = low
+        normalized.append([float(low), float(high), count])
+    return normalized
+
+
+def poses_to_ik_inputs(poses):
+    """[N,6] 자세 (x, y, z, roll, pitch, yaw[도]) 를 배치 역기구학 입력으로 변환"""
+    poses = np.asarray(poses, dtype=float).reshape(-1, 6)
+    rpy = np.radians(poses[:, 3:])
+    quaternions = euler_to_quaternion_array(rpy[:, 0], rpy[:, 1], rpy[:, 2])
+    return poses[:, :3], quaternions
+
+
+def multilinear_corners(points, lows, steps, counts):
+    """다선형 보간용 격자 셀 꼭짓점 인덱스와 가중치 계산
+
+    points [N,D] 에 대해 (인덱스 [N,2^D,D], 가중치 [N,2^D], 격자 범위 내 여부 [N]) 반환.
+    개수가 1인 축은 고정 축으로 취급한다.
+    """
+    points = np.asarray(points, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    steps = np.asarray(steps, dtype=float)
+    counts = np.asarray(counts)
+    dims = len(lows)
+
+    fixed = counts == 1
+    safe_steps = np.where(fixed, 1.0, steps)
+    position = (points - lows) / safe_steps
+    position = np.where(fixed, 0.0, position)
+
+    tolerance = 1e-9
+    in_range = np.all((position >= -tolerance) & (position <= counts - 1 + tolerance), axis=1)
+    in_range &= np.all(~fixed | (np.abs(points - lows) <= 1e-6), axis=1)
+
+    lower = np.clip(np.floor(position), 0, np.maximum(counts - 2, 0)).astype(np.intp)
+    frac = np.clip(position - lower, 0.0, 1.0)
+
+    # 2^D 개 꼭짓점의 비트 패턴
+    bits = (np.arange(2**dims)[:, None] >> np.arange(dims)[None, :]) & 1
+    indices = np.minimum(lower[:, None, :] + bits[None, :, :], counts - 1)
+    weights = np.prod(np.where(bits[None, :, :] == 1, frac[:, None, :], 1.0 - frac[:, None, :]), axis=2)
+    return indices, weights, in_range
+
+
+def table_path(config, root=DEFAULT_TABLE_DIR):
+    """config 해시에 해당하는 테이블 디렉터리 경로"""
+    return os.path.join(root, config_hash(config))
+
+
+def build_grid_table(platform, grid, root, name, compute, value_shape=(), meta=None, chunk_size=65536):
+    """격자 전체 자세에 compute 를 적용하여 메모리 맵 (name.npy) 으로 저장하고 경로 반환
+
+    compute(translations, quaternions) 는 [N, *value_shape] 값을 반환한다.
+    meta 는 meta.json 에 함께 기록할 항목 (형식 버전 등) 이다.
+    """
+    axes = _normalize_grid(grid)
+    shape = tuple(count for _, _, count in axes)
+    path = table_path(platform.config, root)
+    os.makedirs(path, exist_ok=True)
+
+    # 메타데이터가 없으면 미완성 테이블로 간주 - 먼저 지우고 마지막에 다시 쓴다
+    meta_file = os.path.join(path, 'meta.json')
+    if os.path.exists(meta_file):
+        os.remove(meta_file)
+
+    table = np.lib.format.open_memmap(
+        os.path.join(path, name + '.npy'), mode='w+', dtype=np.float32, shape=shape + tuple(value_shape)
+    )
+    flat_values = table.reshape((-1,) + tuple(value_shape))
+    axis_values = [np.linspace(low, high, count) for low, high, count in axes]
+
+    total = int(np.prod(shape))
+    for start in range(0, total, chunk_size):
+        stop = min(start + chunk_size, total)
+        index = np.unravel_index(np.arange(start, stop), shape)
+        poses = np.stack([values[i] for values, i in zip(axis_values, index)], axis=1)
+        translations, quaternions = poses_to_ik_inputs(poses)
+        flat_values[start:stop] = compute(translations, quaternions)
+
+    table.flush()
+    del flat_values, table
+
+    meta = dict(meta or {})
+    meta.update({
+        'config': platform.config,
+        'config_hash': config_hash(platform.config),
+        'axes': POSE_AXES,
+        'grid': axes,
+    })
+    with open(meta_file, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return path
+
+
+class GridTable:
+    """메모리 맵 격자 테이블 공통 조회 - 메타데이터 확인, open/load_or_build, 다선형 보간
+
+    하위 클래스는 values_name (값 파일 이름), version, default_root, label 과
+    build(platform, grid, root) 를 정의하고 _interpolate 결과 중 exact 인 자세를 직접 계산한다.
+    """
+    values_name = None
+    version = None
+    default_root = None
+    label = '격자 테이블'
+
+    def __init__(self, path, platform=None):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != self.version:
+            raise ValueError(f"지원하지 않는 {self.label} 형식입니다: {self.meta.get('version')}")
+
+        # 전체 테이블을 RAM 에 올리지 않고 필요한 셀만 읽는다
+        self.values = np.load(os.path.join(path, self.values_name + '.npy'), mmap_mode='r')
+
+        grid = self.meta['grid']
+        self.lows = np.array([low for low, _, _ in grid])
+        self.counts = np.array([count for _, _, count in grid])
+        self.steps = np.array([
+            (high - low) / (count - 1) if count > 1 else 0.0 for low, high, count in grid
+        ])
+        self._platform = platform
+        self.stats = {'queries': 0, 'interpolated': 0, 'exact': 0}
+
+    @classmethod
+    def build(cls, platform, grid=None, root=None):
+        raise NotImplementedError
+
+    @classmethod
+    def open(cls, config, root=None, platform=None):
+        """config 에 해당하는 저장된 테이블 열기 (없으면 FileNotFoundError)"""
+        path = table_path(config, cls.default_root if root is None else root)
+        if not os.path.exists(os.path.join(path, 'meta.json')):
+            raise FileNotFoundError(f"{cls.label} 파일이 없습니다: {path}")
+        return cls(path, platform)
+
+    @classmethod
+    def load_or_build(cls, platform, grid=None, root=None):
+        """저장된 테이블이 같은 격자로 있으면 열고, 없으면 새로 생성"""
+        root = cls.default_root if root is None else root
+        try:
+            table = cls.open(platform.config, root, platform)
+            if table.meta['grid'] == _normalize_grid(grid):
+                return table
+        except FileNotFoundError:
+            pass
+        cls.build(platform, grid, root)
+        return cls.open(platform.config, root, platform)
+
+    @property
+    def platform(self):
+        """정확한 계산용 플랫폼 (필요할 때 생성)"""
+        if self._platform is None:
+            self._platform = StewartPlatform(self.meta['config'])
+        return self._platform
+
+    def _interpolate(self, poses):
+        """[N,6] 자세의 다선형 보간 값과 exact [N] 반환
+
+        exact 는 격자 밖이거나 보간 셀에 계산 불가능한 (NaN) 꼭짓점이 있어 직접 계산해야 하는 자세.
+        """
+        poses = np.asarray(poses, dtype=float).reshape(-1, 6)
+        indices, weights, in_range = multilinear_corners(poses, self.lows, self.steps, self.counts)
+
+        corner_values = self.values[tuple(indices[..., d] for d in range(len(POSE_AXES)))]
+        corner_values = corner_values.astype(float)
+
+        # 가중치가 있는 꼭짓점 중 계산 불가능한 것이 있으면 유효성 경계 근처
+        used = weights > 0
+        corner_nan = np.isnan(corner_values).reshape(used.shape + (-1,)).any(axis=2)
+        boundary = np.any(corner_nan & used, axis=1)
+        used = used.reshape(used.shape + (1,) * (corner_values.ndim - 2))
+        values = np.einsum('nc,nc...->n...', weights, np.where(used, corner_values, 0.0))
+
+        exact = boundary | ~in_range
+        self.stats['queries'] += len(poses)
+        self.stats['exact'] += int(np.count_nonzero(exact))
+        self.stats['interpolated'] += int(len(poses) - np.count_nonzero(exact))
+        return values, exact
+
+
+def build_pose_table(platform, grid=None, root=DEFAULT_TABLE_DIR, chunk_size=65536):
+    """격자 전체에 대해 역기구학을 계산하여 메모리 맵 테이블로 저장하고 경로 반환"""
+    def compute(translations, quaternions):
+        servo_angles, _ = platform.calculate_inverse_kinematics_batch(translations, quaternions)
+        return servo_angles
+
+    return build_grid_table(platform, grid, root, 'angles', compute, value_shape=(6,),
+                            meta={'version': TABLE_FORMAT_VERSION}, chunk_size=chunk_size)
+
+
+class PoseTable(GridTable):
+    """메모리 맵 룩업 테이블 조회 - 다선형 보간, 유효성 경계 근처는 정확한 역기구학으로 대체"""
+    values_name = 'angles'
+    version = TABLE_FORMAT_VERSION
+    default_root = DEFAULT_TABLE_DIR
+    label = '룩업 테이블'
+    build = staticmethod(build_pose_table)
+
+    @property
+    def angles(self):
+        """[격자..., 6] 서보 각도 메모리 맵"""
+        return self.values
+
+    def query_batch(self, poses):
+        """[N,6] 자세 (x, y, z, roll, pitch, yaw[도]) 조회
+
+        (servo_angles [N,6], valid [N,6], exact [N]) 반환. exact 는 격자 밖이거나
+        보간 셀에 계산 불가능한 꼭짓점이 있어 정확한 역기구학으로 계산한 자세.
+        """
+        poses = np.asarray(poses, dtype=float).reshape(-1, 6)
+        servo_angles, exact = self._interpolate(poses)
+        if np.any(exact):
+            translations, quaternions = poses_to_ik_inputs(poses[exact])
+            servo_angles[exact], _ = self.platform.calculate_inverse_kinematics_batch(
+                translations, quaternions)
+
+        valid = ~np.isnan(servo_angles)
+        return servo_angles, valid, exact
+
+    def query(self, translation, rpy_degrees):
+        """단일 자세 조회 - calculate_inverse_kinematics 와 같이 계산 불가 시 None 포함 리스트 반환"""
+        pose = list(translation) + list(rpy_degrees)
+        servo_angles, valid, _ = self.query_batch([pose])
+        return [float(angle) if ok else None for angle, ok in zip(servo_angles[0], valid[0])]
+
+
+def main():
+    """기본 설정으로 룩업 테이블 생성"""
+    parser = argparse.ArgumentParser(description="Stewart Platform 자세 → 서보 각도 룩업 테이블 생성")
+    parser.add_argument('--root', default=DEFAULT_TABLE_DIR, help="테이블 저장 디렉터리")
+    parser.add_argument('--points', type=int, default=None, help="모든 축의 격자 개수")
+    args = parser.parse_args()
+
+    grid = None
+    if args.points is not None:
+        grid = {axis: (low, high, args.points) for axis, (low, high, _) in DEFAULT_GRID.items()}
+
+    platform = StewartPlatform()
+    path = build_pose_table(platform, grid, args.root)
+    table = PoseTable(path, platform)
+    size_mb = table.angles.nbytes / 1e6
+    valid_ratio = float(np.isfinite(table.angles[..., 0]).mean())
+    print(f"테이블 생성 완료: {path} ({size_mb:.1f} MB, 유효 비율 {valid_ratio:.1%})")
+
+
+if __name__ == "__main__":
+    main()
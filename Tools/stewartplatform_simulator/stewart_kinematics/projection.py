@@ -0,0 +1,212 @@
+"""도달 불가능한 자세 명령을 가장 가까운 도달 가능한 자세로 투영
+
+실시간 제어 루프에서 작업 공간 밖의 자세가 들어와도 멈추지 않도록
+마지막으로 도달 가능했던 자세에서 명령 자세까지의 선분을 배치 역기구학으로 탐색하고,
+경계에서 축별로 명령 쪽으로 미끄러지는 짧은 보정을 수행한다.
+배치 역기구학 호출은 선분 탐색 한 번과 보정 반복마다 한 번 (기본 총 2번) 뿐이다.
+
+    projector = PoseProjector(platform, servo_limits=(-80, 80))
+    result = projector.project([0, 0, 60], Quaternion.from_euler(0.3, 0, 0))
+    result.servo_angles, result.info['distance'], result.info['projected']
+"""
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from .kinematics import Quaternion, _solve_inverse_kinematics
+from .rotation import multiply_quaternion_arrays, quaternion_array_to_matrix, slerp_quaternion_arrays
+
+# 투영 결과 - translation [3] (mm), orientation (Quaternion), servo_angles [6] (도), info 딕셔너리
+ProjectedPose = namedtuple('ProjectedPose', ['translation', 'orientation', 'servo_angles', 'info'])
+
+
+def _rotation_vector(quaternion):
+    """단위 쿼터니언 (w, x, y, z) 의 회전 벡터 (라디안) - 최단 회전이 되도록 w >= 0 으로 맞춤"""
+    if quaternion[0] < 0:
+        quaternion = -quaternion
+    vector = quaternion[1:]
+    norm = np.linalg.norm(vector)
+    if norm < 1e-12:
+        return 2.0 * vector
+    return 2.0 * math.atan2(norm, quaternion[0]) / norm * vector
+
+
+def _rotation_vectors_to_quaternions(vectors):
+    """[N,3] 회전 벡터 (라디안) 를 [N,4] 쿼터니언으로 변환"""
+    angles = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    scale = np.where(angles > 1e-12, np.sin(0.5 * angles) / np.maximum(angles, 1e-12), 0.5)
+    return np.concatenate([np.cos(0.5 * angles), scale * vectors], axis=-1)
+
+
+class PoseProjector:
+    """가장 가까운 도달 가능한 자세로의 투영기
+
+    도달 가능은 모든 다리의 역기구학 해가 있고 서보 명령 각도가 servo_limits (도) 안에 있는 것이다.
+    거리는 위치 (mm) 와 characteristic_length (기본값: platform_radius) × 회전 각도 (라디안) 의
+    6차원 유클리드 거리이다. 마지막으로 반환한 도달 가능 자세를 기억하여 다음 탐색의 시작점으로 쓴다.
+    """
+    def __init__(self, platform, servo_limits=(-90.0, 90.0), segment_samples=32,
+                 refine_iterations=1, refine_steps=(1.0, 0.5, 0.25, 0.125), characteristic_length=None):
+        low, high = servo_limits
+        if low >= high:
+            raise ValueError("servo_limits 는 (최소, 최대) 이어야 합니다")
+        if segment_samples < 4:
+            raise ValueError("segment_samples 는 4 이상이어야 합니다")
+        self.platform = platform
+        # 제어 루프마다 다시 만들지 않도록 기하 배열을 미리 준비 (플랫폼 설정이 바뀌면 투영기를 새로 만든다)
+        self._geometry = platform._geometry_arrays() + (
+            float(platform.T0[2]), float(platform.config['rod_length']), float(platform.config['horn_length']))
+        self._servo_offsets = np.asarray(platform.servo_offsets, dtype=float)
+        self.servo_limits = (float(low), float(high))
+        self.segment_samples = int(segment_samples)
+        self.refine_iterations = int(refine_iterations)
+        self.refine_steps = np.asarray(refine_steps, dtype=float)
+        if characteristic_length is None:
+            characteristic_length = float(platform.config['platform_radius'])
+        self.characteristic_length = float(characteristic_length)
+        self.reset()
+
+    def reset(self, translation=(0.0, 0.0, 0.0), orientation=None):
+        """탐색 시작점 (마지막 도달 가능 자세) 설정 - 기본값은 중립 자세"""
+        if orientation is None:
+            orientation = Quaternion()
+        self._last_translation = np.asarray(translation, dtype=float).reshape(3)
+        self._last_quaternion = self._as_array(orientation)
+        ok, angles = self.feasible(self._last_translation[None], self._last_quaternion[None])
+        self._last_angles = angles[0] if ok[0] else None
+
+    @staticmethod
+    def _as_array(orientation):
+        quaternion = np.array([orientation.w, orientation.x, orientation.y, orientation.z], dtype=float)
+        return quaternion / np.linalg.norm(quaternion)
+
+    def feasible(self, translations, quaternions):
+        """[N,3] 위치와 [N,4] 쿼터니언의 도달 가능 여부 - (feasible [N], servo_angles [N,6])"""
+        angles, valid, _, _ = _solve_inverse_kinematics(
+            *self._geometry, translations, quaternion_array_to_matrix(quaternions))
+        angles -= self._servo_offsets
+        low, high = self.servo_limits
+        # 계산 불가능한 다리의 NaN 은 비교에서 자동으로 False
+        with np.errstate(invalid='ignore'):
+            within = (angles >= low) & (angles <= high)
+        return np.all(valid & within, axis=1), angles
+
+    def _distance(self, translations, quaternions, target_translation, target_quaternion):
+        """[N] 자세에서 목표 자세까지의 6차원 거리"""
+        difference = translations - target_translation
+        dot = np.minimum(np.abs(quaternions @ target_quaternion), 1.0)
+        rotation_error = 2.0 * self.characteristic_length * np.arccos(dot)
+        return np.sqrt(np.einsum('ij,ij->i', difference, difference) + rotation_error**2)
+
+    def _segment_search(self, start_translation, start_quaternion, target_translation, target_quaternion):
+        """시작 자세에서 목표까지의 선분 위 도달 가능한 가장 먼 지점
+
+        (비율, 위치, 쿼터니언, 서보 각도, 처음 실패한 비율) 반환. 명령 자세가 도달 가능하면 비율은 1.
+        """
+        fractions = np.arange(1, self.segment_samples + 1) / self.segment_samples
+        translations, quaternions = self._interpolate(start_translation, start_quaternion,
+                                                      target_translation, target_quaternion, fractions)
+        ok, angles = self.feasible(translations, quaternions)
+        # 명령 자세 자체가 도달 가능하면 중간 경로와 관계없이 그대로 사용
+        if ok[-1]:
+            return 1.0, translations[-1], quaternions[-1], angles[-1], 1.0
+        # 시작점과 연결된 구간만 사용 (처음 실패한 지점 직전까지)
+        first_failure = int(np.argmin(ok))
+        if first_failure == 0:
+            return 0.0, start_translation, start_quaternion, self._last_angles, fractions[0]
+        index = first_failure - 1
+        return fractions[index], translations[index], quaternions[index], angles[index], fractions[first_failure]
+
+    @staticmethod
+    def _interpolate(start_translation, start_quaternion, target_translation, target_quaternion, fractions):
+        translations = start_translation + fractions[:, None] * (target_translation - start_translation)
+        quaternions = slerp_quaternion_arrays(start_quaternion, target_quaternion, fractions)
+        return translations, quaternions
+
+    def _refine(self, translation, quaternion, angles, target_translation, target_quaternion, bracket):
+        """경계 근처에서 더 가까운 도달 가능 자세 선택
+
+        후보는 축별 (x, y, z, 회전 벡터 3성분) 로 목표까지 차이의 refine_steps 비율만큼 이동한 자세이며,
+        첫 번째 반복에는 선분 탐색에서 처음 실패한 구간 bracket 을 균등하게 나눈 자세도 함께 계산한다.
+        배치 역기구학 호출은 반복마다 한 번이다.
+        """
+        distance = self._distance(translation[None], quaternion[None], target_translation, target_quaternion)[0]
+        steps = self.refine_steps
+        axes = np.eye(6)
+        for iteration in range(self.refine_iterations):
+            # 현재 자세 기준 목표까지의 차이 (위치, 월드 좌표계 회전 벡터)
+            conjugate = quaternion * np.array([1.0, -1.0, -1.0, -1.0])
+            error = np.concatenate([
+                target_translation - translation,
+                _rotation_vector(multiply_quaternion_arrays(target_quaternion, conjugate)),
+            ])
+            # 후보 [6 × 단계 수] - 한 축의 차이만 단계 비율만큼 적용
+            moves = ((axes * error)[:, None, :] * steps[None, :, None]).reshape(-1, 6)
+            translations = translation + moves[:, :3]
+            quaternions = multiply_quaternion_arrays(_rotation_vectors_to_quaternions(moves[:, 3:]), quaternion)
+            if iteration == 0 and bracket is not None:
+                start_translation, start_quaternion, low, high = bracket
+                fractions = np.linspace(low, high, self.segment_samples // 4 + 2)[1:-1]
+                segment = self._interpolate(start_translation, start_quaternion,
+                                            target_translation, target_quaternion, fractions)
+                translations = np.concatenate([segment[0], translations])
+                quaternions = np.concatenate([segment[1], quaternions])
+
+            ok, candidate_angles = self.feasible(translations, quaternions)
+            distances = np.where(ok, self._distance(translations, quaternions,
+                                                    target_translation, target_quaternion), np.inf)
+            index = int(np.argmin(distances))
+            if not distances[index] < distance - 1e-9:
+                break
+            distance = distances[index]
+            translation, quaternion, angles = translations[index], quaternions[index], candidate_angles[index]
+        return translation, quaternion, angles
+
+    def project(self, translation, orientation):
+        """명령 자세 (위치 [3] mm, Quaternion) 를 도달 가능한 자세로 투영하여 ProjectedPose 반환
+
+        info 딕셔너리:
+            projected          명령 자세가 도달 불가능하여 이동했는지 여부
+            feasible           반환 자세가 도달 가능한지 (시작점도 도달 불가능하면 False)
+            distance           명령 자세에서 이동한 6차원 거리
+            translation_offset 위치 이동량 (mm)
+            rotation_offset    회전 이동량 (도)
+            fraction           마지막 도달 가능 자세에서 명령 자세까지 선분 위 도달 비율
+        """
+        target_translation = np.asarray(translation, dtype=float).reshape(3)
+        target_quaternion = self._as_array(orientation)
+        if np.dot(target_quaternion, self._last_quaternion) < 0:
+            target_quaternion = -target_quaternion
+
+        start = (self._last_translation, self._last_quaternion)
+        fraction, best_translation, best_quaternion, angles, failure = self._segment_search(
+            *start, target_translation, target_quaternion)
+        projected = fraction < 1.0
+        if projected and angles is not None:
+            best_translation, best_quaternion, angles = self._refine(
+                best_translation, best_quaternion, angles, target_translation, target_quaternion,
+                start + (fraction, failure))
+
+        feasible = angles is not None
+        if not feasible:
+            # 시작점도 도달 불가능 (설정 변경 등) - 시작점을 그대로 유지하고 NaN 각도 반환
+            angles = np.full(6, np.nan)
+        else:
+            self._last_translation = np.array(best_translation, dtype=float)
+            self._last_quaternion = np.array(best_quaternion, dtype=float)
+            self._last_angles = np.array(angles, dtype=float)
+
+        translation_offset = float(np.linalg.norm(best_translation - target_translation))
+        rotation_offset = 2.0 * math.acos(min(1.0, abs(float(np.dot(best_quaternion, target_quaternion)))))
+        info = {
+            'projected': bool(projected),
+            'feasible': bool(feasible),
+            'distance': math.hypot(translation_offset, self.characteristic_length * rotation_offset),
+            'translation_offset': translation_offset,
+            'rotation_offset': math.degrees(rotation_offset),
+            'fraction': float(fraction),
+        }
+        w, x, y, z = (float(value) for value in best_quaternion)
+        return ProjectedPose([float(value) for value in best_translation], Quaternion(w, x, y, z),
+                             [float(value) for value in angles], info)
@@ -0,0 +1,299 @@
+"""대용량 자세 로그 재생 - 메모리 맵 청크 단위 배치 역기구학
+
+실제 세션에서 기록한 머리 자세 로그 (수백만 줄) 를 기하가 바뀔 때마다 다시 풀기 위한 파이프라인.
+로그를 메모리 맵으로 열고 고정 크기 블록으로 나누어 프로세스 풀의 작업자에게 분배하며,
+각 작업자는 블록을 chunk_size 줄씩 배치 역기구학으로 계산하여 출력 파일의 자기 구간에 직접 쓴다.
+메모리 사용량은 로그 크기와 관계없이 (작업자 수 × 블록 크기) 로 제한된다.
+
+입력 형식 (위치 mm, 회전 도)
+    CSV     한 줄에 자세 하나. 열이 6개면 x, y, z, roll, pitch, yaw,
+            7개면 맨 앞 열을 시각으로 보고 무시한다. 첫 줄이 열 이름이면 이름으로 자세 열을 찾는다.
+    .npy    float32 [N,6] 또는 [N,7] 배열 (CSV 보다 작고 파싱이 필요 없음, csv_to_binary 로 변환)
+
+출력은 REPLAY_DTYPE 구조체 배열 .npy 파일이며 각 행이 입력 자세 한 줄에 대응한다.
+
+    stats = replay_log(platform.config, 'session.csv', 'session_angles.npy', workers=4)
+    result = np.load('session_angles.npy', mmap_mode='r')
+    result['servo_angles'], result['valid']
+
+    python -m stewart_kinematics.replay session.csv session_angles.npy --config geometry.json
+"""
+import argparse
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .kinematics import StewartPlatform
+from .pose_table import POSE_AXES, poses_to_ik_inputs
+
+# 출력 행 - 서보 각도 (도, 계산 불가 시 NaN) 와 다리별 유효 여부
+REPLAY_DTYPE = np.dtype([('servo_angles', '<f4', (6,)), ('valid', '?', (6,))])
+
+# 작업 단위 크기 - CSV 는 바이트, .npy 는 이 크기에 해당하는 줄 수
+DEFAULT_BLOCK_BYTES = 8 << 20
+
+
+def _is_header(fields):
+    """숫자로 읽을 수 없는 첫 줄은 열 이름 줄로 본다"""
+    try:
+        [float(field) for field in fields]
+    except ValueError:
+        return True
+    return False
+
+
+def _csv_layout(path):
+    """CSV 첫 줄을 읽어 (데이터 시작 바이트, 자세 열 인덱스 [6]) 반환"""
+    with open(path, 'rb') as f:
+        first = f.readline()
+    if not first.strip():
+        return len(first), list(range(6))
+    text = first.decode('utf-8').strip()
+    fields = [field.strip() for field in text.split(',')]
+    if _is_header(fields):
+        names = [field.lower() for field in fields]
+        missing = [axis for axis in POSE_AXES if axis not in names]
+        if missing:
+            raise ValueError(f"CSV 열 이름에 자세 열이 없습니다: {', '.join(missing)}")
+        return len(first), [names.index(axis) for axis in POSE_AXES]
+    if len(fields) == 6:
+        return 0, list(range(6))
+    if len(fields) == 7:
+        return 0, list(range(1, 7))
+    raise ValueError(f"CSV 는 6열 (x, y, z, roll, pitch, yaw) 또는 7열 (시각 + 자세) 이어야 합니다: {len(fields)}열")
+
+
+def _csv_blocks(path, start, block_bytes):
+    """CSV 데이터 구간을 줄 경계에 맞춘 블록으로 나누어 ([(바이트 시작, 끝, 시작 줄 번호)], 전체 줄 수) 반환
+
+    파일을 메모리 맵으로 열고 블록마다 줄바꿈 수만 세므로 메모리는 블록 하나 크기로 제한된다.
+    파일 끝의 빈 줄은 제외하며 마지막 줄에 줄바꿈이 없어도 한 줄로 센다.
+    """
+    size = os.path.getsize(path)
+    if size > start:
+        with open(path, 'rb') as f:
+            f.seek(max(start, size - 4096))
+            tail = f.read()
+        size -= len(tail) - len(tail.rstrip())
+    if size <= start:
+        return [], 0
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    blocks = []
+    row = 0
+    begin = start
+    while begin < size:
+        end = min(begin + block_bytes, size)
+        if end < size:
+            # 블록 끝을 다음 줄바꿈 직후로 맞춤
+            newline = np.flatnonzero(data[end - 1:min(end - 1 + block_bytes, size)] == 10)
+            end = end + int(newline[0]) if len(newline) else size
+        rows = int(np.count_nonzero(data[begin:end] == 10))
+        if end == size:
+            # 끝의 공백을 제외했으므로 마지막 줄은 줄바꿈 없이 끝난다
+            rows += 1
+        blocks.append((begin, end, row))
+        row += rows
+        begin = end
+    del data
+    return blocks, row
+
+
+def _read_csv_block(path, begin, end, columns):
+    """CSV 블록을 [M,6] 자세 배열로 파싱"""
+    with open(path, 'rb') as f:
+        f.seek(begin)
+        data = f.read(end - begin)
+    poses = np.loadtxt(io.BytesIO(data), delimiter=',', usecols=columns, ndmin=2, dtype=float)
+    expected = data.count(b'\n') + (0 if data.endswith(b'\n') else 1)
+    if len(poses) != expected:
+        raise ValueError("CSV 에 빈 줄이나 주석 줄이 있습니다 (한 줄에 자세 하나여야 합니다)")
+    return poses
+
+
+def _open_binary(path):
+    """.npy 자세 로그를 메모리 맵으로 열고 (배열, 자세 열 슬라이스) 반환"""
+    poses = np.load(path, mmap_mode='r')
+    if poses.ndim != 2 or poses.shape[1] not in (6, 7):
+        raise ValueError(f".npy 자세 로그는 [N,6] 또는 [N,7] 배열이어야 합니다: {poses.shape}")
+    return poses, slice(poses.shape[1] - 6, None)
+
+
+def _solve_block(config, poses, output, offset, chunk_size):
+    """자세 블록 [M,6] 을 chunk_size 줄씩 계산하여 output[offset:] 에 쓰고 계산 불가 행 수 반환"""
+    platform = StewartPlatform(config)
+    invalid = 0
+    for start in range(0, len(poses), chunk_size):
+        translations, quaternions = poses_to_ik_inputs(poses[start:start + chunk_size])
+        servo_angles, valid = platform.calculate_inverse_kinematics_batch(translations, quaternions)
+        rows = output[offset + start:offset + start + len(servo_angles)]
+        rows['servo_angles'] = servo_angles
+        rows['valid'] = valid
+        invalid += int(np.count_nonzero(~np.all(valid, axis=1)))
+    return invalid
+
+
+def _replay_block(config, log_path, output_path, task, chunk_size):
+    """블록 하나 재생 (프로세스 풀 작업 함수) - (줄 수, 계산 불가 행 수) 반환
+
+    작업자마다 출력 파일을 메모리 맵으로 열어 겹치지 않는 자기 구간에만 쓴다.
+    """
+    kind, begin, end, row, columns = task
+    if kind == 'csv':
+        poses = _read_csv_block(log_path, begin, end, columns)
+    else:
+        log, columns = _open_binary(log_path)
+        poses = np.asarray(log[begin:end, columns], dtype=float)
+    output = np.load(output_path, mmap_mode='r+')
+    invalid = _solve_block(config, poses, output, row, chunk_size)
+    output.flush()
+    del output
+    return len(poses), invalid
+
+
+def plan_replay(log_path, block_bytes=DEFAULT_BLOCK_BYTES):
+    """자세 로그를 작업 블록으로 나누어 (전체 줄 수, 작업 목록) 반환
+
+    작업은 (형식, 시작, 끝, 시작 줄 번호, 자세 열) 튜플이며 시작/끝은 CSV 면 바이트, .npy 면 줄 번호이다.
+    """
+    if block_bytes < 1024:
+        raise ValueError("block_bytes 는 1024 이상이어야 합니다")
+    if log_path.endswith('.npy'):
+        log, columns = _open_binary(log_path)
+        rows = len(log)
+        block_rows = max(1, block_bytes // (log.shape[1] * log.dtype.itemsize))
+        del log
+        tasks = [('npy', start, min(start + block_rows, rows), start, columns)
+                 for start in range(0, rows, block_rows)]
+        return rows, tasks
+
+    start, columns = _csv_layout(log_path)
+    blocks, rows = _csv_blocks(log_path, start, block_bytes)
+    return rows, [('csv', begin, end, row, columns) for begin, end, row in blocks]
+
+
+def replay_log(config, log_path, output_path, chunk_size=65536, workers=None,
+               block_bytes=DEFAULT_BLOCK_BYTES, progress=None):
+    """자세 로그 전체를 config 기하로 다시 풀어 output_path (.npy, REPLAY_DTYPE) 에 저장
+
+    workers (기본값: 코어 수) 가 1 보다 크고 블록이 둘 이상이면 프로세스 풀에서 블록을 나누어 계산한다.
+    임시 파일에 쓴 뒤 끝까지 성공하면 교체하므로 중간에 실패해도 기존 출력은 남는다.
+    progress(완료 줄 수, 전체 줄 수) 콜백 선택. 통계 딕셔너리 반환:
+        rows, invalid_rows, blocks, workers, elapsed (초), rows_per_second
+    """
+    started = time.perf_counter()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    rows, tasks = plan_replay(log_path, block_bytes)
+
+    temp_path = output_path + '.tmp.npy'
+    output = np.lib.format.open_memmap(temp_path, mode='w+', dtype=REPLAY_DTYPE, shape=(rows,))
+    del output
+
+    workers = max(1, min(workers, len(tasks)))
+    arguments = ([config] * len(tasks), [log_path] * len(tasks), [temp_path] * len(tasks),
+                 tasks, [chunk_size] * len(tasks))
+    done = 0
+    invalid = 0
+
+    def collect(results):
+        nonlocal done, invalid
+        for count, block_invalid in results:
+            done += count
+            invalid += block_invalid
+            if progress is not None:
+                progress(done, rows)
+
+    try:
+        if workers <= 1:
+            collect(map(_replay_block, *arguments))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                collect(executor.map(_replay_block, *arguments))
+        if done != rows:
+            raise ValueError(f"로그를 읽는 동안 줄 수가 바뀌었습니다: {rows} -> {done}")
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    elapsed = time.perf_counter() - started
+    return {
+        'rows': rows,
+        'invalid_rows': invalid,
+        'blocks': len(tasks),
+        'workers': workers,
+        'elapsed': elapsed,
+        'rows_per_second': rows / max(elapsed, 1e-12),
+    }
+
+
+def write_pose_log(path, poses, times=None):
+    """[N,6] 자세 (와 선택적 시각 [N]) 를 float32 .npy 자세 로그로 저장"""
+    poses = np.asarray(poses, dtype=np.float32).reshape(-1, 6)
+    if times is not None:
+        times = np.asarray(times, dtype=np.float32).reshape(-1, 1)
+        if len(times) != len(poses):
+            raise ValueError("times 와 poses 의 개수가 다릅니다")
+        poses = np.concatenate([times, poses], axis=1)
+    temp_path = path + '.tmp.npy'
+    np.save(temp_path, poses)
+    os.replace(temp_path, path)
+
+
+def csv_to_binary(csv_path, npy_path, block_bytes=DEFAULT_BLOCK_BYTES):
+    """CSV 자세 로그를 float32 [N,6] .npy 자세 로그로 블록 단위 변환 - 줄 수 반환"""
+    rows, tasks = plan_replay(csv_path, block_bytes)
+    temp_path = npy_path + '.tmp.npy'
+    output = np.lib.format.open_memmap(temp_path, mode='w+', dtype=np.float32, shape=(rows, 6))
+    try:
+        for _, begin, end, row, columns in tasks:
+            poses = _read_csv_block(csv_path, begin, end, columns)
+            output[row:row + len(poses)] = poses
+        output.flush()
+        del output
+        os.replace(temp_path, npy_path)
+    except BaseException:
+        del output
+        os.remove(temp_path)
+        raise
+    return rows
+
+
+def main():
+    """자세 로그 재생 실행 후 처리 속도 출력"""
+    parser = argparse.ArgumentParser(description="Stewart Platform 자세 로그 재생 (배치 역기구학)")
+    parser.add_argument('log', help="자세 로그 (.csv 또는 .npy)")
+    parser.add_argument('output', help="출력 .npy 파일 (servo_angles, valid)")
+    parser.add_argument('--config', help="플랫폼 설정 JSON 파일 (기본값: 기본 설정)")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본값: 코어 수)")
+    parser.add_argument('--chunk-size', type=int, default=65536, help="배치 역기구학 청크 줄 수")
+    parser.add_argument('--block-mb', type=float, default=DEFAULT_BLOCK_BYTES / (1 << 20),
+                        help="작업 블록 크기 (MB)")
+    args = parser.parse_args()
+
+    config = None
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            config = json.load(f)
+
+    def progress(done, total):
+        print(f"\r재생 {done}/{total}", end='', flush=True)
+
+    try:
+        stats = replay_log(config, args.log, args.output, chunk_size=args.chunk_size, workers=args.workers,
+                           block_bytes=int(args.block_mb * (1 << 20)), progress=progress)
+    except ValueError as e:
+        parser.exit(1, f"\n오류: {e}\n")
+    print()
+    print(f"{stats['rows']}줄 ({stats['blocks']}블록, 프로세스 {stats['workers']}개) "
+          f"{stats['elapsed']:.2f}초, {stats['rows_per_second']:.0f}줄/초, "
+          f"계산 불가 {stats['invalid_rows']}줄 -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
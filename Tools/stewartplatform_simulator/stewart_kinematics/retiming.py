@@ -0,0 +1,221 @@
+"""서보 속도/가속도 한계를 지키는 궤적 시간 재배치
+
+샘플링된 자세 경로의 서보 각도를 배치 역기구학으로 계산한 뒤, 경로를 따라가는 속도를 다시 정하여
+어떤 서보도 속도/가속도 한계를 넘지 않으면서 전체 시간은 가능한 짧게 한다.
+
+경로 매개변수 s (샘플 인덱스) 에 대해 서보 속도는 θ'(s)·ṡ, 가속도는 θ''(s)·ṡ² + θ'(s)·s̈ 이다.
+u = ṡ² 로 두면 샘플마다
+    - 최대 속도 곡선: 속도 한계와 (curvature_share 비율까지의) θ''·u 항으로 정해지는 u 의 상한
+    - 허용 증가량: 나머지 가속도로 낼 수 있는 u 의 한 구간 증가량 (상수)
+이 정해지고, 정지 상태에서 출발하는 앞쪽 진행 u[k+1] = min(상한[k+1], u[k] + 증가량[k]) 과
+정지 상태로 끝나는 뒤쪽 진행을 누적합과 누적 최솟값으로 한 번에 (반복문 없이) 계산한다.
+
+    result = retime_path(platform, translations, quaternions, max_velocity=400, max_acceleration=4000)
+    result['times'], result['servo_angles']
+    times, frames = resample(result['times'], result['servo_angles'], rate=200)
+"""
+import numpy as np
+
+# 서보 각도가 변하지 않는 구간 등에서 무한대 대신 사용하는 u 의 상한
+_UNBOUNDED = 1e12
+
+
+def _per_servo(value, name):
+    """스칼라 또는 서보별 [6] 한계를 [6] 배열로 변환"""
+    value = np.broadcast_to(np.asarray(value, dtype=float), (6,)).copy()
+    if np.any(value <= 0):
+        raise ValueError(f"{name} 는 0보다 커야 합니다")
+    return value
+
+
+def _limited_pass(upper, increments):
+    """u[0] = upper[0], u[k+1] = min(upper[k+1], u[k] + increments[k]) 를 반복문 없이 계산
+
+    u[k] = min_{j<=k} (upper[j] + C[k] - C[j]) (C 는 increments 의 누적합) 이므로
+    누적합과 누적 최솟값으로 풀린다.
+    """
+    offsets = np.concatenate([[0.0], np.cumsum(increments)])
+    return offsets + np.minimum.accumulate(upper - offsets)
+
+
+def _vertex_ratios(deltas, durations, vertices, max_acceleration):
+    """꼭짓점 [V] 의 (가속도 / 한계) 최대 비율 [V]
+
+    꼭짓점 k 는 구간 k-1 과 구간 k 사이이며 가속도는 두 구간 속도 차이를 두 구간 시간의 평균으로 나눈 값이다.
+    k = 0 과 k = 구간 수 는 정지 상태와 맞닿은 양 끝이다. 시간이 0 인 구간 (머무름) 은 속도 0 인 정지로
+    보므로 머무름 양쪽 꼭짓점도 경로 끝과 같은 정지 제약을 받는다 (servo_rates 와 같은 정의).
+    """
+    count = len(durations)
+    has_left = vertices > 0
+    has_right = vertices < count
+    left = np.clip(vertices - 1, 0, count - 1)
+    right = np.clip(vertices, 0, count - 1)
+
+    left_time = np.where(has_left, durations[left], 0.0)
+    right_time = np.where(has_right, durations[right], 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        left_velocity = np.where(has_left[:, None] & (left_time[:, None] > 0),
+                                 deltas[left] / left_time[:, None], 0.0)
+        right_velocity = np.where(has_right[:, None] & (right_time[:, None] > 0),
+                                  deltas[right] / right_time[:, None], 0.0)
+        accelerations = (right_velocity - left_velocity) / (0.5 * (left_time + right_time))[:, None]
+    return np.nan_to_num(np.max(np.abs(accelerations) / max_acceleration, axis=1))
+
+
+def retime_durations(servo_angles, max_velocity, max_acceleration, min_durations=None,
+                     curvature_share=0.5, max_repairs=1000):
+    """서보 각도 경로 [N,6] (도) 의 구간 시간 [N-1] (초) 계산
+
+    max_velocity (도/초), max_acceleration (도/초²) 는 스칼라 또는 서보별 [6] 이다.
+    curvature_share 는 경로가 휘는 데 (θ''·ṡ² 항) 쓸 수 있는 가속도 비율이며 나머지는 가감속에 쓴다.
+    min_durations [N-1] 가 주어지면 구간 시간이 그보다 짧아지지 않는다 (원래 시간보다 빨라지지 않게 할 때).
+    같은 샘플이 이어지는 구간 (머무름) 은 양쪽 샘플에서 정지하는 시간 0 (또는 min_durations) 의 구간이 된다.
+
+    급하게 꺾이는 점에서는 연속 모델과 구간 단위 가속도가 조금 다를 수 있으므로, 마지막에 구간 단위로
+    한계를 넘는 꼭짓점의 양쪽 구간을 sqrt(초과 비율) 만큼 늘리는 보정을 (위반한 꼭짓점 주변만) 반복한다.
+    """
+    servo_angles = np.asarray(servo_angles, dtype=float)
+    if servo_angles.ndim != 2 or servo_angles.shape[1] != 6 or len(servo_angles) < 2:
+        raise ValueError("servo_angles 는 2개 이상의 [N,6] 배열이어야 합니다")
+    if not np.all(np.isfinite(servo_angles)):
+        invalid = int(np.argmax(~np.all(np.isfinite(servo_angles), axis=1)))
+        raise ValueError(f"계산 불가능한 자세가 있습니다 (샘플 {invalid})")
+    if not 0.0 < curvature_share < 1.0:
+        raise ValueError("curvature_share 는 0 과 1 사이여야 합니다")
+    max_velocity = _per_servo(max_velocity, 'max_velocity')
+    max_acceleration = _per_servo(max_acceleration, 'max_acceleration')
+
+    # 샘플 간격 Δs = 1 인 경로 미분 - θ' 는 구간 차분, θ'' 는 샘플의 2차 차분
+    # 샘플의 |θ'| 는 양쪽 구간 중 큰 값을 써서 꺾이는 점에서도 구간 속도가 한계를 넘지 않게 한다
+    segment_first = np.abs(np.diff(servo_angles, axis=0))                 # [N-1,6]
+    sample_first = np.maximum(np.vstack([segment_first[:1], segment_first]),
+                              np.vstack([segment_first, segment_first[-1:]]))
+    second = np.zeros_like(servo_angles)
+    second[1:-1] = np.abs(servo_angles[2:] - 2 * servo_angles[1:-1] + servo_angles[:-2])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # u 상한: 속도 한계 (θ'·ṡ <= v) 와 휘는 항 (θ''·u <= share·a)
+        velocity_bound = np.min((max_velocity / sample_first)**2, axis=1)
+        curvature_bound = np.min(curvature_share * max_acceleration / second, axis=1)
+        upper = np.minimum(np.minimum(velocity_bound, curvature_bound), _UNBOUNDED)
+        # 상한에서 휘는 항이 쓰고 남은 가속도로 낼 수 있는 s̈ -> 한 구간 (Δs = 1) 의 u 증가량 2·s̈
+        # (곧은 구간에서는 가속도 전체를 가감속에 쓴다)
+        remaining = max_acceleration - second * upper[:, None]
+        tangential = np.nan_to_num(np.min(remaining / sample_first, axis=1), nan=_UNBOUNDED)
+    increments = 2.0 * np.minimum(np.minimum(tangential[:-1], tangential[1:]), _UNBOUNDED)
+
+    # 양 끝과 머무름 구간의 양쪽 샘플은 정지 상태
+    dwell = np.all(servo_angles[1:] == servo_angles[:-1], axis=1)
+    upper[0] = upper[-1] = 0.0
+    upper[:-1][dwell] = 0.0
+    upper[1:][dwell] = 0.0
+
+    forward = _limited_pass(upper, increments)
+    squared_speed = _limited_pass(forward[::-1], increments[::-1])[::-1]
+
+    # 구간마다 s̈ 가 일정하면 Δt = 2Δs / (ṡ[k] + ṡ[k+1])
+    speed = np.sqrt(squared_speed)
+    with np.errstate(divide='ignore'):
+        durations = 2.0 / (speed[:-1] + speed[1:])
+    # 샘플이 2개뿐이면 양 끝 모두 정지 상태이므로 구간 단위 정의로 계산 (정지 -> 정지)
+    stopped = ~np.isfinite(durations)
+    durations[stopped] = np.max(np.maximum(np.sqrt(2.0 * segment_first[stopped] / max_acceleration),
+                                           segment_first[stopped] / max_velocity), axis=1)
+    # 서보 각도가 변하지 않는 구간은 시간이 필요 없다
+    durations[dwell] = 0.0
+
+    if min_durations is not None:
+        durations = np.maximum(durations, np.asarray(min_durations, dtype=float).reshape(-1))
+
+    # 구간 단위 보정 - 양쪽 구간을 f 배 늘리면 꼭짓점 가속도는 1/f² 배가 된다
+    deltas = np.diff(servo_angles, axis=0)
+    count = len(durations)
+    vertices = np.arange(count + 1)
+    for _ in range(max_repairs):
+        ratios = _vertex_ratios(deltas, durations, vertices, max_acceleration)
+        violating = ratios > 1.0 + 1e-9
+        if not violating.any():
+            break
+        factors = np.sqrt(ratios[violating]) * (1.0 + 1e-9)
+        active = vertices[violating]
+        scale = np.ones(count)
+        np.maximum.at(scale, np.clip(active - 1, 0, count - 1), np.where(active > 0, factors, 1.0))
+        np.maximum.at(scale, np.clip(active, 0, count - 1), np.where(active < count, factors, 1.0))
+        durations *= scale
+        # 다음 반복은 늘어난 구간과 맞닿은 꼭짓점만 검사
+        changed = np.flatnonzero(scale > 1.0)
+        vertices = np.unique(np.concatenate([changed, changed + 1]))
+    return durations
+
+
+def retime_path(platform, translations, quaternions, max_velocity, max_acceleration,
+                times=None, **options):
+    """[N,3] 위치와 [N,4] 쿼터니언 경로를 서보 속도/가속도 한계에 맞게 시간 재배치
+
+    times [N] (초) 를 주면 원래 시간보다 빨라지지 않게 한다 (주지 않으면 가능한 가장 빠르게).
+    반환 딕셔너리:
+        times        [N]   새 시각 (초, 0 부터)
+        servo_angles [N,6] 서보 각도 (도)
+        duration     전체 시간 (초)
+        max_velocity, max_acceleration  재배치 후 서보별 최대 속도/가속도 [6]
+    """
+    servo_angles, valid = platform.calculate_inverse_kinematics_batch(translations, quaternions)
+    if not np.all(valid):
+        invalid = int(np.argmax(~np.all(valid, axis=1)))
+        raise ValueError(f"계산 불가능한 자세가 있습니다 (샘플 {invalid})")
+
+    min_durations = None
+    if times is not None:
+        times = np.asarray(times, dtype=float).reshape(-1)
+        if len(times) != len(servo_angles):
+            raise ValueError("times 와 자세의 개수가 다릅니다")
+        min_durations = np.diff(times)
+        if np.any(min_durations < 0):
+            raise ValueError("times 는 증가하는 순서여야 합니다")
+
+    durations = retime_durations(servo_angles, max_velocity, max_acceleration, min_durations, **options)
+    result = {
+        'times': np.concatenate([[0.0], np.cumsum(durations)]),
+        'servo_angles': servo_angles,
+        'duration': float(np.sum(durations)),
+    }
+    result.update(servo_rates(servo_angles, durations))
+    return result
+
+
+def servo_rates(servo_angles, durations):
+    """구간 시간 [N-1] 에서의 서보별 최대 속도 (도/초) 와 최대 가속도 (도/초²) [6]
+
+    시간이 0 인 구간 (머무름) 은 속도 0 인 정지로 보고 나누지 않는다.
+    """
+    deltas = np.diff(np.asarray(servo_angles, dtype=float), axis=0)
+    durations = np.asarray(durations, dtype=float).reshape(-1)
+    moving = durations > 0
+    velocities = np.zeros_like(deltas)
+    velocities[moving] = deltas[moving] / durations[moving, None]
+    padded_velocities = np.concatenate([np.zeros((1, 6)), velocities, np.zeros((1, 6))])
+    padded_durations = np.concatenate([[0.0], durations, [0.0]])
+    spans = 0.5 * (padded_durations[:-1] + padded_durations[1:])
+    accelerations = np.zeros((len(spans), 6))
+    timed = spans > 0
+    accelerations[timed] = np.diff(padded_velocities, axis=0)[timed] / spans[timed, None]
+    return {
+        'max_velocity': np.max(np.abs(velocities), axis=0),
+        'max_acceleration': np.max(np.abs(accelerations), axis=0),
+    }
+
+
+def resample(times, servo_angles, rate):
+    """재배치된 서보 프레임을 고정 제어 주기로 선형 보간 - (시각 [K], 서보 각도 [K,6]) 반환"""
+    times = np.asarray(times, dtype=float)
+    servo_angles = np.asarray(servo_angles, dtype=float)
+    if rate <= 0:
+        raise ValueError("제어 주기는 0보다 커야 합니다")
+    count = int(np.floor((times[-1] - times[0]) * rate + 1e-9)) + 1
+    uniform = times[0] + np.arange(count) / rate
+    # 모든 서보를 한 번에 보간 - 구간 인덱스와 비율을 한 번만 계산
+    segment = np.clip(np.searchsorted(times, uniform, side='right') - 1, 0, len(times) - 2)
+    span = times[segment + 1] - times[segment]
+    fraction = np.where(span > 0, (uniform - times[segment]) / np.where(span > 0, span, 1.0), 0.0)
+    frames = servo_angles[segment] + fraction[:, None] * (servo_angles[segment + 1] - servo_angles[segment])
+    return uniform, frames
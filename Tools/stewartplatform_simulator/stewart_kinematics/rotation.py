@@ -0,0 +1,235 @@
+"""배열 기반 회전 (쿼터니언) 모듈
+
+Rotation 은 __slots__ 를 사용하는 단일 회전, RotationBatch 는 [N,4] 배열 (w, x, y, z) 기반
+다중 회전이다. 많은 벡터를 회전할 때는 회전 행렬을 한 번만 만들어 행렬 곱으로 처리한다.
+기존 Quaternion 과는 w, x, y, z 속성을 통해 서로 변환된다.
+"""
+import math
+
+import numpy as np
+
+
+def euler_to_quaternion_array(roll, pitch, yaw):
+    """오일러 각도 배열(RPY, 라디안)로부터 [N,4] 쿼터니언 배열 (w, x, y, z) 생성"""
+    roll = np.asarray(roll, dtype=float)
+    pitch = np.asarray(pitch, dtype=float)
+    yaw = np.asarray(yaw, dtype=float)
+
+    cy = np.cos(yaw * 0.5)
+    sy = np.sin(yaw * 0.5)
+    cp = np.cos(pitch * 0.5)
+    sp = np.sin(pitch * 0.5)
+    cr = np.cos(roll * 0.5)
+    sr = np.sin(roll * 0.5)
+
+    w = cr * cp * cy + sr * sp * sy
+    x = sr * cp * cy - cr * sp * sy
+    y = cr * sp * cy + sr * cp * sy
+    z = cr * cp * sy - sr * sp * cy
+
+    return np.stack([w, x, y, z], axis=-1)
+
+
+def quaternion_array_to_matrix(quaternions):
+    """[...,4] 쿼터니언 배열을 [...,3,3] 회전 행렬로 변환 (q * v * q* 와 같은 결과)"""
+    q = np.asarray(quaternions, dtype=float)
+    w, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+
+    # 정규화하지 않은 형태 - Quaternion.rotate_vector 와 동일한 값을 낸다
+    matrix = np.empty(q.shape[:-1] + (3, 3))
+    matrix[..., 0, 0] = w*w + x*x - y*y - z*z
+    matrix[..., 0, 1] = 2 * (x*y - w*z)
+    matrix[..., 0, 2] = 2 * (x*z + w*y)
+    matrix[..., 1, 0] = 2 * (x*y + w*z)
+    matrix[..., 1, 1] = w*w - x*x + y*y - z*z
+    matrix[..., 1, 2] = 2 * (y*z - w*x)
+    matrix[..., 2, 0] = 2 * (x*z - w*y)
+    matrix[..., 2, 1] = 2 * (y*z + w*x)
+    matrix[..., 2, 2] = w*w - x*x - y*y + z*z
+    return matrix
+
+
+def multiply_quaternion_arrays(a, b):
+    """[...,4] 쿼터니언 배열 곱셈 (브로드캐스팅)"""
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    aw, ax, ay, az = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bw, bx, by, bz = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+    return np.stack([
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw
+    ], axis=-1)
+
+
+def slerp_quaternion_arrays(a, b, t):
+    """[...,4] 쿼터니언 배열의 구면 선형 보간 - t 는 [...] 형태로 브로드캐스팅"""
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    t = np.asarray(t, dtype=float)[..., None]
+
+    # 최단 경로로 보간하도록 부호 맞춤
+    dot = np.sum(a * b, axis=-1, keepdims=True)
+    b = np.where(dot < 0, -b, b)
+    dot = np.clip(np.abs(dot), 0.0, 1.0)
+
+    theta = np.arccos(dot)
+    sin_theta = np.sin(theta)
+    # 두 회전이 거의 같으면 선형 보간 후 정규화
+    near = sin_theta < 1e-6
+    safe_sin = np.where(near, 1.0, sin_theta)
+    weight_a = np.where(near, 1.0 - t, np.sin((1.0 - t) * theta) / safe_sin)
+    weight_b = np.where(near, t, np.sin(t * theta) / safe_sin)
+
+    result = weight_a * a + weight_b * b
+    return result / np.linalg.norm(result, axis=-1, keepdims=True)
+
+
+class Rotation:
+    """단일 회전 - 할당을 줄이기 위해 __slots__ 사용"""
+    __slots__ = ('w', 'x', 'y', 'z')
+
+    def __init__(self, w=1.0, x=0.0, y=0.0, z=0.0):
+        self.w = w
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @classmethod
+    def from_euler(cls, roll, pitch, yaw):
+        """오일러 각도(RPY, 라디안)로부터 회전 생성"""
+        cy = math.cos(yaw * 0.5)
+        sy = math.sin(yaw * 0.5)
+        cp = math.cos(pitch * 0.5)
+        sp = math.sin(pitch * 0.5)
+        cr = math.cos(roll * 0.5)
+        sr = math.sin(roll * 0.5)
+
+        return cls(cr * cp * cy + sr * sp * sy,
+                   sr * cp * cy - cr * sp * sy,
+                   cr * sp * cy + sr * cp * sy,
+                   cr * cp * sy - sr * sp * cy)
+
+    @classmethod
+    def from_quaternion(cls, quaternion):
+        """Quaternion (w, x, y, z 속성을 가진 객체) 으로부터 생성"""
+        return cls(quaternion.w, quaternion.x, quaternion.y, quaternion.z)
+
+    def to_quaternion(self, quaternion_class):
+        """기존 Quaternion 클래스 인스턴스로 변환"""
+        return quaternion_class(self.w, self.x, self.y, self.z)
+
+    def as_array(self):
+        """[4] 배열 (w, x, y, z)"""
+        return np.array([self.w, self.x, self.y, self.z])
+
+    def multiply(self, other):
+        """회전 곱셈"""
+        return Rotation(
+            self.w * other.w - self.x * other.x - self.y * other.y - self.z * other.z,
+            self.w * other.x + self.x * other.w + self.y * other.z - self.z * other.y,
+            self.w * other.y - self.x * other.z + self.y * other.w + self.z * other.x,
+            self.w * other.z + self.x * other.y - self.y * other.x + self.z * other.w
+        )
+
+    def conjugate(self):
+        """켤레 (단위 쿼터니언이면 역회전)"""
+        return Rotation(self.w, -self.x, -self.y, -self.z)
+
+    def as_matrix(self):
+        """[3,3] 회전 행렬"""
+        return quaternion_array_to_matrix(self.as_array())
+
+    def rotate_vector(self, vector):
+        """벡터 하나를 회전 (임시 객체 없이 계산)"""
+        w, x, y, z = self.w, self.x, self.y, self.z
+        vx, vy, vz = vector[0], vector[1], vector[2]
+        return [
+            (w*w + x*x - y*y - z*z) * vx + 2 * (x*y - w*z) * vy + 2 * (x*z + w*y) * vz,
+            2 * (x*y + w*z) * vx + (w*w - x*x + y*y - z*z) * vy + 2 * (y*z - w*x) * vz,
+            2 * (x*z - w*y) * vx + 2 * (y*z + w*x) * vy + (w*w - x*x - y*y + z*z) * vz
+        ]
+
+    def apply(self, vectors):
+        """[M,3] 벡터들을 한 번에 회전 - 회전 행렬을 한 번만 만든다"""
+        return np.asarray(vectors, dtype=float) @ self.as_matrix().T
+
+    def slerp(self, other, t):
+        """구면 선형 보간 (t=0 이면 self, t=1 이면 other)"""
+        return Rotation(*slerp_quaternion_arrays(self.as_array(), other.as_array(), t))
+
+    def __repr__(self):
+        return f"Rotation(w={self.w:.6f}, x={self.x:.6f}, y={self.y:.6f}, z={self.z:.6f})"
+
+
+class RotationBatch:
+    """[N,4] 배열 (w, x, y, z) 기반 다중 회전"""
+    __slots__ = ('quaternions',)
+
+    def __init__(self, quaternions):
+        self.quaternions = np.asarray(quaternions, dtype=float).reshape(-1, 4)
+
+    @classmethod
+    def from_euler(cls, roll, pitch, yaw):
+        """오일러 각도 배열(RPY, 라디안)로부터 생성"""
+        return cls(euler_to_quaternion_array(roll, pitch, yaw))
+
+    @classmethod
+    def from_rotations(cls, rotations):
+        """Rotation 또는 Quaternion 객체 목록으로부터 생성"""
+        return cls([[r.w, r.x, r.y, r.z] for r in rotations])
+
+    @classmethod
+    def identity(cls, n):
+        """n 개의 항등 회전"""
+        quaternions = np.zeros((n, 4))
+        quaternions[:, 0] = 1.0
+        return cls(quaternions)
+
+    def to_quaternions(self, quaternion_class):
+        """기존 Quaternion 클래스 인스턴스 목록으로 변환"""
+        return [quaternion_class(*map(float, q)) for q in self.quaternions]
+
+    def __len__(self):
+        return len(self.quaternions)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Rotation(*map(float, self.quaternions[index]))
+        return RotationBatch(self.quaternions[index])
+
+    def multiply(self, other):
+        """회전 곱셈 - other 는 RotationBatch 또는 Rotation (브로드캐스팅)"""
+        other_array = other.quaternions if isinstance(other, RotationBatch) else other.as_array()
+        return RotationBatch(multiply_quaternion_arrays(self.quaternions, other_array))
+
+    def conjugate(self):
+        """켤레"""
+        return RotationBatch(self.quaternions * np.array([1.0, -1.0, -1.0, -1.0]))
+
+    def as_matrix(self):
+        """[N,3,3] 회전 행렬"""
+        return quaternion_array_to_matrix(self.quaternions)
+
+    def apply(self, vectors):
+        """짝별 벡터 회전 - i 번째 회전을 i 번째 벡터에 적용하여 [N,3] 반환
+
+        vectors 는 [N,3] 또는 모든 회전에 같은 벡터를 쓰는 [3] / [1,3].
+        모든 회전 x 모든 벡터 조합은 apply_outer 를 쓴다.
+        """
+        vectors = np.asarray(vectors, dtype=float).reshape(-1, 3)
+        if len(vectors) not in (1, len(self)):
+            raise ValueError(f"벡터 개수 ({len(vectors)}) 가 회전 개수 ({len(self)}) 와 다릅니다 "
+                             "(모든 조합은 apply_outer 사용)")
+        return np.einsum('nij,nj->ni', self.as_matrix(), np.broadcast_to(vectors, (len(self), 3)))
+
+    def apply_outer(self, vectors):
+        """모든 회전을 [M,3] 벡터 모두에 적용하여 [N,M,3] 반환 (예: 자세 N개 x 플랫폼 조인트 6개)"""
+        vectors = np.asarray(vectors, dtype=float).reshape(-1, 3)
+        return np.einsum('nij,mj->nmi', self.as_matrix(), vectors)
+
+    def slerp(self, other, t):
+        """구면 선형 보간 - other 는 RotationBatch 또는 Rotation, t 는 스칼라 또는 [N]"""
+        other_array = other.quaternions if isinstance(other, RotationBatch) else other.as_array()
+        return RotationBatch(slerp_quaternion_arrays(self.quaternions, other_array, t))
@@ -0,0 +1,443 @@
+"""로컬 역기구학 질의 서버 - Unix 도메인 소켓, 요청 묶음 배치 계산
+
+제어 호스트의 여러 프로세스 (애니메이션 재생기, 시선 추적기, GUI) 가 각자 StewartPlatform 을 만들지 않고
+설정된 플랫폼 하나를 가진 서버에 자세를 보내 서보 각도를 받는다. 서버는 짧은 시간 창 (window) 안에
+들어온 요청을 모든 연결에서 모아 한 번의 배치 역기구학으로 계산한다.
+
+프레임 형식 (리틀 엔디언, 요청/응답 모두 32바이트). 한 번에 여러 프레임을 이어 보내도 된다.
+
+    요청                                   응답
+    offset  크기  필드                     offset  크기  필드
+    0       2     매직 b'IK'               0       2     매직 b'IK'
+    2       1     종류 (0x01 = SOLVE)      2       1     종류 (0x81 = RESULT)
+    3       1     예약 (0)                 3       1     유효 다리 비트마스크 (비트 i = 서보 i+1)
+    4       4     요청 번호 (uint32)       4       4     요청 번호 (uint32, 요청과 같음)
+    8       24    x y z (mm) roll pitch    8       24    서보 1~6 각도 (float32 도, 계산 불가 NaN)
+                  yaw (도) float32
+
+소켓 스트림은 손실/변조가 없으므로 CRC 는 두지 않는다. 잘못된 매직이나 종류를 받으면 연결을 끊는다.
+
+    python -m stewart_kinematics.server serve --socket /tmp/stewart_ik.sock --config geometry.json
+    python -m stewart_kinematics.server load-test --socket /tmp/stewart_ik.sock --clients 8
+
+    async with IKClient('/tmp/stewart_ik.sock') as client:
+        servo_angles, valid = await client.solve([0, 0, 5], [10, 0, 0])
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import stat
+import time
+
+import numpy as np
+
+from .kinematics import StewartPlatform
+from .pose_table import poses_to_ik_inputs
+
+FRAME_MAGIC = b'IK'
+FRAME_SOLVE = 0x01
+FRAME_RESULT = 0x81
+
+REQUEST_DTYPE = np.dtype([('magic', 'S2'), ('kind', 'u1'), ('reserved', 'u1'),
+                          ('id', '<u4'), ('pose', '<f4', (6,))])
+RESPONSE_DTYPE = np.dtype([('magic', 'S2'), ('kind', 'u1'), ('valid', 'u1'),
+                           ('id', '<u4'), ('servo_angles', '<f4', (6,))])
+FRAME_SIZE = REQUEST_DTYPE.itemsize
+
+DEFAULT_SOCKET_PATH = '/tmp/stewart_ik.sock'
+
+_LEG_BITS = 1 << np.arange(6)
+
+
+def pack_requests(ids, poses):
+    """요청 번호 [N] 과 자세 [N,6] (x, y, z, roll, pitch, yaw[도]) 를 요청 프레임 바이트로 변환"""
+    poses = np.asarray(poses, dtype=float).reshape(-1, 6)
+    frames = np.zeros(len(poses), dtype=REQUEST_DTYPE)
+    frames['magic'] = FRAME_MAGIC
+    frames['kind'] = FRAME_SOLVE
+    frames['id'] = ids
+    frames['pose'] = poses
+    return frames.tobytes()
+
+
+def unpack_responses(data):
+    """응답 프레임 바이트를 (요청 번호 [N], 서보 각도 [N,6], 유효 여부 [N,6]) 로 변환"""
+    frames = _parse_frames(data, RESPONSE_DTYPE, FRAME_RESULT)
+    valid = (frames['valid'][:, None] & _LEG_BITS) != 0
+    return frames['id'].astype(np.int64), frames['servo_angles'].astype(float), valid
+
+
+def _parse_frames(data, dtype, kind):
+    """FRAME_SIZE 배수 길이의 바이트를 구조체 배열로 해석 - 매직이나 종류가 다르면 ValueError"""
+    frames = np.frombuffer(data, dtype=dtype)
+    if np.any(frames['magic'] != FRAME_MAGIC) or np.any(frames['kind'] != kind):
+        raise ValueError("프레임 형식이 올바르지 않습니다")
+    return frames
+
+
+def _remove_stale_socket(path):
+    """path 에 남은 소켓 파일이 연결을 받지 않으면 (이전 서버가 비정상 종료) 지움"""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"소켓 경로에 소켓이 아닌 파일이 있습니다: {path}")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.remove(path)
+        return
+    except FileNotFoundError:
+        return
+    finally:
+        probe.close()
+    raise ValueError(f"다른 서버가 이미 소켓을 사용 중입니다: {path}")
+
+
+class IKServer:
+    """요청 묶음 배치 역기구학 서버
+
+    첫 요청이 들어온 뒤 window 초 동안 (또는 max_batch 개가 찰 때까지) 모든 연결의 요청을 모아
+    한 번에 계산한다. window=0 이면 이벤트 루프가 한 번 돌 동안 들어온 요청만 모은다.
+    """
+    def __init__(self, platform, path=DEFAULT_SOCKET_PATH, window=0.0005, max_batch=4096):
+        if window < 0:
+            raise ValueError("window 는 0 이상이어야 합니다")
+        if max_batch < 1:
+            raise ValueError("max_batch 는 1 이상이어야 합니다")
+        self.platform = platform
+        self.path = path
+        self.window = float(window)
+        self.max_batch = int(max_batch)
+        self._server = None
+        self._pending = []  # (writer, ids [M], poses [M,6])
+        self._pending_count = 0
+        self._flush_handle = None
+        self.stats = {'connections': 0, 'requests': 0, 'batches': 0, 'max_batch': 0,
+                      'solve_time': 0.0, 'protocol_errors': 0}
+
+    async def start(self):
+        """소켓을 열고 연결 받기 시작 - 연결을 받지 않는 이전 소켓 파일만 지운다
+
+        경로에 소켓이 아닌 파일이 있거나 다른 서버가 이미 연결을 받고 있으면 ValueError.
+        """
+        _remove_stale_socket(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+
+    async def stop(self):
+        """남은 요청을 계산하여 보낸 뒤 서버 종료"""
+        if self._pending:
+            self._flush()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            # 이 서버가 만든 소켓 파일만 지움 (start 가 실패했다면 다른 서버의 소켓일 수 있음)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _handle(self, reader, writer):
+        """연결 하나의 요청 프레임 수신 - 완성된 프레임을 모아 대기열에 추가"""
+        self.stats['connections'] += 1
+        buffer = bytearray()
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                buffer += data
+                complete = len(buffer) - len(buffer) % FRAME_SIZE
+                if not complete:
+                    continue
+                frames = _parse_frames(bytes(buffer[:complete]), REQUEST_DTYPE, FRAME_SOLVE)
+                del buffer[:complete]
+                self._enqueue(writer, frames['id'], frames['pose'])
+                # 응답을 읽지 않는 클라이언트가 서버 메모리를 늘리지 않도록 역압 적용
+                await writer.drain()
+        except ValueError:
+            self.stats['protocol_errors'] += 1
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _enqueue(self, writer, ids, poses):
+        self._pending.append((writer, ids, poses))
+        self._pending_count += len(ids)
+        if self._pending_count >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            if self.window > 0:
+                self._flush_handle = loop.call_later(self.window, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+
+    def _flush(self):
+        """모인 요청을 한 번의 배치 역기구학으로 계산하고 연결별로 응답"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending, self._pending_count = self._pending, [], 0
+        if not pending:
+            return
+
+        started = time.perf_counter()
+        poses = np.concatenate([poses for _, _, poses in pending])
+        translations, quaternions = poses_to_ik_inputs(poses)
+        servo_angles, valid = self.platform.calculate_inverse_kinematics_batch(translations, quaternions)
+
+        responses = np.zeros(len(poses), dtype=RESPONSE_DTYPE)
+        responses['magic'] = FRAME_MAGIC
+        responses['kind'] = FRAME_RESULT
+        responses['id'] = np.concatenate([ids for _, ids, _ in pending])
+        responses['servo_angles'] = servo_angles
+        responses['valid'] = valid @ _LEG_BITS
+        self.stats['solve_time'] += time.perf_counter() - started
+
+        start = 0
+        for writer, ids, _ in pending:
+            if not writer.is_closing():
+                writer.write(responses[start:start + len(ids)].tobytes())
+            start += len(ids)
+
+        self.stats['requests'] += len(poses)
+        self.stats['batches'] += 1
+        self.stats['max_batch'] = max(self.stats['max_batch'], len(poses))
+
+    def summary(self):
+        """서버 통계 - 평균 배치 크기와 요청당 계산 시간 (us)"""
+        summary = dict(self.stats)
+        if self.stats['batches']:
+            summary['mean_batch'] = self.stats['requests'] / self.stats['batches']
+            summary['solve_us_per_request'] = self.stats['solve_time'] * 1e6 / self.stats['requests']
+        return summary
+
+
+class IKClient:
+    """asyncio 역기구학 클라이언트 - 여러 작업이 한 연결로 동시에 요청해도 요청 번호로 응답을 찾아 준다"""
+    def __init__(self, path=DEFAULT_SOCKET_PATH):
+        self.path = path
+        self._reader = None
+        self._writer = None
+        self._receiver = None
+        self._waiting = {}
+        self._next_id = 0
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+        self._receiver = asyncio.get_running_loop().create_task(self._receive())
+
+    async def close(self):
+        if self._writer is None:
+            return
+        self._writer.close()
+        await self._writer.wait_closed()
+        await asyncio.gather(self._receiver, return_exceptions=True)
+        self._writer = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _receive(self):
+        """응답 프레임을 읽어 기다리는 요청에 전달 - 연결이 끊기면 남은 요청에 ConnectionError"""
+        buffer = bytearray()
+        try:
+            while True:
+                data = await self._reader.read(65536)
+                if not data:
+                    break
+                buffer += data
+                complete = len(buffer) - len(buffer) % FRAME_SIZE
+                if not complete:
+                    continue
+                ids, servo_angles, valid = unpack_responses(bytes(buffer[:complete]))
+                del buffer[:complete]
+                for index, request_id in enumerate(ids.tolist()):
+                    future = self._waiting.pop(request_id, None)
+                    if future is not None and not future.done():
+                        future.set_result((servo_angles[index], valid[index]))
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("서버 연결이 끊겼습니다"))
+            self._waiting.clear()
+
+    async def solve_many(self, poses):
+        """[N,6] 자세 (x, y, z, roll, pitch, yaw[도]) 를 한 번에 보내고 (servo_angles [N,6], valid [N,6]) 반환"""
+        poses = np.asarray(poses, dtype=float).reshape(-1, 6)
+        ids = (self._next_id + np.arange(len(poses))) & 0xFFFFFFFF
+        self._next_id = int(self._next_id + len(poses)) & 0xFFFFFFFF
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in range(len(poses))]
+        self._waiting.update(zip(ids.tolist(), futures))
+        self._writer.write(pack_requests(ids, poses))
+        await self._writer.drain()
+        results = await asyncio.gather(*futures)
+        if not results:
+            return np.zeros((0, 6)), np.zeros((0, 6), dtype=bool)
+        return np.array([angles for angles, _ in results]), np.array([valid for _, valid in results])
+
+    async def solve(self, translation, rpy_degrees):
+        """단일 자세 - (servo_angles [6] 도, valid [6]) 반환"""
+        servo_angles, valid = await self.solve_many([list(translation) + list(rpy_degrees)])
+        return servo_angles[0], valid[0]
+
+
+class BlockingIKClient:
+    """asyncio 를 쓰지 않는 프로세스 (예: Tk GUI) 용 동기 클라이언트"""
+    def __init__(self, path=DEFAULT_SOCKET_PATH, timeout=1.0):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(path)
+        self._next_id = 0
+
+    def close(self):
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def solve_many(self, poses):
+        """[N,6] 자세를 보내고 (servo_angles [N,6], valid [N,6]) 반환"""
+        poses = np.asarray(poses, dtype=float).reshape(-1, 6)
+        ids = (self._next_id + np.arange(len(poses))) & 0xFFFFFFFF
+        self._next_id = int(self._next_id + len(poses)) & 0xFFFFFFFF
+        self._socket.sendall(pack_requests(ids, poses))
+        expected = len(poses) * FRAME_SIZE
+        data = bytearray()
+        while len(data) < expected:
+            chunk = self._socket.recv(expected - len(data))
+            if not chunk:
+                raise ConnectionError("서버 연결이 끊겼습니다")
+            data += chunk
+        received, servo_angles, valid = unpack_responses(bytes(data))
+        # 한 연결의 응답은 요청 순서대로 온다
+        if not np.array_equal(received, ids):
+            raise ValueError("응답 요청 번호가 일치하지 않습니다")
+        return servo_angles, valid
+
+    def solve(self, translation, rpy_degrees):
+        servo_angles, valid = self.solve_many([list(translation) + list(rpy_degrees)])
+        return servo_angles[0], valid[0]
+
+
+async def run_load_test(path=DEFAULT_SOCKET_PATH, clients=8, requests=1000, poses_per_request=1, seed=0):
+    """clients 개 연결이 각각 requests 번 (응답을 받으면 다음 요청) 질의하여 지연 시간과 처리량 측정
+
+    결과 딕셔너리: requests, poses, elapsed (초), requests_per_sec, poses_per_sec,
+    latency_p50_ms, latency_p99_ms, latency_max_ms
+    """
+    rng = np.random.default_rng(seed)
+    latencies = []
+
+    async def client_loop(client):
+        poses = rng.uniform(-1, 1, (requests, poses_per_request, 6)) * [20, 20, 10, 20, 20, 20]
+        for request in poses:
+            sent_at = time.perf_counter()
+            await client.solve_many(request)
+            latencies.append(time.perf_counter() - sent_at)
+
+    connections = [IKClient(path) for _ in range(clients)]
+    for client in connections:
+        await client.connect()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(client_loop(client) for client in connections))
+    finally:
+        elapsed = time.perf_counter() - started
+        for client in connections:
+            await client.close()
+
+    latencies = np.array(latencies) * 1000
+    total = len(latencies)
+    return {
+        'requests': total,
+        'poses': total * poses_per_request,
+        'elapsed': elapsed,
+        'requests_per_sec': total / elapsed if elapsed > 0 else 0.0,
+        'poses_per_sec': total * poses_per_request / elapsed if elapsed > 0 else 0.0,
+        'latency_p50_ms': float(np.percentile(latencies, 50)) if total else 0.0,
+        'latency_p99_ms': float(np.percentile(latencies, 99)) if total else 0.0,
+        'latency_max_ms': float(np.max(latencies)) if total else 0.0,
+    }
+
+
+async def run_local_load_test(platform=None, path=DEFAULT_SOCKET_PATH, window=0.0005, **options):
+    """같은 이벤트 루프에서 서버를 띄우고 부하 시험 - 결과에 server 통계 딕셔너리를 추가하여 반환"""
+    server = IKServer(StewartPlatform() if platform is None else platform, path, window=window)
+    await server.start()
+    try:
+        result = await run_load_test(path, **options)
+    finally:
+        await server.stop()
+    result['server'] = server.summary()
+    return result
+
+
+def main():
+    """서버 실행 또는 부하 시험"""
+    parser = argparse.ArgumentParser(description="Stewart Platform 로컬 역기구학 질의 서버")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve = subparsers.add_parser('serve', help="서버 실행")
+    serve.add_argument('--config', help="플랫폼 설정 JSON 파일 (기본값: 기본 설정)")
+
+    load_test = subparsers.add_parser('load-test', help="부하 시험 클라이언트")
+    load_test.add_argument('--clients', type=int, default=8, help="동시 연결 수")
+    load_test.add_argument('--requests', type=int, default=1000, help="연결마다 보낼 요청 수")
+    load_test.add_argument('--poses', type=int, default=1, help="요청마다 자세 수")
+    load_test.add_argument('--local', action='store_true', help="같은 프로세스에서 서버를 띄워 시험")
+
+    for subparser in (serve, load_test):
+        subparser.add_argument('--socket', default=DEFAULT_SOCKET_PATH, help="Unix 소켓 경로")
+        subparser.add_argument('--window-ms', type=float, default=0.5, help="요청을 모으는 시간 창 (ms)")
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        config = None
+        if args.config:
+            with open(args.config, encoding='utf-8') as f:
+                config = json.load(f)
+        server = IKServer(StewartPlatform(config), args.socket, window=args.window_ms / 1000)
+        print(f"역기구학 서버 대기 중: {args.socket}")
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        except ValueError as e:
+            parser.exit(1, f"오류: {e}\n")
+        return
+
+    options = {'clients': args.clients, 'requests': args.requests, 'poses_per_request': args.poses}
+    if args.local:
+        result = asyncio.run(run_local_load_test(path=args.socket, window=args.window_ms / 1000, **options))
+    else:
+        result = asyncio.run(run_load_test(args.socket, **options))
+    for key, value in result.items():
+        if isinstance(value, dict):
+            value = ', '.join(f"{name}={item:.3f}" if isinstance(item, float) else f"{name}={item}"
+                              for name, item in value.items())
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""특이 자세 지도 - 6차원 자세 격자의 야코비안 조건수
+
+자세 룩업 테이블과 같은 x/y/z/roll/pitch/yaw 격자에서 야코비안 조건수를 미리 계산하여
+config 해시별 디렉터리에 메모리 맵(.npy) 형식으로 저장하고, SingularityMap 으로 보간 조회한다.
+격자 저장/열기/보간은 pose_table 의 build_grid_table, GridTable 을 그대로 쓴다.
+조건수는 자릿수 차이가 크므로 log10 값을 저장하고 보간한다.
+"""
+import argparse
+import os
+
+import numpy as np
+
+from .kinematics import DEFAULT_CACHE_DIR, StewartPlatform
+from .pose_table import DEFAULT_GRID, GridTable, build_grid_table, poses_to_ik_inputs
+
+DEFAULT_MAP_DIR = os.path.join(DEFAULT_CACHE_DIR, 'singularity')
+
+MAP_FORMAT_VERSION = 1
+
+
+def build_singularity_map(platform, grid=None, root=DEFAULT_MAP_DIR, chunk_size=65536):
+    """격자 전체의 log10 조건수를 계산하여 메모리 맵으로 저장하고 경로 반환 (계산 불가능한 자세는 NaN)"""
+    def compute(translations, quaternions):
+        condition = platform.calculate_conditioning_batch(translations, quaternions)['condition']
+        return np.where(np.isfinite(condition), np.log10(condition), np.nan)
+
+    meta = {
+        'version': MAP_FORMAT_VERSION,
+        'characteristic_length': float(platform.config['platform_radius']),
+    }
+    return build_grid_table(platform, grid, root, 'log_condition', compute, meta=meta, chunk_size=chunk_size)
+
+
+class SingularityMap(GridTable):
+    """메모리 맵 특이 자세 지도 조회 - 다선형 보간, 격자 밖이나 계산 불가능한 꼭짓점 근처는 정확히 계산"""
+    values_name = 'log_condition'
+    version = MAP_FORMAT_VERSION
+    default_root = DEFAULT_MAP_DIR
+    label = '특이 자세 지도'
+    build = staticmethod(build_singularity_map)
+
+    @property
+    def log_condition(self):
+        """[격자...] log10 조건수 메모리 맵"""
+        return self.values
+
+    def query_batch(self, poses):
+        """[N,6] 자세 (x, y, z, roll, pitch, yaw[도]) 의 조건수 조회
+
+        (condition [N], exact [N]) 반환. 계산 불가능한 자세의 조건수는 inf 이며
+        exact 는 격자 밖이거나 보간 셀에 계산 불가능한 꼭짓점이 있어 직접 계산한 자세.
+        """
+        poses = np.asarray(poses, dtype=float).reshape(-1, 6)
+        log_condition, exact = self._interpolate(poses)
+        condition = 10.0 ** log_condition
+        if np.any(exact):
+            translations, quaternions = poses_to_ik_inputs(poses[exact])
+            condition[exact] = self.platform.calculate_conditioning_batch(
+                translations, quaternions, self.meta['characteristic_length'])['condition']
+        return condition, exact
+
+    def query(self, translation, rpy_degrees):
+        """단일 자세의 조건수 조회"""
+        condition, _ = self.query_batch([list(translation) + list(rpy_degrees)])
+        return float(condition[0])
+
+
+def main():
+    """기본 설정으로 특이 자세 지도 생성"""
+    parser = argparse.ArgumentParser(description="Stewart Platform 특이 자세 (야코비안 조건수) 지도 생성")
+    parser.add_argument('--root', default=DEFAULT_MAP_DIR, help="지도 저장 디렉터리")
+    parser.add_argument('--points', type=int, default=None, help="모든 축의 격자 개수")
+    args = parser.parse_args()
+
+    grid = None
+    if args.points is not None:
+        grid = {axis: (low, high, args.points) for axis, (low, high, _) in DEFAULT_GRID.items()}
+
+    platform = StewartPlatform()
+    path = build_singularity_map(platform, grid, args.root)
+    singularity_map = SingularityMap(path, platform)
+    values = np.asarray(singularity_map.log_condition)
+    reachable = np.isfinite(values)
+    print(f"지도 생성 완료: {path} ({values.nbytes / 1e6:.1f} MB, 유효 비율 {reachable.mean():.1%})")
+    if reachable.any():
+        print(f"조건수 범위: {10 ** values[reachable].min():.1f} ~ {10 ** values[reachable].max():.1f}")
+
+
+if __name__ == "__main__":
+    main()
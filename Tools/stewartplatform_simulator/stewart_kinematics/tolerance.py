@@ -0,0 +1,463 @@
+"""제작 공차 몬테카를로 분석 - 조인트 위치, 로드 길이 오차가 만드는 자세 오차 분포
+
+3D 프린팅한 부품은 조인트 위치와 로드 길이가 0.1 mm 단위로 달라진다. 공차 명세에 따라
+config 값 (반지름, 샤프트/앵커 간격) 과 계산된 base_joints/platform_joints, 다리별 로드/호른 길이를
+무작위로 흔든 "실제 기체" 를 수천 개 만들고, 공칭 기체로 계산한 서보 명령을 각 기체에 주었을 때
+도달하는 자세를 배치 순기구학으로 구해 명령 자세와의 오차를 잰다.
+
+    공칭 역기구학 (자세 P개)  ->  서보 각도 [P,6]
+    샘플 S개 x 자세 P개 순기구학 (샘플별 기하를 행마다 브로드캐스팅)  ->  위치 오차 mm, 회전 오차 도
+
+공차 값은 ± 허용 오차 (mm, servo_offsets 는 도) 이며 'normal' 분포는 3σ = 공차로 보고 ±공차에서
+자르고, 'uniform' 분포는 ±공차 안에서 고르게 뽑는다.
+    config 키 (base_radius 등)       샘플마다 한 값
+    rod_length, horn_length, servo_offsets   다리마다 한 값 [6]
+    base_joints, platform_joints     조인트 좌표마다 한 값 [6,3]
+
+자세 영역은 작업 영역 크기에 대한 상대 거리 r = max(|축 값| / 축 범위) 로 나눈다
+(center: r < 1/3, middle: r < 2/3, edge: 나머지). 샘플 청크는 프로세스 풀로 모든 코어에 나눈다.
+
+    study = analyze_tolerances(config, {'rod_length': 0.2, 'base_joints': 0.3}, samples=5000)
+    study.region_stats()['edge']['position']['p99']
+    print(study.format_report())
+
+    python -m stewart_kinematics.tolerance --samples 5000 --tolerance rod_length=0.2 -o report.json
+"""
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .kinematics import (
+    StewartPlatform, _solve_forward_kinematics, _solve_inverse_kinematics, euler_to_matrix_array
+)
+from .pose_io import load_pose_file
+from .pose_table import POSE_AXES, poses_to_ik_inputs
+from .rotation import quaternion_array_to_matrix
+
+# 샘플마다 한 값을 뽑는 config 키 (조인트 위치를 다시 계산)
+CONFIG_TOLERANCES = ('base_radius', 'platform_radius', 'shaft_distance', 'anchor_distance')
+# 다리마다 한 값을 뽑는 키 [6] - servo_offsets 는 서보 영점 (혼 스플라인) 오차, 도
+LEG_TOLERANCES = ('rod_length', 'horn_length', 'servo_offsets')
+# 조인트 좌표마다 한 값을 뽑는 키 [6,3]
+JOINT_TOLERANCES = ('base_joints', 'platform_joints')
+
+# 기본 공차 명세 (± mm) - FDM 프린팅 부품 기준
+DEFAULT_TOLERANCES = {
+    'base_radius': 0.2,
+    'platform_radius': 0.2,
+    'shaft_distance': 0.2,
+    'anchor_distance': 0.2,
+    'rod_length': 0.2,
+    'horn_length': 0.1,
+    'base_joints': 0.2,
+    'platform_joints': 0.2,
+}
+
+DISTRIBUTIONS = ('normal', 'uniform')
+
+# 평가 자세 집합 - 작업 영역은 위치 ±mm, 회전 ±도, interior 는 내부 임의 자세 수
+DEFAULT_POSE_SPEC = {
+    'translation_extent': 10.0,
+    'rotation_extent': 10.0,
+    'interior': 500,
+}
+
+# (영역 이름, 상대 거리 상한) - 작은 것부터 순서대로 검사
+REGION_BANDS = (('center', 1 / 3), ('middle', 2 / 3), ('edge', math.inf))
+
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+# 작업 함수 한 번이 계산하는 순기구학 행 수 (샘플 x 자세) 의 목표값
+CHUNK_ROWS = 32768
+
+# 이 행 수보다 적으면 프로세스 풀 없이 계산 (프로세스 시작 비용이 더 큼)
+PARALLEL_THRESHOLD = 100000
+
+
+def _validate_tolerances(tolerances):
+    known = CONFIG_TOLERANCES + LEG_TOLERANCES + JOINT_TOLERANCES
+    for key, value in tolerances.items():
+        if key not in known:
+            raise ValueError(f"알 수 없는 공차 항목: {key} (가능한 항목: {', '.join(known)})")
+        if not value >= 0:
+            raise ValueError(f"{key} 공차는 0 이상이어야 합니다: {value}")
+
+
+def sample_perturbations(tolerances, samples, distribution='normal', seed=0):
+    """공차 명세에 따른 샘플별 오차 딕셔너리 (키마다 [S], [S,6] 또는 [S,6,3])"""
+    _validate_tolerances(tolerances)
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"distribution 은 {DISTRIBUTIONS} 중 하나여야 합니다: {distribution}")
+    if samples < 1:
+        raise ValueError("samples 는 1 이상이어야 합니다")
+    rng = np.random.default_rng(seed)
+
+    perturbations = {}
+    # 키 순서를 고정하여 같은 seed 면 명세를 적는 순서와 무관하게 같은 샘플이 나오도록 함
+    for key in CONFIG_TOLERANCES + LEG_TOLERANCES + JOINT_TOLERANCES:
+        if key not in tolerances:
+            continue
+        shape = (samples,) + ((6,) if key in LEG_TOLERANCES else (6, 3) if key in JOINT_TOLERANCES else ())
+        limit = float(tolerances[key])
+        if distribution == 'normal':
+            values = np.clip(rng.normal(0.0, limit / 3.0, shape), -limit, limit)
+        else:
+            values = rng.uniform(-limit, limit, shape)
+        perturbations[key] = values
+    return perturbations
+
+
+def perturbed_geometry(config, perturbations, samples):
+    """샘플 samples 개의 실제 기체 기하 - StewartPlatform._initialize_platform 의 벡터화 버전
+
+    (base_joints [S,6,3], platform_joints [S,6,3], cos_beta [S,6], sin_beta [S,6],
+    rod_length [S,6], horn_length [S,6]) 반환. config 의 조인트 보정값도 그대로 더한다.
+    """
+    def value(key):
+        # config 키는 [S] -> [S,1], 다리별 키는 [S,6] 그대로
+        offset = perturbations.get(key, np.zeros(samples))
+        return float(config[key]) + (offset[:, None] if offset.ndim == 1 else offset)
+
+    base_radius, platform_radius = value('base_radius'), value('platform_radius')
+    legs = np.arange(6)
+    pm = (-1.0) ** legs
+    phi_cut = (1 + legs - legs % 2) * math.pi / 3
+    phi_b = (legs + legs % 2) * math.pi / 3 + pm * value('shaft_distance') / (2 * base_radius)
+    phi_p = phi_cut - pm * value('anchor_distance') / (2 * platform_radius)
+    motor_rotation = phi_b + (legs % 2) * math.pi + math.pi / 2
+
+    zeros = np.zeros((samples, 6))
+    base = np.stack([np.cos(phi_b) * base_radius, np.sin(phi_b) * base_radius, zeros], axis=-1)
+    platform = np.stack([np.cos(phi_p) * platform_radius, np.sin(phi_p) * platform_radius, zeros], axis=-1)
+    for joints, key in ((base, 'base_joints'), (platform, 'platform_joints')):
+        offsets = config.get(key[:-1] + '_offsets')
+        if offsets is not None:
+            joints += np.asarray(offsets, dtype=float)
+        if key in perturbations:
+            joints += perturbations[key]
+
+    rod = value('rod_length') + zeros
+    horn = value('horn_length') + zeros
+    return base, platform, np.cos(motor_rotation), np.sin(motor_rotation), rod, horn
+
+
+def study_poses(spec=None, seed=0):
+    """평가 자세 [P,6] (위치 mm, 회전 도) - 중립 자세, 작업 영역 꼭짓점 64개, 내부 임의 자세"""
+    spec = dict(DEFAULT_POSE_SPEC, **(spec or {}))
+    extents = np.array([spec['translation_extent']] * 3 + [spec['rotation_extent']] * 3, dtype=float)
+    bits = (np.arange(2**len(POSE_AXES))[:, None] >> np.arange(len(POSE_AXES))[None, :]) & 1
+    corners = np.where(bits == 1, extents, -extents)
+    # 상대 거리 (pose_regions 기준) 가 0~1 에 고르게 퍼지도록 임의 방향을 임의 거리로 늘림 -
+    # 상자 안에서 고르게 뽑으면 6차원에서는 거의 모든 자세가 가장자리에 몰린다
+    rng = np.random.default_rng(seed)
+    count = int(spec['interior'])
+    directions = rng.uniform(-1.0, 1.0, (count, len(POSE_AXES)))
+    directions /= np.maximum(np.max(np.abs(directions), axis=1, keepdims=True), 1e-12)
+    interior = directions * rng.uniform(0.0, 1.0, (count, 1)) * extents
+    return np.concatenate([np.zeros((1, 6)), corners, interior])
+
+
+def pose_regions(poses, translation_extent, rotation_extent):
+    """자세마다 영역 이름 [P] - 작업 영역 크기에 대한 상대 거리로 REGION_BANDS 에 배정"""
+    poses = np.asarray(poses, dtype=float).reshape(-1, 6)
+    extents = np.array([translation_extent] * 3 + [rotation_extent] * 3, dtype=float)
+    if np.any(extents <= 0):
+        raise ValueError("작업 영역 크기는 0보다 커야 합니다")
+    distance = np.max(np.abs(poses) / extents, axis=1)
+    regions = np.empty(len(poses), dtype=object)
+    assigned = np.zeros(len(poses), dtype=bool)
+    for name, limit in REGION_BANDS:
+        mask = ~assigned & (distance < limit)
+        regions[mask] = name
+        assigned |= mask
+    return regions.astype(str)
+
+
+def _commanded_angles(platform, poses):
+    """공칭 기체의 호른 각도 [P,6] (도, 서보 오프셋 적용 전) 와 도달 가능 여부 [P]"""
+    translations, quaternions = poses_to_ik_inputs(poses)
+    base, joints, cos_beta, sin_beta = platform._geometry_arrays()
+    angles, valid, _, _ = _solve_inverse_kinematics(
+        base, joints, cos_beta, sin_beta, float(platform.T0[2]),
+        float(platform.config['rod_length']), float(platform.config['horn_length']),
+        translations, quaternion_array_to_matrix(quaternions))
+    return angles, np.all(valid, axis=1)
+
+
+def _evaluate_chunk(config, t0_z, samples, perturbations, angles, poses, tolerance, max_iterations):
+    """샘플 청크의 자세 오차 계산 (프로세스 풀 작업 함수)
+
+    (위치 오차 [s,P] mm, 회전 오차 [s,P] 도, 수렴 여부 [s,P]) 반환 - 수렴하지 않은 칸의 오차는 NaN.
+    """
+    geometry = perturbed_geometry(config, perturbations, samples)
+    count = len(poses)
+    # 샘플별 기하를 자세 수만큼 반복하여 행마다 [6,3]/[6] 기하를 갖는 하나의 배치로 만든다
+    base, joints, cos_beta, sin_beta, rod, horn = (np.repeat(array, count, axis=0) for array in geometry)
+    servo_angles = np.tile(angles, (samples, 1))
+    if 'servo_offsets' in perturbations:
+        servo_angles += np.repeat(perturbations['servo_offsets'], count, axis=0)
+
+    commanded = np.tile(poses, (samples, 1))
+    commanded[:, 3:] = np.radians(commanded[:, 3:])
+    achieved, converged, _, _ = _solve_forward_kinematics(
+        base, joints, cos_beta, sin_beta, t0_z, rod, horn, np.radians(servo_angles), commanded,
+        tolerance=tolerance, max_iterations=max_iterations)
+
+    position = np.linalg.norm(achieved[:, :3] - commanded[:, :3], axis=1)
+    # 두 회전 행렬의 프로베니우스 거리 = 2√2 sin(θ/2) - 작은 각도에서도 arccos 보다 정확함
+    R_achieved = euler_to_matrix_array(achieved[:, 3], achieved[:, 4], achieved[:, 5])[0]
+    R_commanded = euler_to_matrix_array(commanded[:, 3], commanded[:, 4], commanded[:, 5])[0]
+    distance = np.linalg.norm(R_achieved - R_commanded, axis=(1, 2))
+    rotation = np.degrees(2 * np.arcsin(np.clip(distance / (2 * math.sqrt(2)), 0.0, 1.0)))
+
+    position[~converged] = np.nan
+    rotation[~converged] = np.nan
+    shape = (samples, count)
+    return (position.reshape(shape).astype(np.float32), rotation.reshape(shape).astype(np.float32),
+            converged.reshape(shape))
+
+
+class ToleranceStudy:
+    """몬테카를로 공차 분석 결과
+
+    position_error/rotation_error [S,P] (mm/도, 순기구학이 수렴하지 않은 칸은 NaN),
+    converged [S,P], poses [P,6] (공칭 기체로 도달 가능한 평가 자세), regions [P] 영역 이름,
+    perturbations 샘플별 오차 딕셔너리, excluded_poses 공칭 기체로도 도달할 수 없어 뺀 자세 수.
+    """
+
+    def __init__(self, poses, regions, perturbations, position_error, rotation_error, converged,
+                 excluded_poses=0, elapsed=0.0, workers=1):
+        self.poses = poses
+        self.regions = regions
+        self.perturbations = perturbations
+        self.position_error = position_error
+        self.rotation_error = rotation_error
+        self.converged = converged
+        self.excluded_poses = excluded_poses
+        self.elapsed = elapsed
+        self.workers = workers
+
+    @property
+    def samples(self):
+        return self.position_error.shape[0]
+
+    @property
+    def evaluations_per_second(self):
+        """초당 평가한 (샘플, 자세) 쌍 수"""
+        return self.position_error.size / max(self.elapsed, 1e-12)
+
+    def region_stats(self, percentiles=DEFAULT_PERCENTILES):
+        """영역별 오차 통계 딕셔너리 (영역 이름 -> 통계, 'all' 은 전체)
+
+        통계: poses, evaluations, failures (순기구학 미수렴 = 실제 기체가 도달 못 함),
+        position/rotation ({'p50': ..., 'max': ...}, mm/도), worst_sample, worst_pose (위치 오차 최대 칸)
+        """
+        names = [name for name, _ in REGION_BANDS if np.any(self.regions == name)]
+        names += sorted(set(self.regions) - set(names))
+        stats = {}
+        for name in names + ['all']:
+            columns = np.ones(len(self.regions), dtype=bool) if name == 'all' else self.regions == name
+            position = self.position_error[:, columns]
+            rotation = self.rotation_error[:, columns]
+            entry = {
+                'poses': int(np.count_nonzero(columns)),
+                'evaluations': int(position.size),
+                'failures': int(np.count_nonzero(~self.converged[:, columns])),
+            }
+            for key, errors in (('position', position), ('rotation', rotation)):
+                finite = errors[np.isfinite(errors)].astype(float)
+                if len(finite) == 0:
+                    entry[key] = None
+                    continue
+                values = np.percentile(finite, percentiles)
+                entry[key] = {f'p{percentile:g}': float(value) for percentile, value in zip(percentiles, values)}
+                entry[key]['mean'] = float(np.mean(finite))
+                entry[key]['max'] = float(np.max(finite))
+            if entry['position'] is not None:
+                sample, column = np.unravel_index(np.nanargmax(position), position.shape)
+                entry['worst_sample'] = int(sample)
+                entry['worst_pose'] = [float(value) for value in self.poses[np.flatnonzero(columns)[column]]]
+            stats[name] = entry
+        return stats
+
+    def sensitivity(self):
+        """공차 항목별 영향 - 샘플의 오차 크기와 샘플별 최대 위치 오차의 상관계수, 큰 순서 [(이름, 상관계수)]
+
+        다리/조인트 항목은 샘플마다 모든 값의 RMS 를 오차 크기로 쓴다.
+        """
+        worst = np.nanmax(np.where(self.converged, self.position_error, np.nan), axis=1)
+        keep = np.isfinite(worst)
+        result = []
+        for key, values in self.perturbations.items():
+            magnitude = np.sqrt(np.mean(values.reshape(len(values), -1)**2, axis=1))
+            if np.count_nonzero(keep) < 2 or np.std(magnitude[keep]) == 0 or np.std(worst[keep]) == 0:
+                continue
+            result.append((key, float(np.corrcoef(magnitude[keep], worst[keep])[0, 1])))
+        return sorted(result, key=lambda item: -abs(item[1]))
+
+    def format_report(self, percentiles=DEFAULT_PERCENTILES):
+        """영역별 통계 표 문자열"""
+        labels = [f'p{percentile:g}' for percentile in percentiles] + ['max']
+        lines = [
+            f"샘플 {self.samples}개 x 자세 {len(self.poses)}개 (공칭 도달 불가로 제외 {self.excluded_poses}개), "
+            f"{self.elapsed:.1f}초 (프로세스 {self.workers}개, {self.evaluations_per_second:.0f} 평가/s)",
+            f"{'영역':<8}{'자세':>6}{'실패':>8}  위치 오차 mm ({' / '.join(labels)})  회전 오차 도 ({' / '.join(labels)})",
+        ]
+        for name, entry in self.region_stats(percentiles).items():
+            columns = []
+            for key in ('position', 'rotation'):
+                values = entry[key]
+                columns.append('-' if values is None else ' / '.join(f"{values[label]:.3f}" for label in labels))
+            lines.append(f"{name:<8}{entry['poses']:>6}{entry['failures']:>8}  {columns[0]}  {columns[1]}")
+        ranking = self.sensitivity()
+        if ranking:
+            lines.append("영향 (최대 위치 오차와의 상관계수): "
+                         + ', '.join(f"{key} {value:+.2f}" for key, value in ranking))
+        return '\n'.join(lines)
+
+
+def analyze_tolerances(config=None, tolerances=None, samples=2000, poses=None, regions=None,
+                       pose_spec=None, distribution='normal', seed=0, workers=None,
+                       chunk_rows=CHUNK_ROWS, tolerance=1e-6, max_iterations=20, progress=None):
+    """제작 공차 몬테카를로 분석 - ToleranceStudy 반환
+
+    poses [P,6] (위치 mm, 회전 도) 를 주지 않으면 pose_spec 으로 study_poses 를 만든다.
+    regions [P] 는 자세별 영역 이름이며 기본값은 pose_spec 작업 영역 크기 기준의 pose_regions.
+    workers (기본값: 코어 수) 가 1 보다 크고 평가가 충분히 많으면 샘플 청크를 프로세스 풀에서 계산한다.
+    progress(완료 샘플 수, 전체 샘플 수) 콜백 선택.
+    """
+    started = time.perf_counter()
+    platform = StewartPlatform(config)
+    config = platform.config
+    tolerances = DEFAULT_TOLERANCES if tolerances is None else tolerances
+    perturbations = sample_perturbations(tolerances, samples, distribution, seed)
+
+    pose_spec = dict(DEFAULT_POSE_SPEC, **(pose_spec or {}))
+    if poses is None:
+        poses = study_poses(pose_spec, seed)
+    poses = np.asarray(poses, dtype=float).reshape(-1, 6)
+    if regions is None:
+        regions = pose_regions(poses, pose_spec['translation_extent'], pose_spec['rotation_extent'])
+    regions = np.asarray(regions).astype(str).reshape(-1)
+    if len(regions) != len(poses):
+        raise ValueError("regions 와 poses 의 개수가 다릅니다")
+
+    angles, reachable = _commanded_angles(platform, poses)
+    poses, regions, angles = poses[reachable], regions[reachable], angles[reachable]
+    if len(poses) == 0:
+        raise ValueError("공칭 기체로 도달할 수 있는 평가 자세가 없습니다")
+
+    step = max(1, int(chunk_rows) // len(poses))
+    starts = list(range(0, samples, step))
+    chunks = [{key: value[start:start + step] for key, value in perturbations.items()} for start in starts]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(chunks)))
+    if samples * len(poses) < PARALLEL_THRESHOLD:
+        workers = 1
+    count = len(chunks)
+    arguments = ([config] * count, [float(platform.T0[2])] * count,
+                 [min(step, samples - start) for start in starts], chunks, [angles] * count,
+                 [poses] * count, [tolerance] * count, [max_iterations] * count)
+
+    results = []
+    if workers <= 1:
+        mapped = map(_evaluate_chunk, *arguments)
+        for result in mapped:
+            results.append(result)
+            if progress is not None:
+                progress(min(len(results) * step, samples), samples)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(_evaluate_chunk, *arguments):
+                results.append(result)
+                if progress is not None:
+                    progress(min(len(results) * step, samples), samples)
+
+    position, rotation, converged = (np.concatenate(parts) for parts in zip(*results))
+    return ToleranceStudy(poses, regions, perturbations, position, rotation, converged,
+                          excluded_poses=int(np.count_nonzero(~reachable)),
+                          elapsed=time.perf_counter() - started, workers=workers)
+
+
+def _parse_tolerance(text):
+    """'이름=값' 형식의 공차 인자 파싱"""
+    name, separator, value = text.partition('=')
+    if not separator:
+        raise argparse.ArgumentTypeError(f"공차는 이름=값 형식이어야 합니다: {text}")
+    try:
+        return name.strip(), float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"공차 값이 숫자가 아닙니다: {text}")
+
+
+def main():
+    """공차 분석을 수행하고 영역별 오차 통계 출력"""
+    parser = argparse.ArgumentParser(description="Stewart Platform 제작 공차 몬테카를로 분석")
+    parser.add_argument('--config', help="공칭 플랫폼 설정 JSON (기본값: 기본 설정)")
+    parser.add_argument('--tolerances', help="공차 명세 JSON 파일 (이름 -> ± mm, 기본값: DEFAULT_TOLERANCES)")
+    parser.add_argument('--tolerance', type=_parse_tolerance, action='append', default=[], metavar='NAME=VALUE',
+                        help="공차 항목 지정/덮어쓰기 (예: rod_length=0.3, 0 이면 제외), 여러 번 지정 가능")
+    parser.add_argument('--samples', type=int, default=2000, help="몬테카를로 샘플 수")
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='normal',
+                        help="오차 분포 (normal: 3σ = 공차, uniform: ±공차)")
+    parser.add_argument('--poses', help="평가 자세 파일 (.npy 또는 텍스트/CSV, 기본값: 작업 영역 꼭짓점 + 임의 자세)")
+    parser.add_argument('--translation-extent', type=float, default=DEFAULT_POSE_SPEC['translation_extent'],
+                        help="작업 영역 위치 범위 ± mm (영역 구분 기준)")
+    parser.add_argument('--rotation-extent', type=float, default=DEFAULT_POSE_SPEC['rotation_extent'],
+                        help="작업 영역 회전 범위 ± 도 (영역 구분 기준)")
+    parser.add_argument('--interior', type=int, default=DEFAULT_POSE_SPEC['interior'], help="내부 임의 자세 수")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본값: 코어 수)")
+    parser.add_argument('-o', '--output', help="영역별 통계 JSON 저장 경로")
+    args = parser.parse_args()
+
+    config = StewartPlatform().config
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            config = json.load(f)
+    tolerances = dict(DEFAULT_TOLERANCES)
+    if args.tolerances:
+        with open(args.tolerances, encoding='utf-8') as f:
+            tolerances = json.load(f)
+    for name, value in args.tolerance:
+        tolerances[name] = value
+    tolerances = {name: value for name, value in tolerances.items() if value != 0}
+
+    def progress(done, total):
+        print(f"\r샘플 {done}/{total}", end='', flush=True)
+
+    pose_spec = {'translation_extent': args.translation_extent, 'rotation_extent': args.rotation_extent,
+                 'interior': args.interior}
+    try:
+        poses = load_pose_file(args.poses) if args.poses else None
+        study = analyze_tolerances(config, tolerances, samples=args.samples, poses=poses, pose_spec=pose_spec,
+                                   distribution=args.distribution, seed=args.seed, workers=args.workers,
+                                   progress=progress)
+    except ValueError as e:
+        parser.exit(1, f"\n오류: {e}\n")
+    print()
+    print(study.format_report())
+
+    if args.output:
+        report = {
+            'samples': study.samples,
+            'poses': len(study.poses),
+            'excluded_poses': study.excluded_poses,
+            'distribution': args.distribution,
+            'tolerances': tolerances,
+            'regions': study.region_stats(),
+            'sensitivity': study.sensitivity(),
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"통계 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""스트리밍 궤적 생성기
+
+시간이 지정된 키프레임(위치 + Quaternion) 사이를 보간 프로파일과 SLERP 로 보간하고,
+고정 제어 주기마다 6개 서보 각도 프레임을 제너레이터로 하나씩 내보낸다.
+역기구학은 청크 단위 배치로 계산하므로 전체 동작을 미리 메모리에 올리지 않는다.
+"""
+import math
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from .collision import CollisionChecker
+from .retiming import retime_path
+from .rotation import slerp_quaternion_arrays
+
+# 제너레이터가 내보내는 서보 프레임 - servo_angles [6] (도, 계산 불가 시 NaN), valid [6],
+# deadline 은 내보내야 하는 시각 (time.perf_counter 기준 초), lateness 는 실제로 내보낸 시각과의 차이 (초).
+# deadline/lateness 는 realtime=True 일 때만 채워지고 아니면 None.
+TrajectoryFrame = namedtuple('TrajectoryFrame', ['index', 'time', 'servo_angles', 'valid', 'deadline', 'lateness'],
+                             defaults=(None, None))
+
+
+def _linear(u):
+    return u
+
+
+def _cubic(u):
+    # 양 끝 속도 0 인 3차 프로파일
+    return u * u * (3 - 2 * u)
+
+
+def _minimum_jerk(u):
+    # 양 끝 속도/가속도 0 인 최소 저크 프로파일
+    return u**3 * (10 - 15 * u + 6 * u * u)
+
+
+PROFILES = {
+    'linear': _linear,
+    'cubic': _cubic,
+    'minimum_jerk': _minimum_jerk,
+}
+
+
+class Keyframe:
+    """궤적 키프레임 - 시간(초), 위치(mm), 방향(Quaternion)"""
+    def __init__(self, time, translation, orientation):
+        self.time = float(time)
+        self.translation = [float(value) for value in translation]
+        self.orientation = orientation
+
+
+class TrajectoryGenerator:
+    """키프레임 궤적을 고정 주기 서보 프레임으로 변환하는 스트리밍 생성기"""
+    def __init__(self, platform, keyframes, rate=200.0, profile='minimum_jerk',
+                 chunk_size=256, realtime=False):
+        if len(keyframes) < 2:
+            raise ValueError("키프레임이 2개 이상 필요합니다")
+        if profile not in PROFILES:
+            raise ValueError(f"지원하지 않는 프로파일입니다: {profile}")
+        if rate <= 0:
+            raise ValueError("제어 주기는 0보다 커야 합니다")
+
+        keyframes = sorted(keyframes, key=lambda keyframe: keyframe.time)
+        times = np.array([keyframe.time for keyframe in keyframes])
+        if np.any(np.diff(times) <= 0):
+            raise ValueError("키프레임 시간이 중복되었습니다")
+
+        self.platform = platform
+        self.rate = float(rate)
+        self.period = 1.0 / self.rate
+        self.profile = profile
+        self.chunk_size = int(chunk_size)
+        self.realtime = realtime
+
+        self._times = times
+        self._translations = np.array([keyframe.translation for keyframe in keyframes])
+        quaternions = np.array([
+            [q.w, q.x, q.y, q.z] for q in (keyframe.orientation for keyframe in keyframes)
+        ])
+        self._quaternions = quaternions / np.linalg.norm(quaternions, axis=1, keepdims=True)
+        self.stats = {}
+
+    @property
+    def start_time(self):
+        return float(self._times[0])
+
+    @property
+    def duration(self):
+        return float(self._times[-1] - self._times[0])
+
+    @property
+    def frame_count(self):
+        return int(math.floor(self.duration * self.rate + 1e-9)) + 1
+
+    def sample(self, times):
+        """시각 [M] 에서의 자세 - (translations [M,3], quaternions [M,4]) 반환"""
+        times = np.clip(np.asarray(times, dtype=float), self._times[0], self._times[-1])
+        segment = np.clip(np.searchsorted(self._times, times, side='right') - 1, 0, len(self._times) - 2)
+        t0 = self._times[segment]
+        t1 = self._times[segment + 1]
+        eased = PROFILES[self.profile]((times - t0) / (t1 - t0))
+
+        translations = (self._translations[segment]
+                        + eased[:, None] * (self._translations[segment + 1] - self._translations[segment]))
+        quaternions = slerp_quaternion_arrays(self._quaternions[segment], self._quaternions[segment + 1], eased)
+        return translations, quaternions
+
+    def conditioning(self, times=None):
+        """시각 [M] (기본값: 모든 프레임 시각) 에서의 특이 자세 지표
+
+        StewartPlatform.calculate_conditioning_batch 의 결과에 'times' 를 추가한 딕셔너리 반환.
+        궤적을 보내기 전에 조건수가 큰 구간이 있는지 확인하는 데 사용한다.
+        """
+        if times is None:
+            times = self.start_time + np.arange(self.frame_count) * self.period
+        times = np.asarray(times, dtype=float)
+        translations, quaternions = self.sample(times)
+        result = self.platform.calculate_conditioning_batch(translations, quaternions)
+        result['times'] = times
+        return result
+
+    def collisions(self, times=None, checker=None):
+        """시각 [M] (기본값: 모든 프레임 시각) 에서의 다리 간섭/판 충돌 검사
+
+        collision.CollisionChecker.check_batch 의 결과에 'times' 를 추가한 딕셔너리 반환.
+        checker 를 주지 않으면 기본 캡슐 반지름과 여유 간격으로 검사한다.
+        """
+        if checker is None:
+            checker = CollisionChecker(self.platform)
+        if times is None:
+            times = self.start_time + np.arange(self.frame_count) * self.period
+        times = np.asarray(times, dtype=float)
+        translations, quaternions = self.sample(times)
+        result = checker.check_batch(translations, quaternions)
+        result['times'] = times
+        return result
+
+    def retime(self, max_velocity, max_acceleration, **options):
+        """모든 프레임 시각의 자세를 서보 속도/가속도 한계에 맞게 시간 재배치
+
+        retiming.retime_path 의 결과 딕셔너리 반환 (times 는 0 부터의 새 시각).
+        고정 주기 프레임이 필요하면 retiming.resample(result['times'], result['servo_angles'], rate) 을 사용한다.
+        """
+        times = self.start_time + np.arange(self.frame_count) * self.period
+        translations, quaternions = self.sample(times)
+        return retime_path(self.platform, translations, quaternions, max_velocity, max_acceleration, **options)
+
+    def _wait_until(self, deadline):
+        """deadline(perf_counter 기준)까지 대기 - 마지막 1ms 는 바쁜 대기로 정확도 확보"""
+        remaining = deadline - time.perf_counter()
+        if remaining > 0.002:
+            time.sleep(remaining - 0.001)
+        while time.perf_counter() < deadline:
+            pass
+
+    def frames(self):
+        """서보 프레임 제너레이터
+
+        realtime=True 이면 각 프레임을 시작 시각 + index * period 에 맞추어 내보내며
+        프레임마다 마감 시각 (deadline) 과 지연 (lateness) 을 담고, stats 에는 이 값들의 누적 통계
+        (지연 합/최대, 늦은 프레임 수, 프레임 간격 합/제곱합) 를 기록한다.
+        """
+        total = self.frame_count
+        self.stats = {
+            'frames': 0,
+            'chunks': 0,
+            'compute_time': 0.0,
+            'late_frames': 0,
+            'max_lateness': 0.0,
+            'lateness_sum': 0.0,
+            'interval_sum': 0.0,
+            'interval_sq_sum': 0.0,
+        }
+        started_at = time.perf_counter()
+        previous = None
+
+        for chunk_start in range(0, total, self.chunk_size):
+            # 청크 단위 배치 역기구학
+            compute_start = time.perf_counter()
+            index = np.arange(chunk_start, min(chunk_start + self.chunk_size, total))
+            times = self.start_time + index * self.period
+            translations, quaternions = self.sample(times)
+            servo_angles, valid = self.platform.calculate_inverse_kinematics_batch(translations, quaternions)
+            self.stats['compute_time'] += time.perf_counter() - compute_start
+            self.stats['chunks'] += 1
+
+            for row, frame_index in enumerate(index.tolist()):
+                deadline = lateness = None
+                if self.realtime:
+                    deadline = started_at + frame_index * self.period
+                    self._wait_until(deadline)
+                    lateness = time.perf_counter() - deadline
+
+                frame = TrajectoryFrame(frame_index, float(times[row]), servo_angles[row], valid[row],
+                                        deadline, lateness)
+                self._record_frame(frame, previous)
+                previous = frame
+                yield frame
+
+    def _record_frame(self, frame, previous):
+        """프레임의 마감 시각/지연을 stats 누적 통계에 반영 (previous 는 직전 프레임)"""
+        self.stats['frames'] += 1
+        if frame.lateness is None:
+            return
+        self.stats['lateness_sum'] += frame.lateness
+        self.stats['max_lateness'] = max(self.stats['max_lateness'], frame.lateness)
+        if frame.lateness > self.period:
+            self.stats['late_frames'] += 1
+        if previous is not None and previous.lateness is not None:
+            # 실제로 내보낸 시각 = 마감 시각 + 지연
+            interval = (frame.deadline + frame.lateness) - (previous.deadline + previous.lateness)
+            self.stats['interval_sum'] += interval
+            self.stats['interval_sq_sum'] += interval * interval
+
+    def summary(self):
+        """마지막 실행의 통계 요약 (ms 단위)"""
+        frames = self.stats.get('frames', 0)
+        if frames == 0:
+            return {'frames': 0}
+
+        summary = {
+            'frames': frames,
+            'rate_hz': self.rate,
+            'compute_ms_per_frame': self.stats['compute_time'] * 1000 / frames,
+            # 1보다 크면 계산이 제어 주기보다 빠름
+            'realtime_factor': self.period * frames / max(self.stats['compute_time'], 1e-12),
+        }
+        if self.realtime:
+            intervals = frames - 1
+            mean_interval = self.stats['interval_sum'] / intervals if intervals else self.period
+            variance = self.stats['interval_sq_sum'] / intervals - mean_interval**2 if intervals else 0.0
+            summary.update({
+                'mean_lateness_ms': self.stats['lateness_sum'] * 1000 / frames,
+                'max_lateness_ms': self.stats['max_lateness'] * 1000,
+                'late_frames': self.stats['late_frames'],
+                'jitter_ms': math.sqrt(max(variance, 0.0)) * 1000,
+                'mean_period_ms': mean_interval * 1000,
+            })
+        return summary
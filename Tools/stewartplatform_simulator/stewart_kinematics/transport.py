@@ -0,0 +1,327 @@
+"""서보 명령 전송 계층
+
+6개 서보 목표 각도를 틱마다 하나의 싱크 쓰기(sync-write) 패킷으로 묶어
+시리얼 형태의 포트(write() 메서드를 가진 객체, 예: pyserial Serial)로 보낸다.
+전송은 asyncio 큐를 통해 이루어지며 큐가 가득 찼을 때의 프레임 버림 정책을 선택할 수 있다.
+
+패킷 형식 (리틀 엔디언, 23바이트):
+
+    offset  크기  필드
+    0       2     매직 b'SP'
+    2       1     패킷 종류 (0x01 = SYNC_WRITE)
+    3       2     시퀀스 번호 (uint16, 순환)
+    5       4     명령 시각 (uint32, 큐에 들어간 monotonic 마이크로초 하위 32비트)
+    9       12    서보 1~6 목표 각도 (int16, 0.01도 단위, -32768 = 현재 위치 유지)
+    21      2     CRC-16/CCITT (앞의 21바이트)
+"""
+import argparse
+import asyncio
+import binascii
+import os
+import struct
+import time
+from collections import deque
+
+import numpy as np
+
+PACKET_MAGIC = b'SP'
+PACKET_SYNC_WRITE = 0x01
+ANGLE_SCALE = 100  # 0.01도 단위
+HOLD_POSITION = -32768  # 계산 불가능한 각도 - 서보는 현재 위치 유지
+
+_BODY = struct.Struct('<2sBHI6h')
+_CRC = struct.Struct('<H')
+PACKET_SIZE = _BODY.size + _CRC.size
+
+DROP_POLICIES = ('drop_oldest', 'drop_newest', 'block')
+
+
+def timestamp_us():
+    """송신 시각 필드용 monotonic 마이크로초 (하위 32비트)"""
+    return (time.monotonic_ns() // 1000) & 0xFFFFFFFF
+
+
+def elapsed_us(stamp):
+    """송신 시각 필드로부터 경과 시간 (마이크로초, 32비트 순환 고려)"""
+    return (timestamp_us() - stamp) & 0xFFFFFFFF
+
+
+def pack_frame(seq, servo_angles, stamp=None):
+    """6개 서보 각도(도, None/NaN 은 위치 유지)를 SYNC_WRITE 패킷으로 변환"""
+    angles = np.array([np.nan if angle is None else angle for angle in servo_angles], dtype=float)
+    if angles.shape != (6,):
+        raise ValueError("서보 각도는 6개여야 합니다")
+    scaled = np.round(np.nan_to_num(angles, nan=0.0) * ANGLE_SCALE)
+    values = np.where(np.isfinite(angles), np.clip(scaled, HOLD_POSITION + 1, 32767), HOLD_POSITION)
+    body = _BODY.pack(PACKET_MAGIC, PACKET_SYNC_WRITE, seq & 0xFFFF,
+                      timestamp_us() if stamp is None else stamp, *values.astype(int).tolist())
+    return body + _CRC.pack(binascii.crc_hqx(body, 0xFFFF))
+
+
+def unpack_frame(packet):
+    """SYNC_WRITE 패킷을 (seq, stamp, servo_angles [6] 도, 위치 유지는 NaN) 로 변환"""
+    if len(packet) != PACKET_SIZE:
+        raise ValueError(f"패킷 길이가 올바르지 않습니다: {len(packet)}")
+    body = packet[:_BODY.size]
+    if _CRC.unpack(packet[_BODY.size:])[0] != binascii.crc_hqx(body, 0xFFFF):
+        raise ValueError("CRC 가 일치하지 않습니다")
+    magic, kind, seq, stamp, *values = _BODY.unpack(body)
+    if magic != PACKET_MAGIC or kind != PACKET_SYNC_WRITE:
+        raise ValueError("SYNC_WRITE 패킷이 아닙니다")
+    values = np.array(values, dtype=float)
+    return seq, stamp, np.where(values == HOLD_POSITION, np.nan, values / ANGLE_SCALE)
+
+
+class FrameDecoder:
+    """바이트 스트림에서 패킷을 찾아 해석 - 깨진 바이트는 건너뛰고 다음 매직부터 다시 동기화"""
+    def __init__(self):
+        self._buffer = bytearray()
+        self.errors = 0
+
+    def feed(self, data):
+        """수신한 바이트를 추가하고 완성된 프레임 목록 반환"""
+        self._buffer += data
+        frames = []
+        while True:
+            start = self._buffer.find(PACKET_MAGIC)
+            if start < 0:
+                # 매직의 첫 바이트가 끝에 걸쳐 있을 수 있으므로 마지막 1바이트는 남김
+                del self._buffer[:max(len(self._buffer) - 1, 0)]
+                return frames
+            if len(self._buffer) - start < PACKET_SIZE:
+                del self._buffer[:start]
+                return frames
+            try:
+                frames.append(unpack_frame(bytes(self._buffer[start:start + PACKET_SIZE])))
+                del self._buffer[:start + PACKET_SIZE]
+            except ValueError:
+                self.errors += 1
+                del self._buffer[:start + 1]
+
+
+class PtyLoopback:
+    """하드웨어 없이 시험하기 위한 의사 터미널 루프백 - writer 에 쓴 바이트를 reader_fd 로 읽음"""
+    def __init__(self):
+        # tty 는 termios 를 필요로 하므로 (POSIX 전용) 루프백을 쓸 때만 import
+        import tty
+
+        self._master_fd, self.reader_fd = os.openpty()
+        # 줄 단위 버퍼링과 문자 변환이 없도록 raw 모드 설정
+        tty.setraw(self.reader_fd)
+        os.set_blocking(self.reader_fd, False)
+
+    def write(self, data):
+        """포트 쓰기 (pyserial Serial.write 와 같은 형태)"""
+        view = memoryview(data)
+        while view:
+            written = os.write(self._master_fd, view)
+            view = view[written:]
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def read_available(self):
+        """수신 측에서 현재 읽을 수 있는 바이트"""
+        try:
+            return os.read(self.reader_fd, 65536)
+        except BlockingIOError:
+            return b''
+
+    def close(self):
+        os.close(self._master_fd)
+        os.close(self.reader_fd)
+
+
+class ServoTransport:
+    """asyncio 큐 기반 서보 명령 전송기
+
+    drop_policy:
+        'drop_oldest' - 큐가 가득 차면 가장 오래된 프레임을 버리고 새 프레임을 넣음 (기본값)
+        'drop_newest' - 큐가 가득 차면 새 프레임을 버림
+        'block'       - send() 가 자리가 날 때까지 기다림 (역압, submit() 은 쓸 수 없음)
+    tick_rate 가 주어지면 틱 경계에서만, 틱마다 큐에 쌓인 프레임 중 가장 최근 것 하나를 보낸다
+    (큐가 빈 틱은 건너뛴다).
+    포트 쓰기 실패는 송신 작업을 멈추지 않고 stats['errors'] 와 last_error 에 기록된다.
+    """
+    def __init__(self, port, queue_size=4, drop_policy='drop_oldest', tick_rate=None):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"지원하지 않는 버림 정책입니다: {drop_policy}")
+        self.port = port
+        self.queue_size = queue_size
+        self.drop_policy = drop_policy
+        self.tick_rate = tick_rate
+        self._queue = None
+        self._task = None
+        self._seq = 0
+        self.latencies = deque(maxlen=10000)  # 큐 입력 ~ 포트 쓰기 완료 (초)
+        self.stats = {'submitted': 0, 'sent': 0, 'dropped': 0, 'coalesced': 0, 'bytes': 0, 'errors': 0}
+        self.last_error = None  # 마지막 패킷 생성/포트 쓰기 예외
+        self._started_at = None
+
+    async def start(self):
+        """송신 작업 시작"""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._started_at = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._sender())
+
+    async def stop(self, drain=True):
+        """송신 작업 종료 - drain=True 이면 큐에 남은 프레임을 모두 보낸 뒤 종료
+
+        송신 작업이 예외로 끝났다면 큐를 기다리지 않고 그 예외를 다시 발생시킨다.
+        """
+        if self._task is None:
+            return
+        if drain:
+            join = asyncio.ensure_future(self._queue.join())
+            await asyncio.wait({join, self._task}, return_when=asyncio.FIRST_COMPLETED)
+            join.cancel()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._task = None
+
+    def submit(self, servo_angles):
+        """프레임을 기다리지 않고 큐에 넣음 - 버림 정책에 따라 처리하고 큐에 들어갔는지 반환
+
+        'block' 정책은 기다려야 하므로 submit() 대신 send() 를 사용해야 한다 (ValueError).
+        """
+        if self.drop_policy == 'block':
+            raise ValueError("'block' 정책에서는 submit() 대신 await send() 를 사용하세요")
+        self.stats['submitted'] += 1
+        item = (time.perf_counter(), timestamp_us(), servo_angles)
+        if self._queue.full():
+            if self.drop_policy == 'drop_newest':
+                self.stats['dropped'] += 1
+                return False
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.stats['dropped'] += 1
+        self._queue.put_nowait(item)
+        return True
+
+    async def send(self, servo_angles):
+        """프레임 전송 요청 - 'block' 정책이면 큐에 자리가 날 때까지 기다림"""
+        if self.drop_policy != 'block':
+            return self.submit(servo_angles)
+        self.stats['submitted'] += 1
+        await self._queue.put((time.perf_counter(), timestamp_us(), servo_angles))
+        return True
+
+    async def _next_item(self):
+        """다음에 보낼 프레임 - 틱 모드에서는 틱 경계까지 기다린 뒤 가장 최근 프레임만 선택
+
+        틱 경계에서 큐가 비어 있으면 그 틱은 건너뛰고 다음 경계까지 기다린다
+        (프레임이 도착하자마자 틱 사이에 나가지 않도록).
+        """
+        if self.tick_rate is None:
+            return await self._queue.get()
+
+        period = 1.0 / self.tick_rate
+        while True:
+            elapsed = time.perf_counter() - self._started_at
+            await asyncio.sleep(period - elapsed % period)
+            if not self._queue.empty():
+                break
+        item = self._queue.get_nowait()
+        while not self._queue.empty():
+            self._queue.task_done()
+            item = self._queue.get_nowait()
+            self.stats['coalesced'] += 1
+        return item
+
+    async def _sender(self):
+        """큐에서 프레임을 꺼내 패킷으로 묶어 포트에 씀"""
+        loop = asyncio.get_running_loop()
+        while True:
+            queued_at, stamp, servo_angles = await self._next_item()
+            try:
+                packet = pack_frame(self._seq, servo_angles, stamp)
+                self._seq = (self._seq + 1) & 0xFFFF
+                # 블로킹 포트 쓰기가 이벤트 루프를 막지 않도록 실행기에서 수행
+                await loop.run_in_executor(None, self.port.write, packet)
+                self.stats['sent'] += 1
+                self.stats['bytes'] += len(packet)
+                self.latencies.append(time.perf_counter() - queued_at)
+            except Exception as e:
+                # 한 프레임의 실패로 송신 작업이 끝나면 stop(drain=True) 가 영원히 기다리게 됨
+                self.stats['errors'] += 1
+                self.last_error = e
+            finally:
+                self._queue.task_done()
+
+    def summary(self):
+        """전송 통계 - 지연 시간(ms) 백분위와 초당 프레임 수"""
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        latencies = np.array(self.latencies) * 1000
+        summary = dict(self.stats)
+        summary['frames_per_sec'] = self.stats['sent'] / elapsed if elapsed > 0 else 0.0
+        if len(latencies):
+            summary['latency_p50_ms'] = float(np.percentile(latencies, 50))
+            summary['latency_p99_ms'] = float(np.percentile(latencies, 99))
+            summary['latency_max_ms'] = float(np.max(latencies))
+        return summary
+
+
+async def run_loopback_benchmark(frames=2000, rate=None, queue_size=4, drop_policy='block'):
+    """의사 터미널 루프백으로 명령 ~ 수신 지연 시간과 처리량 측정"""
+    loopback = PtyLoopback()
+    transport = ServoTransport(loopback, queue_size=queue_size, drop_policy=drop_policy)
+    decoder = FrameDecoder()
+    received = []
+    end_to_end = []
+    loop = asyncio.get_running_loop()
+
+    def on_readable():
+        for seq, stamp, _ in decoder.feed(loopback.read_available()):
+            received.append(seq)
+            end_to_end.append(elapsed_us(stamp) / 1000.0)
+
+    loop.add_reader(loopback.reader_fd, on_readable)
+    await transport.start()
+    started_at = time.perf_counter()
+    try:
+        angles = np.zeros(6)
+        for index in range(frames):
+            angles[:] = 10.0 * np.sin(index * 0.01 + np.arange(6))
+            await transport.send(angles.copy())
+            if rate is not None:
+                await asyncio.sleep(max(started_at + (index + 1) / rate - time.perf_counter(), 0.0))
+        await transport.stop(drain=True)
+        # 마지막 패킷이 수신될 때까지 잠시 대기
+        deadline = time.perf_counter() + 1.0
+        while len(received) < transport.stats['sent'] and time.perf_counter() < deadline:
+            await asyncio.sleep(0.001)
+    finally:
+        loop.remove_reader(loopback.reader_fd)
+        loopback.close()
+
+    elapsed = time.perf_counter() - started_at
+    result = transport.summary()
+    result['received'] = len(received)
+    result['decode_errors'] = decoder.errors
+    result['receive_frames_per_sec'] = len(received) / elapsed if elapsed > 0 else 0.0
+    if end_to_end:
+        result['end_to_end_p50_ms'] = float(np.percentile(end_to_end, 50))
+        result['end_to_end_p99_ms'] = float(np.percentile(end_to_end, 99))
+    return result
+
+
+def main():
+    """루프백 전송 성능 측정"""
+    parser = argparse.ArgumentParser(description="서보 명령 전송 루프백 측정")
+    parser.add_argument('--frames', type=int, default=2000, help="보낼 프레임 수")
+    parser.add_argument('--rate', type=float, default=None, help="송신 주기 (Hz, 기본값: 최대 속도)")
+    parser.add_argument('--policy', choices=DROP_POLICIES, default='block', help="큐 버림 정책")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_loopback_benchmark(args.frames, args.rate, drop_policy=args.policy))
+    for key, value in result.items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""샘플링 기반 도달 가능 작업 공간 계산
+
+배치 역기구학으로 6자유도 공간의 단면(위치 단면, 회전 단면)과 각 축 방향 직선을
+샘플링하여 점유 격자와 경계를 만들고, 결과를 config 해시별로 디스크에 캐시한다.
+"""
+import argparse
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .kinematics import DEFAULT_CACHE_DIR, StewartPlatform, config_hash
+from .pose_table import POSE_AXES, poses_to_ik_inputs
+
+DEFAULT_WORKSPACE_DIR = os.path.join(DEFAULT_CACHE_DIR, 'workspace')
+
+WORKSPACE_FORMAT_VERSION = 1
+
+# 단면 정의: 이름 -> 샘플링할 축 목록 (나머지 축은 0으로 고정)
+SLICES = {
+    'translation': ('x', 'y', 'z'),
+    'rotation': ('roll', 'pitch', 'yaw'),
+}
+
+# 기본 샘플링 범위 - 위치 mm, 회전 도
+DEFAULT_SPEC = {
+    'translation_extent': 90.0,
+    'rotation_extent': 90.0,
+    'grid_points': 61,
+    'line_step': 0.1,
+}
+
+# 이 개수보다 적은 샘플은 프로세스 풀 없이 계산 (프로세스 시작 비용이 더 큼)
+PARALLEL_THRESHOLD = 200000
+
+
+def _evaluate_chunk(config, poses):
+    """자세 청크의 도달 가능 여부 계산 (프로세스 풀 작업 함수)"""
+    platform = StewartPlatform(config)
+    translations, quaternions = poses_to_ik_inputs(poses)
+    _, valid = platform.calculate_inverse_kinematics_batch(translations, quaternions)
+    return np.all(valid, axis=1)
+
+
+def evaluate_poses(config, poses, workers=None, chunk_size=65536):
+    """[N,6] 자세 (x, y, z, roll, pitch, yaw[도]) 의 도달 가능 여부 [N] 계산
+
+    샘플이 많으면 모든 코어에 청크를 나누어 프로세스 풀에서 계산한다.
+    """
+    poses = np.asarray(poses, dtype=float).reshape(-1, 6)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = [poses[start:start + chunk_size] for start in range(0, len(poses), chunk_size)]
+
+    if workers <= 1 or len(poses) < PARALLEL_THRESHOLD:
+        results = [_evaluate_chunk(config, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_evaluate_chunk, [config] * len(chunks), chunks))
+
+    return np.concatenate(results) if results else np.zeros(0, dtype=bool)
+
+
+def _slice_poses(axes, values):
+    """단면 축들의 격자 자세 [M,6] 생성"""
+    mesh = np.meshgrid(*([values] * len(axes)), indexing='ij')
+    poses = np.zeros((mesh[0].size, 6))
+    for axis, grid in zip(axes, mesh):
+        poses[:, POSE_AXES.index(axis)] = grid.ravel()
+    return poses
+
+
+def _contiguous_range(values, reachable):
+    """0을 포함하는 연속 도달 구간 (최소, 최대) - 0이 도달 불가능하면 (0, 0)"""
+    center = int(np.argmin(np.abs(values)))
+    if not reachable[center]:
+        return (0.0, 0.0)
+    blocked = np.flatnonzero(~reachable)
+    lower = blocked[blocked < center]
+    upper = blocked[blocked > center]
+    low = lower[-1] + 1 if len(lower) else 0
+    high = upper[0] - 1 if len(upper) else len(values) - 1
+    return (round(float(values[low]), 6), round(float(values[high]), 6))
+
+
+class WorkspaceMap:
+    """작업 공간 샘플링 결과 - 단면 점유 격자와 축 방향 도달 범위"""
+    def __init__(self, config, spec, grids, axis_ranges):
+        self.config = config
+        self.spec = spec
+        self.grids = grids
+        self.axis_ranges = axis_ranges
+
+    def slice_values(self, name):
+        """단면 격자의 축 좌표값"""
+        extent = self.spec['translation_extent' if name == 'translation' else 'rotation_extent']
+        return np.linspace(-extent, extent, int(self.spec['grid_points']))
+
+    def boundary(self, name):
+        """단면 점유 격자의 경계 - 이웃 중 도달 불가능한 셀이 있는 도달 가능 셀"""
+        occupied = self.grids[name]
+        padded = np.pad(occupied, 1, constant_values=False)
+        interior = np.ones_like(occupied)
+        for axis in range(occupied.ndim):
+            for shift in (-1, 1):
+                neighbor = np.roll(padded, shift, axis=axis)
+                interior &= neighbor[(slice(1, -1),) * occupied.ndim]
+        return occupied & ~interior
+
+    def volume(self, name='translation'):
+        """단면에서 도달 가능한 부피 (mm^3 또는 도^3)"""
+        step = np.diff(self.slice_values(name)[:2])[0]
+        return float(np.count_nonzero(self.grids[name]) * step**self.grids[name].ndim)
+
+    def limits(self):
+        """calculate_workspace_limits 와 같은 형식의 축별 한계"""
+        rotation_limit = float(self.config.get('rotation_limit', self.spec['rotation_extent']))
+        rotation_ranges = [self.axis_ranges[axis] for axis in ('roll', 'pitch', 'yaw')]
+        rotation_min = max(-rotation_limit, max(low for low, _ in rotation_ranges))
+        rotation_max = min(rotation_limit, min(high for _, high in rotation_ranges))
+
+        limits = {
+            'x_range': self.axis_ranges['x'],
+            'y_range': self.axis_ranges['y'],
+            'z_range': self.axis_ranges['z'],
+            'rotation_range': (rotation_min, rotation_max),
+        }
+        for axis in ('roll', 'pitch', 'yaw'):
+            limits[f'{axis}_range'] = self.axis_ranges[axis]
+        return limits
+
+    def save(self, path):
+        """npz 파일로 저장 (임시 파일에 쓴 뒤 교체)
+
+        임시 파일 이름은 호출마다 달라서 같은 config 를 동시에 계산한 여러 프로세스가 서로의 파일을 덮어쓰지 않는다.
+        """
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        arrays = {f'grid_{name}': grid for name, grid in self.grids.items()}
+        arrays['axis_ranges'] = np.array([self.axis_ranges[axis] for axis in POSE_AXES])
+        arrays['spec'] = np.array([self.spec[key] for key in sorted(DEFAULT_SPEC)])
+        arrays['version'] = np.array(WORKSPACE_FORMAT_VERSION)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path, config, spec):
+        """저장된 결과 불러오기 - 형식이나 샘플링 설정이 다르면 None"""
+        with np.load(path) as data:
+            if int(data['version']) != WORKSPACE_FORMAT_VERSION:
+                return None
+            if not np.allclose(data['spec'], [spec[key] for key in sorted(DEFAULT_SPEC)]):
+                return None
+            grids = {name: data[f'grid_{name}'] for name in SLICES}
+            axis_ranges = {axis: tuple(float(v) for v in data['axis_ranges'][i])
+                           for i, axis in enumerate(POSE_AXES)}
+        return cls(config, spec, grids, axis_ranges)
+
+
+def compute_workspace(config, spec=None, workers=None):
+    """작업 공간 샘플링 - 단면 점유 격자와 축 방향 도달 범위 계산"""
+    spec = dict(DEFAULT_SPEC, **(spec or {}))
+    points = int(spec['grid_points'])
+
+    # 단면 격자와 축 방향 직선을 한 번의 배치로 묶어 계산
+    batches = []
+    for name, axes in SLICES.items():
+        extent = spec['translation_extent' if name == 'translation' else 'rotation_extent']
+        batches.append(_slice_poses(axes, np.linspace(-extent, extent, points)))
+
+    line_values = {}
+    for axis in POSE_AXES:
+        extent = spec['translation_extent' if axis in SLICES['translation'] else 'rotation_extent']
+        count = int(round(2 * extent / spec['line_step'])) + 1
+        line_values[axis] = np.linspace(-extent, extent, count)
+        line = np.zeros((count, 6))
+        line[:, POSE_AXES.index(axis)] = line_values[axis]
+        batches.append(line)
+
+    reachable = evaluate_poses(config, np.concatenate(batches), workers)
+
+    grids = {}
+    offset = 0
+    for name, axes in SLICES.items():
+        size = points**len(axes)
+        grids[name] = reachable[offset:offset + size].reshape((points,) * len(axes))
+        offset += size
+
+    axis_ranges = {}
+    for axis in POSE_AXES:
+        size = len(line_values[axis])
+        axis_ranges[axis] = _contiguous_range(line_values[axis], reachable[offset:offset + size])
+        offset += size
+
+    return WorkspaceMap(config, spec, grids, axis_ranges)
+
+
+def get_workspace(platform, spec=None, cache_dir=DEFAULT_WORKSPACE_DIR, workers=None):
+    """플랫폼의 작업 공간 반환 - 인스턴스와 디스크 캐시를 사용하며 기하 정보가 바뀔 때만 다시 계산"""
+    spec = dict(DEFAULT_SPEC, **(spec or {}))
+    key = config_hash(platform.config)
+
+    cached = platform._workspace_cache
+    if cached is not None and cached[0] == key and cached[1].spec == spec:
+        return cached[1]
+
+    path = os.path.join(cache_dir, f'{key}.npz')
+    workspace = None
+    if os.path.exists(path):
+        try:
+            workspace = WorkspaceMap.load(path, platform.config, spec)
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+            # 손상된 캐시 (잘린 파일 등) 는 무시하고 다시 계산
+            workspace = None
+
+    if workspace is None:
+        workspace = compute_workspace(platform.config, spec, workers)
+        try:
+            workspace.save(path)
+        except OSError:
+            pass  # 캐시 저장 실패는 계산 결과에 영향을 주지 않음
+
+    platform._workspace_cache = (key, workspace)
+    return workspace
+
+
+def main():
+    """기본 설정의 작업 공간 계산 및 출력"""
+    parser = argparse.ArgumentParser(description="Stewart Platform 작업 공간 계산")
+    parser.add_argument('--cache-dir', default=DEFAULT_WORKSPACE_DIR, help="캐시 디렉터리")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본값: 코어 수)")
+    args = parser.parse_args()
+
+    platform = StewartPlatform()
+    workspace = get_workspace(platform, cache_dir=args.cache_dir, workers=args.workers)
+    for key, (low, high) in workspace.limits().items():
+        print(f"{key}: {low:.1f} ~ {high:.1f}")
+    print(f"위치 단면 도달 부피: {workspace.volume('translation') / 1000:.1f} cm^3")
+
+
+if __name__ == "__main__":
+    main()
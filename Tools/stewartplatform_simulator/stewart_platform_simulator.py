@@ -1,413 +1,25 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import math
-import numpy as np
-from typing import List, Tuple
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from mpl_toolkits.mplot3d import Axes3D
-import matplotlib.animation as animation
+import time
+import threading
 
-class Quaternion:
-    """쿼터니언 클래스 - 회전을 표현"""
-    def __init__(self, w=1.0, x=0.0, y=0.0, z=0.0):
-        self.w = w
-        self.x = x
-        self.y = y
-        self.z = z
-    
-    @classmethod
-    def from_euler(cls, roll, pitch, yaw):
-        """오일러 각도(RPY)로부터 쿼터니언 생성"""
-        cy = math.cos(yaw * 0.5)
-        sy = math.sin(yaw * 0.5)
-        cp = math.cos(pitch * 0.5)
-        sp = math.sin(pitch * 0.5)
-        cr = math.cos(roll * 0.5)
-        sr = math.sin(roll * 0.5)
-        
-        w = cr * cp * cy + sr * sp * sy
-        x = sr * cp * cy - cr * sp * sy
-        y = cr * sp * cy + sr * cp * sy
-        z = cr * cp * sy - sr * sp * cy
-        
-        return cls(w, x, y, z)
-    
-    def rotate_vector(self, vector):
-        """벡터를 쿼터니언으로 회전"""
-        # 쿼터니언 회전 공식: v' = q * v * q*
-        v_quat = Quaternion(0, vector[0], vector[1], vector[2])
-        q_conj = Quaternion(self.w, -self.x, -self.y, -self.z)
-        
-        result = self.multiply(v_quat).multiply(q_conj)
-        return [result.x, result.y, result.z]
-    
-    def multiply(self, other):
-        """쿼터니언 곱셈"""
-        w = self.w * other.w - self.x * other.x - self.y * other.y - self.z * other.z
-        x = self.w * other.x + self.x * other.w + self.y * other.z - self.z * other.y
-        y = self.w * other.y - self.x * other.z + self.y * other.w + self.z * other.x
-        z = self.w * other.z + self.x * other.y - self.y * other.x + self.z * other.w
-        return Quaternion(w, x, y, z)
+from stewart_kinematics import FAILURE_REASONS, CachedPose, PoseCache, Quaternion, StewartPlatform
+from stewart_kinematics.collision import CollisionChecker
+from stewart_kinematics.projection import PoseProjector
+from visualizer import StewartPlatformVisualizer
 
-class StewartPlatform:
-    """Stewart Platform 역기구학 계산 클래스"""
-    def __init__(self, config=None):
-        if config is None:
-            config = {
-                'base_radius': 80,
-                'platform_radius': 50,
-                'rod_length': 130,
-                'horn_length': 50,
-                'shaft_distance': 20,
-                'anchor_distance': 20,
-                'rotation_limit': 30.0  # 회전 한계 추가
-            }
-        
-        self.config = config
-        self.base_joints = []
-        self.platform_joints = []
-        self.sin_beta = []
-        self.cos_beta = []
-        self.T0 = [0, 0, 0]
-        self.current_translation = [0, 0, 0]
-        self.current_orientation = Quaternion()
-        self.horn_positions = []
-        
-        self._initialize_platform()
-    
-    def _initialize_platform(self):
-        """플랫폼 초기화 - 베이스와 플랫폼 조인트 위치 계산"""
-        base_radius = self.config['base_radius']
-        platform_radius = self.config['platform_radius']
-        shaft_distance = self.config['shaft_distance']
-        anchor_distance = self.config['anchor_distance']
-        
-        # 6개 다리의 베이스와 플랫폼 조인트 위치 계산
-        for i in range(6):
-            pm = (-1) ** i
-            phi_cut = (1 + i - i % 2) * math.pi / 3
-            
-            # 베이스 조인트 위치
-            phi_b = (i + i % 2) * math.pi / 3 + pm * shaft_distance / (2 * base_radius)
-            base_x = math.cos(phi_b) * base_radius
-            base_y = math.sin(phi_b) * base_radius
-            self.base_joints.append([base_x, base_y, 0])
-            
-            # 플랫폼 조인트 위치
-            phi_p = phi_cut - pm * anchor_distance / (2 * platform_radius)
-            platform_x = math.cos(phi_p) * platform_radius
-            platform_y = math.sin(phi_p) * platform_radius
-            self.platform_joints.append([platform_x, platform_y, 0])
-            
-            # 모터 회전각 (베타)
-            motor_rotation = phi_b + ((i + 0) % 2) * math.pi + math.pi / 2
-            self.sin_beta.append(math.sin(motor_rotation))
-            self.cos_beta.append(math.cos(motor_rotation))
-        
-        # 초기 높이 계산
-        self.T0[2] = math.sqrt(
-            self.config['rod_length']**2 + self.config['horn_length']**2
-            - (self.platform_joints[0][0] - self.base_joints[0][0])**2
-            - (self.platform_joints[0][1] - self.base_joints[0][1])**2
-        )
-        
-        # 호른 위치 초기화
-        self.horn_positions = [[0, 0, 0] for _ in range(6)]
-    
-    def calculate_workspace_limits(self):
-        """작업 공간의 한계 계산"""
-        try:
-            rod_length = self.config['rod_length']
-            horn_length = self.config['horn_length']
-            
-            # 기본적인 작업 공간 한계 계산
-            # 로드 길이와 호른 길이를 고려한 최대 이동 거리
-            max_extension = rod_length + horn_length
-            min_extension = abs(rod_length - horn_length)
-            
-            # 베이스와 플랫폼 반지름 차이를 고려한 XY 평면 한계
-            radius_diff = abs(self.config['base_radius'] - self.config['platform_radius'])
-            
-            # Z축 한계 (높이) - 안전장치 추가
-            z_max = self.T0[2] + max_extension
-            z_min = max(0, self.T0[2] - min_extension)  # 음수 높이 방지
-            
-            # XY 평면 한계 (반지름) - 안전장치 추가
-            xy_max = min(max_extension, self.config['base_radius'] - radius_diff)
-            xy_max = max(xy_max, 10.0)  # 최소 10mm 보장
-            
-            # 회전 한계 (도 단위)
-            rotation_max = self.config['rotation_limit']
-            
-            return {
-                'x_range': (-xy_max, xy_max),
-                'y_range': (-xy_max, xy_max),
-                'z_range': (z_min - self.T0[2], z_max - self.T0[2]),
-                'rotation_range': (-rotation_max, rotation_max)
-            }
-        except Exception as e:
-            # 오류 발생 시 기본값 반환
-            return {
-                'x_range': (-50, 50),
-                'y_range': (-50, 50),
-                'z_range': (-30, 30),
-                'rotation_range': (-30, 30)
-            }
-    
-    def calculate_inverse_kinematics(self, translation, orientation):
-        """역기구학 계산 - 위치와 방향으로부터 모터 각도 계산"""
-        horn_length = self.config['horn_length']
-        rod_length = self.config['rod_length']
-        
-        self.current_translation = translation
-        self.current_orientation = orientation
-        
-        servo_angles = []
-        
-        for i in range(6):
-            try:
-                # 플랫폼 조인트를 회전
-                rotated_platform = orientation.rotate_vector(self.platform_joints[i])
-                
-                # 플랫폼 조인트의 절대 위치
-                q_x = translation[0] + rotated_platform[0]
-                q_y = translation[1] + rotated_platform[1]
-                q_z = translation[2] + rotated_platform[2] + self.T0[2]
-                
-                # 베이스에서 플랫폼 조인트까지의 벡터
-                l_x = q_x - self.base_joints[i][0]
-                l_y = q_y - self.base_joints[i][1]
-                l_z = q_z - self.base_joints[i][2]
-                
-                # 역기구학 계산
-                gk = l_x**2 + l_y**2 + l_z**2 - rod_length**2 + horn_length**2
-                ek = 2 * horn_length * l_z
-                fk = 2 * horn_length * (self.cos_beta[i] * l_x + self.sin_beta[i] * l_y)
-                
-                sq_sum = ek**2 + fk**2
-                
-                # 안전장치: sq_sum이 0이거나 너무 작은 경우
-                if sq_sum < 1e-10:
-                    servo_angles.append(None)
-                    self.horn_positions[i] = [0, 0, 0]
-                    continue
-                
-                # 제곱근 계산 전 안전장치
-                sqrt_term = 1 - gk**2 / sq_sum
-                if sqrt_term < 0:
-                    # 물리적으로 불가능한 위치
-                    servo_angles.append(None)
-                    self.horn_positions[i] = [0, 0, 0]
-                    continue
-                
-                sqrt1 = math.sqrt(sqrt_term)
-                sqrt2 = math.sqrt(sq_sum)
-                
-                sin_alpha = (gk * ek) / sq_sum - (fk * sqrt1) / sqrt2
-                cos_alpha = (gk * fk) / sq_sum + (ek * sqrt1) / sqrt2
-                
-                # 삼각함수 값 범위 체크
-                if abs(sin_alpha) > 1.0:
-                    # 물리적으로 불가능한 각도
-                    servo_angles.append(None)
-                    self.horn_positions[i] = [0, 0, 0]
-                    continue
-                
-                # 호른 위치 계산
-                self.horn_positions[i] = [
-                    self.base_joints[i][0] + horn_length * cos_alpha * self.cos_beta[i],
-                    self.base_joints[i][1] + horn_length * cos_alpha * self.sin_beta[i],
-                    self.base_joints[i][2] + horn_length * sin_alpha
-                ]
-                
-                # 서보 각도 계산
-                servo_angle = math.asin(sin_alpha)
-                
-                # 각도 범위 체크 (-90도 ~ 90도)
-                if -math.pi/2 <= servo_angle <= math.pi/2:
-                    servo_angles.append(math.degrees(servo_angle))
-                else:
-                    servo_angles.append(None)
-                    
-            except (ValueError, ZeroDivisionError, math.DomainError) as e:
-                # 수학적 오류 발생 시
-                servo_angles.append(None)
-                self.horn_positions[i] = [0, 0, 0]
-                continue
-        
-        return servo_angles
-    
-    def get_platform_joints_world(self):
-        """현재 플랫폼 조인트의 월드 좌표 반환"""
-        world_joints = []
-        for joint in self.platform_joints:
-            rotated = self.current_orientation.rotate_vector(joint)
-            world_joint = [
-                self.current_translation[0] + rotated[0],
-                self.current_translation[1] + rotated[1],
-                self.current_translation[2] + rotated[2] + self.T0[2]
-            ]
-            world_joints.append(world_joint)
-        return world_joints
-
-class StewartPlatformVisualizer:
-    """Stewart Platform 3D 시각화 클래스"""
-    def __init__(self, platform):
-        self.platform = platform
-        self.fig = None
-        self.ax = None
-        self.canvas = None
-        
-    def create_visualization(self, parent_frame):
-        """3D 시각화 생성"""
-        # matplotlib figure 생성
-        self.fig = plt.Figure(figsize=(8, 6))
-        self.ax = self.fig.add_subplot(111, projection='3d')
-        
-        # Tkinter canvas에 matplotlib figure 임베드
-        self.canvas = FigureCanvasTkAgg(self.fig, parent_frame)
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # 초기 플롯
-        self.update_visualization()
-    
-    def update_visualization(self):
-        """시각화 업데이트"""
-        if self.ax is None:
-            return
-            
-        self.ax.clear()
-        
-        # 베이스 플레이트 그리기
-        self._draw_base_plate()
-        
-        # 플랫폼 플레이트 그리기
-        self._draw_platform_plate()
-        
-        # 다리들 그리기
-        self._draw_legs()
-        
-        # 축 그리기
-        self._draw_axes()
-        
-        # 작업 공간 한계 표시
-        self._draw_workspace_limits()
-        
-        # 그래프 설정
-        self.ax.set_xlabel('X (mm)')
-        self.ax.set_ylabel('Y (mm)')
-        self.ax.set_zlabel('Z (mm)')
-        self.ax.set_title('Stewart Platform 3D Visualization')
-        
-        # 뷰 설정
-        self.ax.view_init(elev=20, azim=45)
-        
-        # 캔버스 업데이트
-        self.canvas.draw()
-    
-    def _draw_base_plate(self):
-        """베이스 플레이트 그리기"""
-        base_radius = self.platform.config['base_radius']
-        
-        # 베이스 플레이트 원형
-        theta = np.linspace(0, 2*np.pi, 100)
-        x = base_radius * np.cos(theta)
-        y = base_radius * np.sin(theta)
-        z = np.zeros_like(theta)
-        
-        self.ax.plot(x, y, z, 'b-', linewidth=2, label='Base Plate')
-        
-        # 베이스 조인트들
-        for i, joint in enumerate(self.platform.base_joints):
-            self.ax.scatter(joint[0], joint[1], joint[2], c='blue', s=50, marker='o')
-            self.ax.text(joint[0], joint[1], joint[2], f'B{i+1}', fontsize=8)
-    
-    def _draw_platform_plate(self):
-        """플랫폼 플레이트 그리기"""
-        platform_radius = self.platform.config['platform_radius']
-        world_joints = self.platform.get_platform_joints_world()
-        
-        # 플랫폼 중심
-        center = self.platform.current_translation.copy()
-        center[2] += self.platform.T0[2]
-        
-        # 플랫폼 플레이트 원형
-        theta = np.linspace(0, 2*np.pi, 100)
-        x = platform_radius * np.cos(theta)
-        y = platform_radius * np.sin(theta)
-        z = np.zeros_like(theta)
-        
-        # 플랫폼 회전 적용
-        for i in range(len(x)):
-            point = [x[i], y[i], z[i]]
-            rotated = self.platform.current_orientation.rotate_vector(point)
-            x[i] = center[0] + rotated[0]
-            y[i] = center[1] + rotated[1]
-            z[i] = center[2] + rotated[2]
-        
-        self.ax.plot(x, y, z, 'r-', linewidth=2, label='Platform Plate')
-        
-        # 플랫폼 조인트들
-        for i, joint in enumerate(world_joints):
-            self.ax.scatter(joint[0], joint[1], joint[2], c='red', s=50, marker='o')
-            self.ax.text(joint[0], joint[1], joint[2], f'P{i+1}', fontsize=8)
-    
-    def _draw_legs(self):
-        """다리들 그리기"""
-        world_joints = self.platform.get_platform_joints_world()
-        
-        for i in range(6):
-            # 베이스 조인트에서 호른까지
-            base_joint = self.platform.base_joints[i]
-            horn_pos = self.platform.horn_positions[i]
-            
-            if horn_pos != [0, 0, 0]:  # 유효한 호른 위치인 경우
-                self.ax.plot([base_joint[0], horn_pos[0]], 
-                           [base_joint[1], horn_pos[1]], 
-                           [base_joint[2], horn_pos[2]], 'g-', linewidth=3)
-                
-                # 호른에서 플랫폼 조인트까지
-                platform_joint = world_joints[i]
-                self.ax.plot([horn_pos[0], platform_joint[0]], 
-                           [horn_pos[1], platform_joint[1]], 
-                           [horn_pos[2], platform_joint[2]], 'g-', linewidth=3)
-                
-                # 호른 위치 표시
-                self.ax.scatter(horn_pos[0], horn_pos[1], horn_pos[2], c='green', s=30, marker='s')
+class StewartPlatformGUI:
+    """Stewart Platform 제어 GUI
     
-    def _draw_axes(self):
-        """좌표축 그리기"""
-        # 원점
-        self.ax.scatter(0, 0, 0, c='black', s=100, marker='o')
-        
-        # X, Y, Z 축
-        axis_length = 100
-        self.ax.quiver(0, 0, 0, axis_length, 0, 0, color='red', arrow_length_ratio=0.1, label='X')
-        self.ax.quiver(0, 0, 0, 0, axis_length, 0, color='green', arrow_length_ratio=0.1, label='Y')
-        self.ax.quiver(0, 0, 0, 0, 0, axis_length, color='blue', arrow_length_ratio=0.1, label='Z')
-        
-        self.ax.legend()
+    슬라이더 이벤트는 대기 중인 자세만 갱신하고, 작업 스레드가 가장 최근 자세의
+    역기구학을 계산한다. Tk 루프는 after() 로 제한된 주기마다 최신 결과만 화면에 반영한다.
+    """
+    # 화면 갱신 최대 주기 (ms)
+    REFRESH_INTERVAL_MS = 33
+    # 이 조건수보다 크면 특이 자세 근처로 표시
+    NEAR_SINGULAR_CONDITION = 100.0
     
-    def _draw_workspace_limits(self):
-        """작업 공간 한계 표시"""
-        limits = self.platform.calculate_workspace_limits()
-        
-        # XY 평면에서의 작업 공간 한계 (원형)
-        xy_max = limits['x_range'][1]
-        theta = np.linspace(0, 2*np.pi, 100)
-        x = xy_max * np.cos(theta)
-        y = xy_max * np.sin(theta)
-        z_min = limits['z_range'][0] + self.platform.T0[2]
-        z_max = limits['z_range'][1] + self.platform.T0[2]
-        
-        # 하단 원
-        self.ax.plot(x, y, [z_min]*len(x), 'k--', alpha=0.3, linewidth=1, label='Workspace Limits')
-        # 상단 원
-        self.ax.plot(x, y, [z_max]*len(x), 'k--', alpha=0.3, linewidth=1)
-
-class StewartPlatformGUI:
-    """Stewart Platform 제어 GUI"""
     def __init__(self, root):
         self.root = root
         self.root.title("Stewart Platform Controller with 3D Visualization")
@@ -415,10 +27,28 @@ class StewartPlatformGUI:
         
         # Stewart Platform 인스턴스 생성
         self.platform = StewartPlatform()
+        # 같은 자세(리셋, 반복 입력)는 다시 계산하지 않음 - 파라미터가 바뀌면 자동으로 비워짐
+        self.pose_cache = PoseCache()
+        self.platform.enable_pose_cache(self.pose_cache)
+        # 도달 불가능한 자세를 가장 가까운 도달 가능 자세로 바꾸는 투영기 (작업 스레드에서만 사용)
+        self.projector = PoseProjector(self.platform)
         self.visualizer = StewartPlatformVisualizer(self.platform)
         
+        # 자세 계산 파이프라인 (최신 값 우선) - 중간 자세는 버려진다
+        self._pose_lock = threading.Lock()
+        self._pose_event = threading.Event()
+        self._pending_pose = None
+        self._latest_result = None
+        self._request_seq = 0
+        self._applied_seq = 0
+        self._running = True
+        self._worker = threading.Thread(target=self._pose_worker, daemon=True)
+        self._worker.start()
+        
         self.create_widgets()
         self.update_servo_angles()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(self.REFRESH_INTERVAL_MS, self._poll_results)
     
     def create_widgets(self):
         """GUI 위젯 생성"""
@@ -505,6 +135,25 @@ class StewartPlatformGUI:
             label.grid(row=i//3, column=(i%3)*2+1, sticky=tk.W)
             self.servo_labels.append(label)
         
+        # 입력 ~ 서보 각도 표시까지의 지연 시간
+        ttk.Label(servo_frame, text="Latency:").grid(row=2, column=0, sticky=tk.W, padx=(0, 10))
+        self.latency_label = ttk.Label(servo_frame, text="-", font=("Arial", 9))
+        self.latency_label.grid(row=2, column=1, columnspan=5, sticky=tk.W)
+        
+        # 계산 불가능한 다리와 원인
+        self.ik_status_label = ttk.Label(servo_frame, text="", font=("Arial", 9), foreground="red")
+        self.ik_status_label.grid(row=3, column=0, columnspan=6, sticky=tk.W)
+        
+        # 야코비안 조건수 - 클수록 특이 자세에 가까워 서보 오차가 크게 증폭됨
+        ttk.Label(servo_frame, text="Condition:").grid(row=4, column=0, sticky=tk.W, padx=(0, 10))
+        self.condition_label = ttk.Label(servo_frame, text="-", font=("Arial", 9))
+        self.condition_label.grid(row=4, column=1, columnspan=5, sticky=tk.W)
+        
+        # 도달 불가능한 자세를 ERROR 대신 가장 가까운 도달 가능 자세로 투영
+        self.project_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(servo_frame, text="Project unreachable poses", variable=self.project_var,
+                        command=self.update_servo_angles).grid(row=5, column=0, columnspan=6, sticky=tk.W)
+        
         # 파라미터 설정 프레임
         param_frame = ttk.LabelFrame(control_frame, text="Platform Parameters", padding="10")
         param_frame.grid(row=3, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
@@ -615,38 +264,153 @@ class StewartPlatformGUI:
         self.update_servo_angles()
     
     def update_servo_angles(self):
-        """서보 각도 계산 및 업데이트"""
+        """서보 각도 계산 요청 - 현재 슬라이더 값을 대기 중인 자세로 등록"""
         try:
             # 현재 위치와 회전 값 가져오기
             translation = [self.x_var.get(), self.y_var.get(), self.z_var.get()]
+            rpy = [self.roll_var.get(), self.pitch_var.get(), self.yaw_var.get()]
+            projector = self.projector if self.project_var.get() else None
+        except tk.TclError:
+            # 입력 필드에 숫자가 아닌 값을 입력하는 중
+            return
+        
+        with self._pose_lock:
+            self._request_seq += 1
+            self._pending_pose = (self._request_seq, self.platform, projector, translation, rpy,
+                                  time.perf_counter())
+        self._pose_event.set()
+    
+    def _pose_worker(self):
+        """작업 스레드 - 가장 최근 자세의 역기구학 계산"""
+        while self._running:
+            self._pose_event.wait()
+            self._pose_event.clear()
+            with self._pose_lock:
+                request, self._pending_pose = self._pending_pose, None
+            if request is None:
+                continue
             
-            # 도를 라디안으로 변환
-            roll = math.radians(self.roll_var.get())
-            pitch = math.radians(self.pitch_var.get())
-            yaw = math.radians(self.yaw_var.get())
+            seq, platform, projector, translation, rpy, requested_at = request
+            try:
+                # 도를 라디안으로 변환하여 쿼터니언 생성
+                roll, pitch, yaw = (math.radians(angle) for angle in rpy)
+                orientation = Quaternion.from_euler(roll, pitch, yaw)
+                
+                projection = None
+                if projector is not None:
+                    projected = projector.project(translation, orientation)
+                    if projected.info['feasible']:
+                        translation, orientation = projected.translation, projected.orientation
+                    projection = projected.info
+                
+                cache = platform.pose_cache
+                pose = None
+                if cache is not None:
+                    lookup_started = time.perf_counter()
+                    cache_key = cache.key(translation, orientation)
+                    pose = cache.get(platform.config, cache_key)
+                    if pose is not None and platform.metrics is not None:
+                        # 캐시 적중도 계측에 포함 (StewartPlatform.calculate_inverse_kinematics 와 동일)
+                        platform.metrics.record_scalar(
+                            time.perf_counter() - lookup_started, translation,
+                            (orientation.w, orientation.x, orientation.y, orientation.z),
+                            pose.failure_reasons, [None] * 6)
+                if pose is None:
+                    # 역기구학 계산 (플랫폼 상태는 Tk 스레드에서 반영)
+                    angles, valid, horns, reasons = platform.calculate_inverse_kinematics_batch(
+                        [translation], [[orientation.w, orientation.x, orientation.y, orientation.z]],
+                        return_horn_positions=True, return_failure_reasons=True)
+                    pose = CachedPose(
+                        [float(a) if ok else None for a, ok in zip(angles[0], valid[0])],
+                        horns[0].tolist(),
+                        [FAILURE_REASONS[code - 1] if code else None for code in reasons[0]])
+                    if cache is not None:
+                        cache.put(platform.config, cache_key, *pose)
+                collision = None
+                if all(angle is not None for angle in pose.servo_angles):
+                    collision = CollisionChecker(platform).check(
+                        [pose.horn_positions], [translation], [orientation.to_matrix()])
+                    collision = {key: value[0] for key, value in collision.items()}
+                conditioning = platform.calculate_conditioning_batch(
+                    [translation], [[orientation.w, orientation.x, orientation.y, orientation.z]])
+                result = {
+                    'seq': seq,
+                    'platform': platform,
+                    'translation': translation,
+                    'orientation': orientation,
+                    'condition': float(conditioning['condition'][0]),
+                    'error_gain': float(conditioning['error_gain'][0]),
+                    'servo_angles': list(pose.servo_angles),
+                    'horn_positions': [list(position) for position in pose.horn_positions],
+                    'failure_reasons': list(pose.failure_reasons),
+                    'collision': collision,
+                    'projection': projection,
+                    'requested_at': requested_at,
+                    'error': None
+                }
+            except Exception as e:
+                result = {'seq': seq, 'platform': platform, 'requested_at': requested_at, 'error': e}
             
-            # 쿼터니언 생성
-            orientation = Quaternion.from_euler(roll, pitch, yaw)
+            with self._pose_lock:
+                self._latest_result = result
+    
+    def _poll_results(self):
+        """Tk 루프 - 제한된 주기로 최신 계산 결과만 화면에 반영"""
+        if not self._running:
+            return
+        
+        with self._pose_lock:
+            result, self._latest_result = self._latest_result, None
+        
+        if result is not None and result['seq'] > self._applied_seq and result['platform'] is self.platform:
+            self._applied_seq = result['seq']
+            self._apply_result(result)
+        
+        self.root.after(self.REFRESH_INTERVAL_MS, self._poll_results)
+    
+    def _apply_result(self, result):
+        """계산 결과를 플랫폼 상태, 서보 각도 표시, 3D 시각화에 반영"""
+        try:
+            if result['error'] is not None:
+                raise result['error']
             
-            # 역기구학 계산
-            servo_angles = self.platform.calculate_inverse_kinematics(translation, orientation)
+            self.platform.current_translation = result['translation']
+            self.platform.current_orientation = result['orientation']
+            self.platform.horn_positions = result['horn_positions']
             
             # 결과 표시
-            error_count = 0
-            for i, angle in enumerate(servo_angles):
+            failures = []
+            for i, (angle, reason) in enumerate(zip(result['servo_angles'], result['failure_reasons'])):
                 if angle is not None:
                     self.servo_labels[i].config(text=f"{angle:.2f}°", foreground="black")
                 else:
                     self.servo_labels[i].config(text="ERROR", foreground="red")
-                    error_count += 1
+                    failures.append(f"Servo {i+1}: {reason}")
+            
+            # 에러가 있는 경우 다리별 원인 표시, 역기구학이 가능하면 다리 간섭/판 충돌 표시
+            collision = result['collision']
+            if collision is not None and collision['collision']:
+                failures.append(self._describe_collision(collision))
+            projection = result['projection']
+            if projection is not None and projection['projected']:
+                failures.append(f"Projected: {projection['translation_offset']:.1f} mm, "
+                                f"{projection['rotation_offset']:.1f}° from command")
+            self.ik_status_label.config(text=", ".join(failures))
             
-            # 에러가 있는 경우 상태 표시
-            if error_count > 0:
-                # 상태바나 툴팁으로 에러 정보 표시 (선택사항)
-                pass
+            if math.isinf(result['condition']):
+                self.condition_label.config(text="-", foreground="black")
+            else:
+                near_singular = result['condition'] > self.NEAR_SINGULAR_CONDITION
+                self.condition_label.config(
+                    text=f"{result['condition']:.1f} ({result['error_gain']:.2f} mm/° servo error)",
+                    foreground="red" if near_singular else "black")
             
             # 3D 시각화 업데이트
             self.visualizer.update_visualization()
+            
+            latency_ms = (time.perf_counter() - result['requested_at']) * 1000
+            hit_rate = self.pose_cache.stats()['hit_rate']
+            self.latency_label.config(text=f"{latency_ms:.1f} ms (cache hit {hit_rate:.0%})")
                     
         except Exception as e:
             # 더 자세한 에러 메시지
@@ -659,16 +423,36 @@ class StewartPlatformGUI:
             
             messagebox.showerror("Error", error_msg)
     
+    @staticmethod
+    def _describe_collision(collision):
+        """충돌 검사 결과를 상태 표시 문자열로 변환 (가장 가까운 항목)"""
+        gaps = {
+            CollisionChecker.describe(collision['closest_pair']): collision['leg_gap'],
+            'base plate': collision['base_plate_gap'],
+            'platform plate': collision['platform_plate_gap'],
+        }
+        name = min(gaps, key=gaps.get)
+        return f"Collision: {name} ({gaps[name]:.1f} mm)"
+    
+    def on_close(self):
+        """창 닫기 - 작업 스레드 종료"""
+        self._running = False
+        self._pose_event.set()
+        self.root.destroy()
+    
     def apply_parameters(self):
         """파라미터 적용"""
         try:
             # 새로운 설정 생성
-            new_config = {}
+            # 화면에 없는 설정 (캘리브레이션 보정값 등) 은 유지
+            new_config = dict(self.platform.config)
             for param_name, var in self.param_vars.items():
                 new_config[param_name] = var.get()
             
             # Stewart Platform 재초기화
             self.platform = StewartPlatform(new_config)
+            self.platform.enable_pose_cache(self.pose_cache)
+            self.projector = PoseProjector(self.platform)
             self.visualizer.platform = self.platform
             
             # 작업 공간 한계 업데이트
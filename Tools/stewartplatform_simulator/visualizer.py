@@ -0,0 +1,312 @@
+"""Stewart Platform 3D 시각화 (matplotlib)"""
+import time
+from collections import deque
+import numpy as np
+from matplotlib.figure import Figure
+from mpl_toolkits.mplot3d import Axes3D
+
+from stewart_kinematics import config_hash, quaternion_array_to_matrix
+
+class StewartPlatformVisualizer:
+    """Stewart Platform 3D 시각화 클래스
+    
+    정적 형상(베이스, 좌표축, 작업 공간)은 한 번만 그리고, 매 업데이트마다
+    플랫폼 원형, 다리, 호른 표시만 데이터를 바꾸어 다시 그린다.
+    """
+    # 플랫폼 원형을 그리는 점 개수
+    CIRCLE_POINTS = 100
+    
+    def __init__(self, platform):
+        self.platform = platform
+        self.fig = None
+        self.ax = None
+        self.canvas = None
+        
+        self._scene_key = None  # 정적 형상을 그린 config 해시
+        self._artists = {}
+        self._geometry = None
+        self._unit_circle = np.stack([
+            np.cos(np.linspace(0, 2*np.pi, self.CIRCLE_POINTS)),
+            np.sin(np.linspace(0, 2*np.pi, self.CIRCLE_POINTS)),
+            np.zeros(self.CIRCLE_POINTS)
+        ], axis=1)
+        
+        # 프레임 시간 측정 (업데이트 요청 ~ 실제 그리기 완료)
+        self.frame_times = deque(maxlen=120)
+        self._frame_requested_at = None
+        self._last_draw_at = None
+        self._draw_intervals = deque(maxlen=120)
+        
+    def create_visualization(self, parent_frame):
+        """3D 시각화 생성"""
+        # matplotlib figure 생성
+        self.fig = Figure(figsize=(8, 6))
+        self.ax = self.fig.add_subplot(111, projection='3d')
+        
+        # Tkinter canvas에 matplotlib figure 임베드 (Tk 백엔드는 필요할 때만 import)
+        import tkinter as tk
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
+        self.canvas = FigureCanvasTkAgg(self.fig, parent_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        
+        # 초기 플롯
+        self.update_visualization()
+    
+    def create_offscreen_visualization(self, figsize=(8, 6), dpi=100):
+        """화면 없이 Agg 캔버스에 3D 시각화 생성 (벤치마크, 이미지 저장용)"""
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.ax = self.fig.add_subplot(111, projection='3d')
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        
+        self.update_visualization()
+    
+    def update_visualization(self):
+        """시각화 업데이트"""
+        if self.ax is None:
+            return
+        
+        # 기하 파라미터가 바뀐 경우에만 정적 형상을 다시 그림
+        scene_key = config_hash(self.platform.config)
+        if scene_key != self._scene_key:
+            self._build_scene()
+            self._scene_key = scene_key
+        
+        # 플랫폼 플레이트와 다리 업데이트
+        self._update_platform_plate()
+        self._update_legs()
+        self._update_frame_stats_text()
+        
+        # 여러 업데이트 요청을 한 번의 그리기로 합침
+        if self._frame_requested_at is None:
+            self._frame_requested_at = time.perf_counter()
+        self.canvas.draw_idle()
+    
+    def _build_scene(self):
+        """정적 형상과 업데이트할 아티스트 생성 (사용자가 돌려 놓은 시점은 유지)"""
+        first_build = self._scene_key is None
+        elev, azim = self.ax.elev, self.ax.azim
+        
+        self.ax.clear()
+        self._artists = {}
+        
+        # 베이스 플레이트 그리기
+        self._draw_base_plate()
+        
+        # 플랫폼 플레이트와 다리 아티스트 생성
+        self._create_platform_artists()
+        self._create_leg_artists()
+        
+        # 축 그리기
+        self._draw_axes()
+        
+        # 작업 공간 한계 표시
+        self._draw_workspace_limits()
+        
+        # 그래프 설정
+        self.ax.set_xlabel('X (mm)')
+        self.ax.set_ylabel('Y (mm)')
+        self.ax.set_zlabel('Z (mm)')
+        self.ax.set_title('Stewart Platform 3D Visualization')
+        self._set_axis_limits()
+        
+        # 뷰 설정 - 처음에만 기본 시점을 적용
+        if first_build:
+            self.ax.view_init(elev=20, azim=45)
+        else:
+            self.ax.view_init(elev=elev, azim=azim)
+        
+        self._artists['frame_stats'] = self.ax.text2D(0.02, 0.02, '', transform=self.ax.transAxes,
+                                                      fontsize=8, color='gray')
+    
+    def _set_axis_limits(self):
+        """고정 축 범위 - 업데이트마다 자동 스케일이 바뀌지 않도록 함"""
+        config = self.platform.config
+        reach = max(config['base_radius'], config['platform_radius']) + config['horn_length']
+        limits = self.platform.calculate_workspace_limits()
+        z_top = self.platform.T0[2] + max(limits['z_range'][1], 0) + config['platform_radius']
+        self.ax.set_xlim(-reach, reach)
+        self.ax.set_ylim(-reach, reach)
+        self.ax.set_zlim(-config['horn_length'], z_top)
+    
+    def _draw_base_plate(self):
+        """베이스 플레이트 그리기"""
+        base_radius = self.platform.config['base_radius']
+        
+        # 베이스 플레이트 원형
+        x = base_radius * self._unit_circle[:, 0]
+        y = base_radius * self._unit_circle[:, 1]
+        z = np.zeros(self.CIRCLE_POINTS)
+        
+        self.ax.plot(x, y, z, 'b-', linewidth=2, label='Base Plate')
+        
+        # 베이스 조인트들
+        base_joints = np.array(self.platform.base_joints)
+        self.ax.scatter(base_joints[:, 0], base_joints[:, 1], base_joints[:, 2], c='blue', s=50, marker='o')
+        for i, joint in enumerate(self.platform.base_joints):
+            self.ax.text(joint[0], joint[1], joint[2], f'B{i+1}', fontsize=8)
+    
+    def _create_platform_artists(self):
+        """플랫폼 플레이트 원형, 조인트, 라벨 아티스트 생성"""
+        self._artists['platform_plate'], = self.ax.plot([], [], [], 'r-', linewidth=2, label='Platform Plate')
+        self._artists['platform_joints'] = self.ax.scatter([], [], [], c='red', s=50, marker='o')
+        self._artists['platform_labels'] = [
+            self.ax.text(0, 0, 0, f'P{i+1}', fontsize=8) for i in range(6)
+        ]
+    
+    def _create_leg_artists(self):
+        """다리(베이스 → 호른 → 플랫폼 조인트)와 호른 위치 아티스트 생성"""
+        self._artists['legs'] = [self.ax.plot([], [], [], 'g-', linewidth=3)[0] for _ in range(6)]
+        self._artists['horns'] = self.ax.scatter([], [], [], c='green', s=30, marker='s')
+    
+    def platform_geometry(self):
+        """현재 자세의 그리기용 형상 (플랫폼 원형 [100,3], 조인트 [6,3], 호른 [6,3], 유효 다리 [6])"""
+        platform_radius = self.platform.config['platform_radius']
+        
+        # 플랫폼 중심
+        center = np.array(self.platform.current_translation, dtype=float)
+        center[2] += self.platform.T0[2]
+        
+        # 플랫폼 회전 적용 - 회전 행렬 한 번으로 모든 점을 회전
+        rotation_matrix = np.array(self.platform.current_orientation.to_matrix())
+        circle = (platform_radius * self._unit_circle) @ rotation_matrix.T + center
+        
+        horn_positions = np.array(self.platform.horn_positions, dtype=float)
+        return {
+            'circle': circle,
+            'platform_joints': np.array(self.platform.get_platform_joints_world()),
+            'horn_positions': horn_positions,
+            'valid': np.any(horn_positions != 0, axis=1)  # [0, 0, 0] 은 계산 불가능한 다리
+        }
+    
+    def platform_geometry_batch(self, translations, quaternions):
+        """[N,3] 위치와 [N,4] 쿼터니언 자세의 그리기용 형상을 배치로 계산
+        
+        platform_geometry 와 같은 키에 맨 앞 [N] 축이 붙은 배열 딕셔너리 반환.
+        플랫폼의 현재 자세 상태는 변경하지 않는다.
+        """
+        translations = np.asarray(translations, dtype=float).reshape(-1, 3)
+        quaternions = np.asarray(quaternions, dtype=float).reshape(-1, 4)
+        _, valid, horn_positions = self.platform.calculate_inverse_kinematics_batch(
+            translations, quaternions, return_horn_positions=True)
+        
+        centers = translations.copy()
+        centers[:, 2] += self.platform.T0[2]
+        rotation_matrices = quaternion_array_to_matrix(quaternions)
+        circle = self.platform.config['platform_radius'] * self._unit_circle
+        joints = np.asarray(self.platform.platform_joints, dtype=float)
+        return {
+            'circle': np.einsum('nij,pj->npi', rotation_matrices, circle) + centers[:, None, :],
+            'platform_joints': np.einsum('nij,kj->nki', rotation_matrices, joints) + centers[:, None, :],
+            'horn_positions': horn_positions,
+            'valid': valid
+        }
+    
+    def render_geometry(self, geometry, text=None):
+        """미리 계산한 형상 (platform_geometry 형식) 한 프레임을 즉시 그리고 RGBA 이미지 [H,W,4] 반환
+        
+        create_offscreen_visualization 이후에 사용한다. text 를 주면 프레임 시간 표시 대신 보여준다.
+        """
+        self._update_platform_plate(geometry)
+        self._update_legs(geometry)
+        if text is None:
+            self._update_frame_stats_text()
+        else:
+            self._artists['frame_stats'].set_text(text)
+        self.canvas.draw()
+        return np.asarray(self.canvas.buffer_rgba())
+    
+    def _update_platform_plate(self, geometry=None):
+        """플랫폼 플레이트 원형, 조인트, 라벨 위치 갱신"""
+        geometry = self.platform_geometry() if geometry is None else geometry
+        circle = geometry['circle']
+        joints = geometry['platform_joints']
+        
+        self._artists['platform_plate'].set_data_3d(circle[:, 0], circle[:, 1], circle[:, 2])
+        self._artists['platform_joints']._offsets3d = (joints[:, 0], joints[:, 1], joints[:, 2])
+        for label, joint in zip(self._artists['platform_labels'], joints):
+            label.set_position_3d(joint)
+        self._geometry = geometry
+    
+    def _update_legs(self, geometry=None):
+        """다리 선분과 호른 위치 갱신 - 계산 불가능한 다리는 숨김"""
+        geometry = self._geometry if geometry is None else geometry
+        base_joints = self.platform.base_joints
+        joints = geometry['platform_joints']
+        horns = geometry['horn_positions']
+        valid = geometry['valid']
+        
+        for i, line in enumerate(self._artists['legs']):
+            if valid[i]:
+                # 베이스 조인트 → 호른 → 플랫폼 조인트
+                points = np.array([base_joints[i], horns[i], joints[i]])
+                line.set_data_3d(points[:, 0], points[:, 1], points[:, 2])
+                line.set_visible(True)
+            else:
+                line.set_visible(False)
+        
+        shown = horns[valid]
+        self._artists['horns']._offsets3d = (shown[:, 0], shown[:, 1], shown[:, 2])
+    
+    def _draw_axes(self):
+        """좌표축 그리기"""
+        # 원점
+        self.ax.scatter(0, 0, 0, c='black', s=100, marker='o')
+        
+        # X, Y, Z 축
+        axis_length = 100
+        self.ax.quiver(0, 0, 0, axis_length, 0, 0, color='red', arrow_length_ratio=0.1, label='X')
+        self.ax.quiver(0, 0, 0, 0, axis_length, 0, color='green', arrow_length_ratio=0.1, label='Y')
+        self.ax.quiver(0, 0, 0, 0, 0, axis_length, color='blue', arrow_length_ratio=0.1, label='Z')
+        
+        self.ax.legend()
+    
+    def _draw_workspace_limits(self):
+        """작업 공간 한계 표시"""
+        limits = self.platform.calculate_workspace_limits()
+        
+        # XY 평면에서의 작업 공간 한계 (원형)
+        xy_max = limits['x_range'][1]
+        x = xy_max * self._unit_circle[:, 0]
+        y = xy_max * self._unit_circle[:, 1]
+        z_min = limits['z_range'][0] + self.platform.T0[2]
+        z_max = limits['z_range'][1] + self.platform.T0[2]
+        
+        # 하단 원
+        self.ax.plot(x, y, [z_min]*len(x), 'k--', alpha=0.3, linewidth=1, label='Workspace Limits')
+        # 상단 원
+        self.ax.plot(x, y, [z_max]*len(x), 'k--', alpha=0.3, linewidth=1)
+    
+    def _on_draw(self, event):
+        """실제 그리기 완료 시 프레임 시간 기록"""
+        now = time.perf_counter()
+        if self._frame_requested_at is not None:
+            self.frame_times.append(now - self._frame_requested_at)
+            self._frame_requested_at = None
+        if self._last_draw_at is not None:
+            self._draw_intervals.append(now - self._last_draw_at)
+        self._last_draw_at = now
+    
+    def get_frame_stats(self):
+        """최근 프레임 시간 통계 (ms) 와 그리기 속도 (fps)"""
+        if not self.frame_times:
+            return {'frames': 0, 'mean_ms': 0.0, 'max_ms': 0.0, 'fps': 0.0}
+        frame_ms = np.array(self.frame_times) * 1000
+        fps = 1.0 / np.mean(self._draw_intervals) if self._draw_intervals else 0.0
+        return {
+            'frames': len(frame_ms),
+            'mean_ms': float(np.mean(frame_ms)),
+            'max_ms': float(np.max(frame_ms)),
+            'fps': float(fps)
+        }
+    
+    def _update_frame_stats_text(self):
+        """프레임 시간 표시 갱신"""
+        stats = self.get_frame_stats()
+        if stats['frames']:
+            self._artists['frame_stats'].set_text(
+                f"frame {stats['mean_ms']:.1f} ms (max {stats['max_ms']:.1f}) | {stats['fps']:.1f} fps")